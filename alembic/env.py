@@ -2,8 +2,9 @@ from logging.config import fileConfig
 
 from sqlalchemy import engine_from_config
 from sqlalchemy import pool
-from app.db import SQLModel
-from app.settings import Settings
+from app.db import SQLModel, configure_engine
+from app.settings import get_settings
+from app.outbox.models import OutboxEvent  # noqa: F401
 from app.todo.models import Todo  # noqa: F401
 from app.user.models import User  # noqa: F401
 
@@ -12,11 +13,13 @@ from alembic import context
 # this is the Alembic Config object, which provides
 # access to the values within the .ini file in use.
 config = context.config
-config.set_main_option("sqlalchemy.url", Settings().DATABASE_URL)
+config.set_main_option("sqlalchemy.url", get_settings().DATABASE_URL)
 
 # Interpret the config file for Python logging.
 # This line sets up loggers basically.
-if config.config_file_name is not None:
+# Chamado de dentro da aplicação (`app.db.upgrade_database`), o logging já
+# está configurado e não é trocado.
+if config.config_file_name is not None and "connection" not in config.attributes:
     fileConfig(config.config_file_name)
 
 # add your model's MetaData object here
@@ -25,6 +28,18 @@ if config.config_file_name is not None:
 # target_metadata = mymodel.Base.metadata
 target_metadata = SQLModel.metadata
 
+# Objetos criados só pelas migrações (e por DDL no PostgreSQL), fora dos
+# modelos: o autogenerate não deve propor removê-los.
+UNMAPPED_OBJECTS = {
+    ("column", "content_search"),
+    ("index", "ix_todo_content_search"),
+}
+
+
+def include_object(object, name, type_, reflected, compare_to):
+    return (type_, name) not in UNMAPPED_OBJECTS
+
+
 # other values from the config, defined by the needs of env.py,
 # can be acquired:
 # my_important_option = config.get_main_option("my_important_option")
@@ -47,6 +62,7 @@ def run_migrations_offline() -> None:
     context.configure(
         url=url,
         target_metadata=target_metadata,
+        include_object=include_object,
         literal_binds=True,
         dialect_opts={"paramstyle": "named"},
     )
@@ -55,24 +71,45 @@ def run_migrations_offline() -> None:
         context.run_migrations()
 
 
+def do_run_migrations(connection) -> None:
+    context.configure(
+        connection=connection,
+        target_metadata=target_metadata,
+        include_object=include_object,
+        # O SQLite não tem a maioria dos ALTER TABLE: as alterações geradas
+        # recriam a tabela (batch mode).
+        render_as_batch=connection.dialect.name == "sqlite",
+    )
+
+    with context.begin_transaction():
+        context.run_migrations()
+
+
 def run_migrations_online() -> None:
     """Run migrations in 'online' mode.
 
     In this scenario we need to create an Engine
     and associate a connection with the context.
 
+    Uma conexão passada em `config.attributes["connection"]` é usada no
+    lugar de um engine novo: é o caso de um banco SQLite em memória, que só
+    existe dentro do processo da aplicação.
     """
+    connection = config.attributes.get("connection")
+    if connection is not None:
+        do_run_migrations(connection)
+        return
+
     connectable = engine_from_config(
         config.get_section(config.config_ini_section, {}),
         prefix="sqlalchemy.",
         poolclass=pool.NullPool,
     )
+    if connectable.dialect.name == "sqlite":
+        configure_engine(connectable, get_settings())
 
     with connectable.connect() as connection:
-        context.configure(connection=connection, target_metadata=target_metadata)
-
-        with context.begin_transaction():
-            context.run_migrations()
+        do_run_migrations(connection)
 
 
 if context.is_offline_mode():
@@ -0,0 +1,60 @@
+"""contadores de tarefas do usuario
+
+Revision ID: 02432279cccf
+Revises: 2e877f349f37
+Create Date: 2026-10-18 21:31:08.114520
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "02432279cccf"
+down_revision: Union[str, Sequence[str], None] = "2e877f349f37"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column(
+        "user",
+        sa.Column("todo_open_count", sa.Integer(), server_default="0", nullable=False),
+    )
+    op.add_column(
+        "user",
+        sa.Column("todo_done_count", sa.Integer(), server_default="0", nullable=False),
+    )
+
+    # Preenche os contadores a partir das tarefas existentes; daqui em diante
+    # eles são mantidos pela aplicação.
+    user = sa.table(
+        "user",
+        sa.column("id", sa.Integer),
+        sa.column("todo_open_count", sa.Integer),
+        sa.column("todo_done_count", sa.Integer),
+    )
+    todo = sa.table(
+        "todo", sa.column("user_id", sa.Integer), sa.column("completed", sa.Boolean)
+    )
+
+    def count(completed: bool):
+        return (
+            sa.select(sa.func.count())
+            .where(todo.c.user_id == user.c.id, todo.c.completed == completed)
+            .scalar_subquery()
+        )
+
+    op.execute(
+        user.update().values(todo_open_count=count(False), todo_done_count=count(True))
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column("user", "todo_done_count")
+    op.drop_column("user", "todo_open_count")
@@ -0,0 +1,32 @@
+"""adiciona todo_version ao usuario
+
+Revision ID: 0932f10ef130
+Revises: 404af90b75eb
+Create Date: 2026-10-18 20:50:12.418305
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0932f10ef130"
+down_revision: Union[str, Sequence[str], None] = "404af90b75eb"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column(
+        "user",
+        sa.Column("todo_version", sa.Integer(), server_default="0", nullable=False),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column("user", "todo_version")
@@ -0,0 +1,60 @@
+"""busca textual em todo
+
+Revision ID: 2e877f349f37
+Revises: c88c2802f182
+Create Date: 2026-10-18 21:14:52.630781
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = "2e877f349f37"
+down_revision: Union[str, Sequence[str], None] = "c88c2802f182"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Mesma configuração de app.todo.models.SEARCH_CONFIG no momento da migração.
+SEARCH_CONFIG = "portuguese"
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # tsvector e índices GIN só existem no PostgreSQL.
+    if op.get_context().dialect.name != "postgresql":
+        return
+
+    # Coluna gerada: o banco a mantém a cada INSERT/UPDATE de `content`.
+    # Adicioná-la reescreve a tabela (com lock exclusivo durante a operação).
+    op.add_column(
+        "todo",
+        sa.Column(
+            "content_search",
+            postgresql.TSVECTOR(),
+            sa.Computed(f"to_tsvector('{SEARCH_CONFIG}', content)", persisted=True),
+            nullable=True,
+        ),
+    )
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_todo_content_search",
+            "todo",
+            ["content_search"],
+            unique=False,
+            postgresql_using="gin",
+            postgresql_concurrently=True,
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    if op.get_context().dialect.name != "postgresql":
+        return
+
+    op.drop_index("ix_todo_content_search", table_name="todo")
+    op.drop_column("todo", "content_search")
@@ -0,0 +1,40 @@
+"""indice todo (user_id, id)
+
+Revision ID: c88c2802f182
+Revises: 0932f10ef130
+Create Date: 2026-10-18 21:02:37.905114
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = "c88c2802f182"
+down_revision: Union[str, Sequence[str], None] = "0932f10ef130"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # CONCURRENTLY não bloqueia escritas na tabela durante a criação do
+    # índice, mas não pode rodar dentro de uma transação.
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_todo_user_id_id",
+            "todo",
+            ["user_id", "id"],
+            unique=False,
+            postgresql_concurrently=True,
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            "ix_todo_user_id_id", table_name="todo", postgresql_concurrently=True
+        )
@@ -12,15 +12,16 @@ from fastapi import (
 )
 from fastapi.responses import HTMLResponse, RedirectResponse
 from fastapi.security import OAuth2PasswordRequestForm
-from fastapi.templating import Jinja2Templates
 from jwt import DecodeError, ExpiredSignatureError, decode
 
 from app.auth.router import login as auth_login
+from app.auth.user_cache import get_cached_user
 from app.user.services import UserServiceDep
 from app.user.models import User
-from app.settings import Settings
+from app.settings import get_settings
+from app.templating import get_templates
 
-settings = Settings()
+settings = get_settings()
 
 SECRET_KEY = settings.SECRET_KEY
 ALGORITHM = settings.ALGORITHM
@@ -31,10 +32,8 @@ router = APIRouter(
     responses={404: {"description": "Não encontrado"}},
 )
 
-templates = Jinja2Templates(directory="app/templates")
 
-
-def get_current_user_from_cookie(
+async def get_current_user_from_cookie(
     service: UserServiceDep, access_token: str = Cookie(None)
 ):
     if not access_token:
@@ -52,7 +51,7 @@ def get_current_user_from_cookie(
     except (DecodeError, ExpiredSignatureError):
         return None
 
-    user = service.get_by_username(username)
+    user = await get_cached_user(service, username)
     if not user:
         raise HTTPException(status_code=401, detail="Invalid credentials")
     return user
@@ -61,7 +60,7 @@ def get_current_user_from_cookie(
 AuthenticatedUser = Annotated[User, Depends(get_current_user_from_cookie)]
 
 
-def get_user(user: AuthenticatedUser):
+async def get_user(user: AuthenticatedUser):
     if not user:
         raise HTTPException(
             status_code=status.HTTP_302_FOUND,
@@ -103,7 +102,7 @@ async def login(
         )
         return response
     except HTTPException as e:
-        return templates.TemplateResponse(
+        return get_templates().TemplateResponse(
             "login.html",
             {"request": request, "error": f"Invalid credentials:{str(e)}"},
             status_code=400,
@@ -124,6 +123,6 @@ def get_register_page(request: Request):
     """
     Serve a página HTML para criação de um novo usuário.
     """
-    return templates.TemplateResponse(
+    return get_templates().TemplateResponse(
         "components/create_user.html", {"request": request}
     )
@@ -3,11 +3,12 @@ from typing import Annotated
 from fastapi import Depends, HTTPException
 from fastapi.security import OAuth2PasswordBearer
 from jwt import DecodeError, ExpiredSignatureError, decode
+from app.auth.user_cache import get_cached_user
 from app.user.models import User
 from app.user.services import UserServiceDep
-from app.settings import Settings
+from app.settings import get_settings
 
-settings = Settings()
+settings = get_settings()
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="auth/token", refreshUrl="auth/refresh")
 
@@ -15,7 +16,7 @@ SECRET_KEY = settings.SECRET_KEY
 ALGORITHM = settings.ALGORITHM
 
 
-def get_current_user(
+async def get_current_user(
     service: UserServiceDep,
     token: str = Depends(oauth2_scheme),
 ):
@@ -38,7 +39,7 @@ def get_current_user(
     except ExpiredSignatureError:
         raise credentials_exception
 
-    user = service.get_by_username(username)
+    user = await get_cached_user(service, username)
     if not user:
         raise credentials_exception
 
@@ -46,3 +47,19 @@ def get_current_user(
 
 
 CurrentUser = Annotated[User, Depends(get_current_user)]
+
+
+def is_admin(user: User) -> bool:
+    return user.username in settings.ADMIN_USERNAMES
+
+
+async def get_admin_user(current_user: CurrentUser):
+    if not is_admin(current_user):
+        raise HTTPException(
+            status_code=HTTPStatus.FORBIDDEN,
+            detail="Apenas administradores podem acessar este recurso.",
+        )
+    return current_user
+
+
+AdminUser = Annotated[User, Depends(get_admin_user)]
@@ -0,0 +1,116 @@
+import asyncio
+import multiprocessing
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+from fastapi import HTTPException, status
+from starlette.concurrency import run_in_threadpool
+
+from app.auth.security import get_password_hash, verify_password
+from app.logger import logger
+from app.monitoring.histogram import Histogram
+from app.settings import get_settings
+
+settings = get_settings()
+
+# Buckets em segundos: o argon2 leva dezenas de ms, a fila pode levar mais.
+HASH_BUCKETS = (0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+class PasswordHasher:
+    """
+    Executa o hash e a verificação de senhas (argon2, pesado em CPU) em um
+    pool de processos, fora do event loop e sem disputar o GIL com o worker.
+
+    O número de operações pendentes é limitado a `workers + queue_limit`;
+    acima disso a requisição falha na hora com 503, em vez de esperar numa
+    fila que só cresce. Com `workers=0` as operações vão para o threadpool.
+    """
+
+    def __init__(self, workers: int = 2, queue_limit: int = 64):
+        self.workers = workers
+        self.queue_limit = queue_limit
+        self._lock = threading.Lock()
+        self._executor: ProcessPoolExecutor | None = None
+        self.in_flight = 0
+        self.rejected = 0
+        self.latency = {
+            "hash": Histogram(HASH_BUCKETS),
+            "verify": Histogram(HASH_BUCKETS),
+        }
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                # forkserver: o worker tem threads (threadpool do AnyIO), e um
+                # fork direto dele pode herdar locks presos. O servidor já
+                # importa o módulo de hash, então novos processos sobem rápido.
+                context = multiprocessing.get_context("forkserver")
+                context.set_forkserver_preload(["app.auth.security"])
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.workers, mp_context=context
+                )
+            return self._executor
+
+    def shutdown(self) -> None:
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    async def _run(self, kind: str, fn, *args):
+        with self._lock:
+            if self.in_flight >= self.workers + self.queue_limit:
+                self.rejected += 1
+                raise HTTPException(
+                    status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                    detail="Servidor ocupado, tente novamente.",
+                    headers={"Retry-After": "1"},
+                )
+            self.in_flight += 1
+
+        start = time.perf_counter()
+        try:
+            if self.workers <= 0:
+                return await run_in_threadpool(fn, *args)
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self._get_executor(), fn, *args)
+        except BrokenProcessPool:
+            # Um processo morreu (ex.: OOM); o próximo pedido cria um pool novo.
+            logger.error("Pool de hash de senhas quebrado; recriando.")
+            self.shutdown()
+            raise
+        finally:
+            with self._lock:
+                self.in_flight -= 1
+            self.latency[kind].observe(time.perf_counter() - start)
+
+    async def hash(self, password: str) -> str:
+        return await self._run("hash", get_password_hash, password)
+
+    async def verify(self, plain_password: str, hashed_password: str) -> bool:
+        return await self._run(
+            "verify", verify_password, plain_password, hashed_password
+        )
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            in_flight = self.in_flight
+            rejected = self.rejected
+        return {
+            "workers": self.workers,
+            "queue_limit": self.queue_limit,
+            "in_flight": in_flight,
+            "queue_depth": max(0, in_flight - self.workers),
+            "rejected": rejected,
+            "hash_seconds": self.latency["hash"].snapshot(),
+            "verify_seconds": self.latency["verify"].snapshot(),
+        }
+
+
+password_hasher = PasswordHasher(
+    workers=settings.PASSWORD_HASH_WORKERS,
+    queue_limit=settings.PASSWORD_HASH_QUEUE_LIMIT,
+)
@@ -2,7 +2,8 @@ from fastapi.security import OAuth2PasswordRequestForm
 
 from fastapi import HTTPException, status
 from fastapi import APIRouter, Depends
-from app.auth.security import verify_password, create_access_token
+from app.auth.hashing import password_hasher
+from app.auth.security import create_access_token
 from app.user.services import UserServiceDep
 
 router = APIRouter(
@@ -21,8 +22,8 @@ async def login(
     Endpoint to handle user login.
     It receives a username and password, validates them, and returns an access token.
     """
-    user = service.get_by_username(form_data.username)
-    if not user or not verify_password(form_data.password, user.password):
+    user = await service.get_by_username(form_data.username)
+    if not user or not await password_hasher.verify(form_data.password, user.password):
         # If the user does not exist or the password is incorrect, raise an error
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
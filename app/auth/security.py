@@ -4,9 +4,9 @@ from fastapi.security import OAuth2PasswordBearer
 from jwt import encode
 from pwdlib import PasswordHash
 
-from app.settings import Settings
+from app.settings import get_settings
 
-settings = Settings()
+settings = get_settings()
 pwd_context = PasswordHash.recommended()
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="auth/token", refreshUrl="auth/refresh")
@@ -0,0 +1,131 @@
+import threading
+import time
+from collections import OrderedDict
+
+from sqlalchemy import inspect
+
+from app.settings import get_settings
+from app.user.models import User
+
+settings = get_settings()
+
+
+def snapshot_user(user: User) -> User:
+    """
+    Cópia transiente (fora de qualquer sessão) com as colunas do usuário.
+
+    É o que fica no cache: pode ser compartilhada entre requisições e threads
+    sem carregar a sessão de origem nem disparar lazy loads.
+    """
+    columns = inspect(User).column_attrs
+    return User(**{attr.key: getattr(user, attr.key) for attr in columns})
+
+
+class UserCache:
+    """
+    Cache LRU com TTL dos usuários autenticados, indexado pelo username.
+
+    Evita a consulta ao banco em cada requisição autenticada. As entradas são
+    invalidadas pelos listeners de User (app/user/subscribers.py) quando o
+    usuário é atualizado ou deletado; o TTL limita o tempo que uma entrada
+    pode ficar desatualizada por alterações feitas fora deste processo.
+    """
+
+    def __init__(self, max_size: int = 1024, ttl_seconds: float = 60.0):
+        self.max_size = max_size
+        self.ttl = ttl_seconds
+        self._lock = threading.Lock()
+        # username -> (expira_em, usuário)
+        self._entries: OrderedDict[str, tuple[float, User]] = OrderedDict()
+        # id -> username, para invalidar pelo id (o username pode ter mudado)
+        self._usernames: dict[int, str] = {}
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_size > 0 and self.ttl > 0
+
+    def get(self, username: str) -> User | None:
+        with self._lock:
+            entry = self._entries.get(username)
+            if entry is None:
+                self.misses += 1
+                return None
+            expires_at, user = entry
+            if expires_at <= time.monotonic():
+                self._remove(username)
+                self.misses += 1
+                return None
+            self._entries.move_to_end(username)
+            self.hits += 1
+            return user
+
+    def put(self, user: User) -> User:
+        """Guarda uma cópia do usuário e a retorna."""
+        cached = snapshot_user(user)
+        if not self.enabled:
+            return cached
+        with self._lock:
+            self._remove(cached.username)
+            old_username = self._usernames.get(cached.id)
+            if old_username is not None:
+                self._remove(old_username)
+            self._entries[cached.username] = (time.monotonic() + self.ttl, cached)
+            self._usernames[cached.id] = cached.username
+            while len(self._entries) > self.max_size:
+                oldest = next(iter(self._entries))
+                self._remove(oldest)
+                self.evictions += 1
+        return cached
+
+    def invalidate(self, user_id: int) -> None:
+        with self._lock:
+            username = self._usernames.get(user_id)
+            if username is not None:
+                self._remove(username)
+                self.invalidations += 1
+
+    def _remove(self, username: str) -> None:
+        entry = self._entries.pop(username, None)
+        if entry is not None:
+            self._usernames.pop(entry[1].id, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._usernames.clear()
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            return {
+                "size": len(self._entries),
+                "max_size": self.max_size,
+                "ttl_seconds": self.ttl,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "invalidations": self.invalidations,
+            }
+
+
+user_cache = UserCache(
+    max_size=settings.USER_CACHE_MAX_SIZE,
+    ttl_seconds=settings.USER_CACHE_TTL_SECONDS,
+)
+
+
+async def get_cached_user(service, username: str) -> User | None:
+    """
+    Busca o usuário pelo username passando pelo cache; só consulta o banco
+    (via `service`, um AsyncUserService) em caso de miss.
+    """
+    user = user_cache.get(username)
+    if user is not None:
+        return user
+    user = await service.get_by_username(username)
+    if user is None:
+        return None
+    return user_cache.put(user)
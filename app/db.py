@@ -1,18 +1,196 @@
-from typing import Annotated
+import os
+import threading
+from typing import Annotated, Callable, TypeVar
 from fastapi import Depends
-from app.settings import Settings
+from starlette.concurrency import run_in_threadpool
+from sqlalchemy.engine import make_url
+from sqlalchemy.engine import Engine
+from sqlalchemy.ext.asyncio import AsyncEngine, create_async_engine
+from sqlmodel.ext.asyncio.session import AsyncSession
+from app.monitoring.pool import (
+    InstrumentedAsyncQueuePool,
+    InstrumentedQueuePool,
+    instrument_pool,
+)
+from app.monitoring.profiling import instrument_engine
+from app.monitoring.queries import QueryStats
+from app.settings import Settings, get_settings
+from app import sqlite
 from sqlmodel import create_engine, SQLModel, Session
 
-engine = create_engine(Settings().DATABASE_URL, echo=True)
+settings = get_settings()
+
+# Drivers assíncronos usados quando DATABASE_ASYNC está ativo.
+ASYNC_DRIVERS = {
+    "postgresql": "postgresql+asyncpg",
+    "sqlite": "sqlite+aiosqlite",
+}
+
+
+def async_database_url(url: str) -> str:
+    """
+    Converte uma URL síncrona (ex.: postgresql+psycopg2://) na URL equivalente
+    com o driver assíncrono (ex.: postgresql+asyncpg://).
+    """
+    parsed = make_url(url)
+    backend = parsed.get_backend_name()
+    if backend not in ASYNC_DRIVERS:
+        raise ValueError(f"Não há driver assíncrono configurado para '{backend}'.")
+    return parsed.set(drivername=ASYNC_DRIVERS[backend]).render_as_string(
+        hide_password=False
+    )
+
+
+def pool_options(settings: Settings) -> dict:
+    """Parâmetros do pool de conexões vindos das configurações."""
+    return {
+        "pool_size": settings.DB_POOL_SIZE,
+        "max_overflow": settings.DB_MAX_OVERFLOW,
+        "pool_timeout": settings.DB_POOL_TIMEOUT,
+        "pool_recycle": settings.DB_POOL_RECYCLE,
+        "pool_pre_ping": settings.DB_POOL_PRE_PING,
+    }
+
+
+def engine_options(url: str, settings: Settings) -> dict:
+    """Parâmetros do `create_engine` para o banco de `url` (PostgreSQL ou SQLite)."""
+    options = pool_options(settings)
+    if sqlite.is_sqlite(url):
+        options |= sqlite.engine_options(url)
+    return options
+
+
+def configure_engine(engine, settings: Settings) -> None:
+    """Ajustes por backend feitos em cada conexão nova (pragmas do SQLite)."""
+    if engine.dialect.name == "sqlite":
+        sqlite.configure_engine(engine, settings.SQLITE_PRAGMAS)
+
+
+# Tempos por comando SQL e log de consultas lentas, compartilhados pelos engines.
+query_stats = QueryStats(
+    slow_threshold_ms=settings.SLOW_QUERY_THRESHOLD_MS,
+    sample_rate=settings.QUERY_LOG_SAMPLE_RATE,
+    max_statements=settings.QUERY_STATS_MAX_STATEMENTS,
+)
+
+# `sqlite://` (em memória) vira um banco compartilhado entre as conexões.
+database_url = sqlite.normalize_url(settings.DATABASE_URL)
+
+_engine = None
+_async_engine = None
+_engine_lock = threading.Lock()
+
+
+def _instrument(engine) -> None:
+    configure_engine(engine, settings)
+    instrument_pool(engine)
+    query_stats.attach(engine)
+    instrument_engine(engine)
+
+
+def get_engine() -> Engine:
+    """
+    Engine síncrono do processo, criado na primeira chamada (no `lifespan`
+    da aplicação, ou no primeiro uso fora dela: alembic, relay, scripts).
+    """
+    global _engine
+    if _engine is None:
+        with _engine_lock:
+            if _engine is None:
+                engine = create_engine(
+                    database_url,
+                    echo=settings.DB_ECHO,
+                    poolclass=InstrumentedQueuePool,
+                    **engine_options(database_url, settings),
+                )
+                _instrument(engine)
+                _engine = engine
+    return _engine
+
+
+def get_async_engine() -> AsyncEngine:
+    """Engine assíncrono (DATABASE_ASYNC), criado na primeira chamada."""
+    global _async_engine
+    if _async_engine is None:
+        with _engine_lock:
+            if _async_engine is None:
+                engine = create_async_engine(
+                    async_database_url(database_url),
+                    echo=settings.DB_ECHO,
+                    poolclass=InstrumentedAsyncQueuePool,
+                    **engine_options(database_url, settings),
+                )
+                _instrument(engine.sync_engine)
+                _async_engine = engine
+    return _async_engine
+
+
+def created_engines() -> dict[str, Engine]:
+    """Engines já criados (o assíncrono pelo seu `sync_engine`), por nome."""
+    engines = {}
+    if _engine is not None:
+        engines["sync"] = _engine
+    if _async_engine is not None:
+        engines["async"] = _async_engine.sync_engine
+    return engines
 
 
 def create_db_and_tables():
-    SQLModel.metadata.create_all(engine)
+    SQLModel.metadata.create_all(get_engine())
+
+
+ALEMBIC_INI = os.path.join(os.path.dirname(os.path.dirname(__file__)), "alembic.ini")
+
+
+def upgrade_database(engine: Engine | None = None) -> None:
+    """
+    Aplica as migrações (`alembic upgrade head`) por uma conexão do engine.
+    Usado com o SQLite em memória, que não é visível para um `alembic`
+    rodando em outro processo.
+    """
+    from alembic import command
+    from alembic.config import Config
+
+    config = Config(ALEMBIC_INI)
+    with (engine or get_engine()).connect() as connection:
+        config.attributes["connection"] = connection
+        command.upgrade(config, "head")
+        connection.commit()
 
 
 def get_session():
-    with Session(engine) as session:
+    with Session(get_engine()) as session:
         yield session
 
 
-DBSession = Annotated[Session, Depends(get_session)]
+async def get_async_session():
+    # expire_on_commit=False: depois do commit os objetos continuam legíveis
+    # sem um novo round trip (lazy load não é permitido fora do greenlet).
+    async with AsyncSession(get_async_engine(), expire_on_commit=False) as session:
+        yield session
+
+
+T = TypeVar("T")
+
+
+async def run_sync(
+    session: Session | AsyncSession, fn: Callable[..., T], *args, **kwargs
+) -> T:
+    """
+    Executa `fn(sync_session, *args, **kwargs)` sem bloquear o event loop.
+
+    Com uma AsyncSession a função roda via `AsyncSession.run_sync`, com o I/O
+    feito pelo driver assíncrono. Com uma Session síncrona ela vai para o
+    threadpool, como acontecia com as rotas `def`.
+    """
+    if isinstance(session, AsyncSession):
+        return await session.run_sync(fn, *args, **kwargs)
+    return await run_in_threadpool(fn, session, *args, **kwargs)
+
+
+# O modo é escolhido pela configuração DATABASE_ASYNC: os serviços aceitam
+# tanto uma Session síncrona quanto uma AsyncSession.
+DBSession = Annotated[
+    Session | AsyncSession,
+    Depends(get_async_session if settings.DATABASE_ASYNC else get_session),
+]
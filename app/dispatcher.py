@@ -0,0 +1,204 @@
+import asyncio
+import inspect
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass, field
+
+from starlette.concurrency import run_in_threadpool
+
+from app.logger import logger
+from app.monitoring.histogram import Histogram
+
+
+@dataclass(frozen=True)
+class ModelEvent:
+    """
+    Evento de mapper já confirmado no banco: o modelo, o evento do SQLAlchemy
+    (`after_insert`, `after_update`, `after_delete`) e os valores das colunas
+    do objeto no momento do flush.
+    """
+
+    model: type
+    identifier: str
+    data: dict = field(default_factory=dict)
+
+
+class Subscription:
+    """
+    Um handler inscrito em um evento de um modelo, com sua própria fila
+    limitada e seus contadores. Filas separadas: um handler lento não atrasa
+    os demais.
+    """
+
+    def __init__(self, model, identifier: str, handler, max_size: int):
+        self.model = model
+        self.identifier = identifier
+        self.handler = handler
+        self.name = handler.__name__
+        self.max_size = max_size
+        self.queue: deque[ModelEvent] = deque()
+        self.ready: asyncio.Event | None = None
+        self.delivered = 0
+        self.batches = 0
+        self.dropped_full = 0
+        self.errors = 0
+        self.max_depth = 0
+        self.latency = Histogram()
+
+    def snapshot(self) -> dict:
+        return {
+            "model": self.model.__name__,
+            "event": self.identifier,
+            "queue_depth": len(self.queue),
+            "queue_max_depth": self.max_depth,
+            "queue_max_size": self.max_size,
+            "delivered": self.delivered,
+            "batches": self.batches,
+            "dropped_queue_full": self.dropped_full,
+            "errors": self.errors,
+            "batch_seconds": self.latency.snapshot(),
+        }
+
+
+class EventDispatcher:
+    """
+    Entrega eventos de mapper, depois do commit, em lotes, a handlers
+    síncronos ou assíncronos que rodam fora da requisição.
+
+    `publish` pode ser chamado de qualquer thread (o commit de uma rota
+    síncrona roda no threadpool). Cada inscrição tem uma task no event loop da
+    aplicação que espera até `batch_max_size` eventos ou `batch_max_delay`
+    segundos e chama o handler com a lista. Handlers síncronos vão para o
+    threadpool.
+
+    As filas são limitadas: com a fila cheia o evento é descartado e contado
+    em `dropped_queue_full`, em vez de segurar o commit da requisição.
+    """
+
+    def __init__(
+        self,
+        queue_max_size: int = 10000,
+        batch_max_size: int = 100,
+        batch_max_delay: float = 0.05,
+    ):
+        self.queue_max_size = queue_max_size
+        self.batch_max_size = batch_max_size
+        self.batch_max_delay = batch_max_delay
+        self.subscriptions: list[Subscription] = []
+        self._lock = threading.Lock()
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._tasks: list[asyncio.Task] = []
+        self.published = 0
+        self.dropped_rollback = 0
+        self.dropped_not_running = 0
+
+    @property
+    def running(self) -> bool:
+        return self._loop is not None
+
+    def subscribe(self, model, identifier: str, handler) -> Subscription:
+        subscription = Subscription(model, identifier, handler, self.queue_max_size)
+        self.subscriptions.append(subscription)
+        return subscription
+
+    def publish(self, events: list[ModelEvent]) -> None:
+        """Enfileira eventos já confirmados para as inscrições correspondentes."""
+        loop = self._loop
+        if loop is None:
+            with self._lock:
+                self.dropped_not_running += len(events)
+            return
+
+        woken = set()
+        with self._lock:
+            self.published += len(events)
+            for subscription in self.subscriptions:
+                for event in events:
+                    if (
+                        event.model is not subscription.model
+                        or event.identifier != subscription.identifier
+                    ):
+                        continue
+                    if len(subscription.queue) >= subscription.max_size:
+                        subscription.dropped_full += 1
+                        continue
+                    subscription.queue.append(event)
+                    subscription.max_depth = max(
+                        subscription.max_depth, len(subscription.queue)
+                    )
+                    woken.add(subscription)
+
+        for subscription in woken:
+            loop.call_soon_threadsafe(subscription.ready.set)
+
+    def discard(self, events: list[ModelEvent]) -> None:
+        """Registra eventos descartados porque a transação foi desfeita."""
+        with self._lock:
+            self.dropped_rollback += len(events)
+
+    async def start(self) -> None:
+        self._loop = asyncio.get_running_loop()
+        for subscription in self.subscriptions:
+            subscription.ready = asyncio.Event()
+            self._tasks.append(asyncio.create_task(self._worker(subscription)))
+
+    async def stop(self, timeout: float = 5.0) -> None:
+        """Para de aceitar eventos e espera as filas esvaziarem (até `timeout`)."""
+        self._loop = None
+        for subscription in self.subscriptions:
+            subscription.ready.set()
+        _, pending = await asyncio.wait(self._tasks, timeout=timeout)
+        for task in pending:
+            task.cancel()
+        self._tasks.clear()
+
+    def _take_batch(self, subscription: Subscription) -> list[ModelEvent]:
+        with self._lock:
+            size = min(len(subscription.queue), self.batch_max_size)
+            return [subscription.queue.popleft() for _ in range(size)]
+
+    async def _worker(self, subscription: Subscription) -> None:
+        while True:
+            await subscription.ready.wait()
+            if len(subscription.queue) < self.batch_max_size and self.running:
+                # Espera um pouco para juntar mais eventos no mesmo lote.
+                await asyncio.sleep(self.batch_max_delay)
+            subscription.ready.clear()
+
+            while batch := self._take_batch(subscription):
+                await self._deliver(subscription, batch)
+
+            if not self.running:
+                return
+
+    async def _deliver(self, subscription: Subscription, batch: list) -> None:
+        start = time.perf_counter()
+        try:
+            if inspect.iscoroutinefunction(subscription.handler):
+                await subscription.handler(batch)
+            else:
+                await run_in_threadpool(subscription.handler, batch)
+        except Exception:
+            subscription.errors += 1
+            logger.exception(
+                "Erro no handler '%s' com um lote de %d eventos.",
+                subscription.name,
+                len(batch),
+            )
+        else:
+            subscription.delivered += len(batch)
+        finally:
+            subscription.batches += 1
+            subscription.latency.observe(time.perf_counter() - start)
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            counters = {
+                "running": self.running,
+                "published": self.published,
+                "dropped_rollback": self.dropped_rollback,
+                "dropped_not_running": self.dropped_not_running,
+            }
+            subscriptions = {s.name: s.snapshot() for s in self.subscriptions}
+        return {**counters, "subscriptions": subscriptions}
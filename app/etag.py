@@ -0,0 +1,32 @@
+import hashlib
+
+from fastapi import Response, status
+
+# Respostas por usuário: podem ficar no cache do cliente, mas devem ser
+# revalidadas (If-None-Match) a cada uso.
+CACHE_CONTROL = "private, no-cache"
+
+
+def make_etag(*parts) -> str:
+    """ETag forte a partir das partes que identificam a representação."""
+    raw = "\x1f".join(str(part) for part in parts).encode()
+    return '"' + hashlib.sha256(raw).hexdigest()[:32] + '"'
+
+
+def etag_matches(if_none_match: str | None, etag: str) -> bool:
+    """Indica se o cabeçalho If-None-Match contém `etag` (ou é `*`)."""
+    if not if_none_match:
+        return False
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        # If-None-Match usa comparação fraca: W/"x" equivale a "x".
+        if candidate == "*" or candidate.removeprefix("W/") == etag:
+            return True
+    return False
+
+
+def not_modified(etag: str) -> Response:
+    return Response(
+        status_code=status.HTTP_304_NOT_MODIFIED,
+        headers={"ETag": etag, "Cache-Control": CACHE_CONTROL},
+    )
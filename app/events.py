@@ -1,10 +1,30 @@
-from sqlalchemy import event
+from sqlalchemy import event, inspect
+from sqlalchemy.orm import Session, object_session
 from functools import wraps
+from app.dispatcher import EventDispatcher, ModelEvent
 from app.logger import logger
+from app.settings import get_settings
+
+settings = get_settings()
 
 # Uma lista simples para servir como o nosso registo de listeners.
 _listeners = []
 
+# Entrega assíncrona, depois do commit, para os handlers de `subscribe`.
+event_dispatcher = EventDispatcher(
+    queue_max_size=settings.EVENT_QUEUE_MAX_SIZE,
+    batch_max_size=settings.EVENT_BATCH_MAX_SIZE,
+    batch_max_delay=settings.EVENT_BATCH_MAX_DELAY_MS / 1000,
+)
+
+# Chave em `session.info` com os eventos capturados na transação atual.
+_PENDING_EVENTS = "pending_model_events"
+# Eventos (modelo, evento) que já têm um listener de captura registado.
+_captured = set()
+
+# Indica se os listeners estão ativos (entre o registo e a remoção).
+_registered = False
+
 
 def listens_for(model, identifier):
     """
@@ -25,24 +45,98 @@ def listens_for(model, identifier):
     return decorator
 
 
+def _capture_listener(identifier):
+    def capture(mapper, connection, target):
+        session = object_session(target)
+        if session is None:
+            return
+        # Cópia dos valores já carregados: o objeto pode mudar (ou expirar)
+        # até o handler rodar.
+        state = inspect(target)
+        data = {attr.key: state.dict.get(attr.key) for attr in mapper.column_attrs}
+        event = ModelEvent(mapper.class_, identifier, data)
+        session.info.setdefault(_PENDING_EVENTS, []).append(event)
+
+    capture.__name__ = f"capture_{identifier}"
+    return capture
+
+
+def subscribe(model, identifier):
+    """
+    Um decorador que inscreve um handler para o evento de mapper
+    `identifier` de `model`, entregue fora da requisição.
+
+    Diferente de `listens_for`, o handler não roda dentro do flush: os
+    eventos ficam guardados na sessão até o commit (e são descartados no
+    rollback) e chegam ao handler em lotes, como uma lista de ModelEvent.
+    O handler pode ser síncrono ou `async`.
+    """
+
+    def decorator(func):
+        event_dispatcher.subscribe(model, identifier, func)
+        if (model, identifier) not in _captured:
+            _captured.add((model, identifier))
+            _listeners.append((model, identifier, _capture_listener(identifier)))
+        return func
+
+    return decorator
+
+
+@listens_for(Session, "after_commit")
+def after_commit_publish_events(session):
+    events = session.info.pop(_PENDING_EVENTS, None)
+    if events:
+        event_dispatcher.publish(events)
+
+
+@listens_for(Session, "after_rollback")
+def after_rollback_discard_events(session):
+    events = session.info.pop(_PENDING_EVENTS, None)
+    if events:
+        event_dispatcher.discard(events)
+
+
 def register_sqlalchemy_listeners():
     """
     Itera sobre o nosso registo e ativa cada listener usando event.listen().
     """
-    logger.info("A registar os listeners do SQLAlchemy...")
+    global _registered
+    _registered = True
     for model, identifier, func in _listeners:
         event.listen(model, identifier, func)
-        logger.info(
-            f"-> Listener '{func.__name__}' registado para o evento '{identifier}' no modelo '{model.__name__}'"
+        logger.debug(
+            "-> Listener '%s' registado para o evento '%s' no modelo '%s'",
+            func.__name__,
+            identifier,
+            model.__name__,
         )
-    logger.info("Registo de listeners concluído.")
+    logger.info("%d listeners do SQLAlchemy registados.", len(_listeners))
 
 
 def remove_sqlalchemy_listeners():
     """
     Remove todos os listeners registados. Útil durante o encerramento da aplicação.
     """
-    logger.info("A remover os listeners do SQLAlchemy...")
+    global _registered
+    _registered = False
     for model, identifier, func in _listeners:
         event.remove(model, identifier, func)
-    logger.info("Remoção de listeners concluída.")
+    logger.info("%d listeners do SQLAlchemy removidos.", len(_listeners))
+
+
+def dispatch(model, identifier, connection, targets):
+    """
+    Chama os listeners registados para o evento de mapper `identifier` de
+    `model` com cada objeto de `targets`.
+
+    Usado pelas operações em lote (UPDATE/DELETE ... WHERE id = ANY(...)), que
+    não passam pelo flush do ORM e por isso não disparam os eventos de mapper.
+    """
+    if not _registered:
+        return
+
+    mapper = inspect(model)
+    funcs = [f for m, i, f in _listeners if m is model and i == identifier]
+    for target in targets:
+        for func in funcs:
+            func(mapper, connection, target)
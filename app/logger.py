@@ -1,7 +1,168 @@
+import atexit
+import copy
+import json
 import logging
+import queue
+import random
+import sys
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener
+
+from app.settings import Settings, get_settings
+
+TEXT_FORMAT = "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
+
+# Atributos padrão de um LogRecord (e a versão colorida que o uvicorn anexa);
+# o resto veio de `extra=` e vai para o JSON.
+_RECORD_ATTRS = set(vars(logging.makeLogRecord({}))) | {
+    "message",
+    "asctime",
+    "color_message",
+}
+
+# Loggers do uvicorn que têm handlers próprios; passam a usar a fila também.
+UVICORN_LOGGERS = ("uvicorn", "uvicorn.access", "uvicorn.error")
+
+
+class JsonFormatter(logging.Formatter):
+    """Uma linha JSON por registro, com os campos passados em `extra=`."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "timestamp": datetime.fromtimestamp(record.created, timezone.utc)
+            .isoformat(timespec="milliseconds")
+            .replace("+00:00", "Z"),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        for key, value in vars(record).items():
+            if key not in _RECORD_ATTRS and not key.startswith("_"):
+                entry[key] = value
+        if record.exc_info and not record.exc_text:
+            record.exc_text = self.formatException(record.exc_info)
+        if record.exc_text:
+            entry["exception"] = record.exc_text
+        if record.stack_info:
+            entry["stack"] = self.formatStack(record.stack_info)
+        return json.dumps(entry, ensure_ascii=False, default=str)
+
+
+class SamplingFilter(logging.Filter):
+    """
+    Descarta uma fração dos registros abaixo de WARNING por logger: com
+    `{"uvicorn.access": 0.1}` só 10% dos acessos são escritos. A taxa vale
+    para o logger e seus filhos (a mais específica prevalece); avisos e
+    erros passam sempre.
+    """
+
+    def __init__(self, rates: dict[str, float]):
+        super().__init__()
+        self.rates = rates
+        self._cache: dict[str, float] = {}
+
+    def rate_for(self, name: str) -> float:
+        rate = self._cache.get(name)
+        if rate is None:
+            rate = 1.0
+            prefix = name
+            while prefix:
+                if prefix in self.rates:
+                    rate = self.rates[prefix]
+                    break
+                prefix = prefix.rpartition(".")[0]
+            self._cache[name] = rate
+        return rate
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno >= logging.WARNING:
+            return True
+        rate = self.rate_for(record.name)
+        return rate >= 1.0 or random.random() < rate
+
+
+class LogQueueHandler(QueueHandler):
+    """
+    Enfileira uma cópia do registro com a mensagem já interpolada (os
+    argumentos podem mudar depois da chamada) e o traceback em texto, mas sem
+    aplicar o formato final: isso fica para o formatter da thread de escrita.
+    """
+
+    _exc_formatter = logging.Formatter()
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        record = copy.copy(record)
+        record.message = record.getMessage()
+        record.msg, record.args = record.message, None
+        if record.exc_info:
+            if not record.exc_text:
+                record.exc_text = self._exc_formatter.formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+
+_listener: QueueListener | None = None
+_queue_handler: LogQueueHandler | None = None
+
+
+def setup_logging(settings: Settings, stream=None) -> QueueListener:
+    """
+    Configura o logging da aplicação.
+
+    Os loggers só enfileiram os registros (QueueHandler); a formatação final
+    e a escrita no `stream` acontecem numa thread em segundo plano
+    (QueueListener), fora da thread da requisição e do event loop. Registros
+    abaixo do nível do logger ou descartados pela amostragem são filtrados
+    antes de qualquer formatação, então os argumentos de `logger.info("%s",
+    x)` nem chegam a ser interpolados.
+
+    Pode ser chamada de novo (ex.: nos testes); a configuração anterior é
+    substituída.
+    """
+    global _listener, _queue_handler
+
+    handler = logging.StreamHandler(stream or sys.stderr)
+    if settings.LOG_FORMAT == "json":
+        handler.setFormatter(JsonFormatter())
+    else:
+        handler.setFormatter(logging.Formatter(TEXT_FORMAT))
+
+    log_queue: queue.SimpleQueue = queue.SimpleQueue()
+    queue_handler = LogQueueHandler(log_queue)
+    queue_handler.addFilter(SamplingFilter(settings.LOG_SAMPLE_RATES))
+    listener = QueueListener(log_queue, handler)
+
+    root = logging.getLogger()
+    if _queue_handler is not None:
+        root.removeHandler(_queue_handler)
+    if _listener is not None:
+        _listener.stop()
+    root.addHandler(queue_handler)
+    root.setLevel(settings.LOG_LEVEL.upper())
+    for name in UVICORN_LOGGERS:
+        uvicorn_logger = logging.getLogger(name)
+        # Sem handlers (ex.: `--no-access-log`) o logger foi desligado de
+        # propósito e continua assim.
+        if uvicorn_logger.handlers:
+            uvicorn_logger.handlers.clear()
+            uvicorn_logger.propagate = True
+    for name, level in settings.LOG_LEVELS.items():
+        logging.getLogger(name).setLevel(level.upper())
+
+    listener.start()
+    _listener, _queue_handler = listener, queue_handler
+    return listener
+
+
+def stop_logging() -> None:
+    """Escreve o que ainda está na fila e para a thread de escrita."""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
+
+
+setup_logging(get_settings())
+atexit.register(stop_logging)
 
-logging.basicConfig(
-    level=logging.INFO,  # Define o nível mínimo de mensagem a ser exibido
-    format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",  # Define o formato da mensagem
-)
 logger = logging.getLogger("main")
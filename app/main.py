@@ -1,3 +1,5 @@
+# Primeiro import: marca o início da importação da aplicação (startup_report).
+from app.monitoring.startup import startup_report
 from app.logger import logger
 from fastapi import FastAPI
 from fastapi.staticfiles import StaticFiles
@@ -7,30 +9,76 @@ from app.todo import router as todo_router
 from app.auth import router as auth_router
 from app.user import router as user_router
 from app.auth import auth_ui as auth_ui_router
+from app.monitoring import router as monitoring_router
+from app.monitoring.metrics import MetricsMiddleware
+from app.monitoring.profiling import ProfilingMiddleware
 
 
 ## Subscribers
 import app.todo.subscribers
+import app.user.subscribers
+import app.outbox.subscribers
 
-from app.events import register_sqlalchemy_listeners, remove_sqlalchemy_listeners
+from app.events import (
+    event_dispatcher,
+    register_sqlalchemy_listeners,
+    remove_sqlalchemy_listeners,
+)
+from app.auth.hashing import password_hasher
+from app.outbox.relay import outbox_relay
+from app.todo.live import todo_changes
+from app.settings import get_settings
+from app.db import database_url, get_async_engine, get_engine, upgrade_database
+from app.sqlite import is_memory
+from app.templating import get_templates
+
+settings = get_settings()
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     logger.info("Iniciando o processo de criação do banco de dados e tabelas...")
     # create_db_and_tables()
+    with startup_report.phase("database"):
+        # Os engines (e os pools) só existem a partir daqui; importar a
+        # aplicação não abre nada.
+        get_engine()
+        if settings.DATABASE_ASYNC:
+            get_async_engine()
+        if is_memory(database_url):
+            # O banco em memória nasce vazio a cada processo.
+            upgrade_database()
 
     logger.info("Iniciando a aplicação FastAPI...")
-    logger.info("Registrando listeners do SQLAlchemy...")
-    register_sqlalchemy_listeners()
+    with startup_report.phase("templates"):
+        get_templates()
+    with startup_report.phase("listeners"):
+        register_sqlalchemy_listeners()
+    with startup_report.phase("dispatcher"):
+        await event_dispatcher.start()
+    with startup_report.phase("live"):
+        await todo_changes.start()
+    if settings.OUTBOX_RELAY_ENABLED:
+        with startup_report.phase("outbox_relay"):
+            await outbox_relay.start(settings.OUTBOX_POLL_INTERVAL_SECONDS)
+    startup_report.ready()
     yield
     logger.info("Encerrando a aplicação FastAPI...")
-    logger.info("Removendo listeners do SQLAlchemy...")
     remove_sqlalchemy_listeners()
+    await todo_changes.stop()
+    # Entrega o que ainda está na fila antes de encerrar.
+    await event_dispatcher.stop()
+    await outbox_relay.stop()
+    password_hasher.shutdown()
 
 
 app = FastAPI(lifespan=lifespan)
 
+if settings.PROFILING_TOKEN:
+    app.add_middleware(ProfilingMiddleware, token=settings.PROFILING_TOKEN)
+if settings.METRICS_ENABLED:
+    app.add_middleware(MetricsMiddleware)
+
 app.mount("/static", StaticFiles(directory="app/static"), name="static")
 
 app.include_router(auth_router.router)
@@ -38,3 +86,7 @@ app.include_router(ui_router.router)
 app.include_router(user_router.router)
 app.include_router(todo_router.router)
 app.include_router(auth_ui_router.router)
+app.include_router(monitoring_router.router)
+app.include_router(monitoring_router.metrics_router)
+
+startup_report.record_import()
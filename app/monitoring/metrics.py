@@ -0,0 +1,211 @@
+import threading
+import time
+from bisect import bisect_left
+
+from app.monitoring.histogram import DEFAULT_BUCKETS
+
+# Content-Type do formato de texto do Prometheus.
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+# Rótulo das requisições que não casaram com nenhuma rota (ex.: 404).
+UNMATCHED_ROUTE = "<unmatched>"
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def format_labels(**labels) -> str:
+    return ",".join(f'{key}="{_escape(str(value))}"' for key, value in labels.items())
+
+
+def render_metric(name: str, kind: str, help: str, samples) -> list[str]:
+    """
+    Linhas de uma métrica no formato de texto do Prometheus. `samples` são
+    pares (rótulos, valor), com os rótulos já renderizados por `format_labels`.
+    """
+    lines = [f"# HELP {name} {help}", f"# TYPE {name} {kind}"]
+    for labels, value in samples:
+        lines.append(f"{name}{{{labels}}} {value}" if labels else f"{name} {value}")
+    return lines
+
+
+class _Shard:
+    """Contadores de uma thread; só ela escreve, sem locks."""
+
+    __slots__ = ("requests", "durations", "in_flight")
+
+    def __init__(self):
+        # (método, rota, status) -> requisições
+        self.requests: dict[tuple[str, str, int], int] = {}
+        # (método, rota) -> [contagem por bucket..., +Inf, soma]
+        self.durations: dict[tuple[str, str], list] = {}
+        # método -> requisições em andamento
+        self.in_flight: dict[str, int] = {}
+
+
+class RequestMetrics:
+    """
+    Contagem de requisições por método, rota e status, histograma de
+    latência por rota e requisições em andamento.
+
+    Cada thread grava no seu próprio shard (`threading.local`), sem locks e
+    sem disputa no caminho da requisição; os shards só são somados quando
+    `/metrics` é lido. O lock protege apenas a lista de shards, alterada uma
+    vez por thread.
+    """
+
+    def __init__(self, buckets=DEFAULT_BUCKETS):
+        self.buckets = tuple(sorted(buckets))
+        self._local = threading.local()
+        self._shards: list[_Shard] = []
+        self._lock = threading.Lock()
+
+    def _shard(self) -> _Shard:
+        try:
+            return self._local.shard
+        except AttributeError:
+            shard = self._local.shard = _Shard()
+            with self._lock:
+                self._shards.append(shard)
+            return shard
+
+    def begin(self, method: str) -> _Shard:
+        shard = self._shard()
+        shard.in_flight[method] = shard.in_flight.get(method, 0) + 1
+        return shard
+
+    def end(
+        self, shard: _Shard, method: str, route: str, status: int, elapsed: float
+    ) -> None:
+        """Registra o fim de uma requisição iniciada com `begin` (no mesmo shard)."""
+        shard.in_flight[method] -= 1
+        key = (method, route, status)
+        shard.requests[key] = shard.requests.get(key, 0) + 1
+        histogram = shard.durations.get((method, route))
+        if histogram is None:
+            histogram = shard.durations[(method, route)] = [0] * (
+                len(self.buckets) + 1
+            ) + [0.0]
+        histogram[bisect_left(self.buckets, elapsed)] += 1
+        histogram[-1] += elapsed
+
+    def _merge(self):
+        requests: dict = {}
+        durations: dict = {}
+        in_flight: dict = {}
+        with self._lock:
+            shards = list(self._shards)
+        for shard in shards:
+            # list(...) copia os itens de uma vez; a thread dona do shard pode
+            # estar inserindo chaves novas enquanto isso.
+            for key, count in list(shard.requests.items()):
+                requests[key] = requests.get(key, 0) + count
+            for key, values in list(shard.durations.items()):
+                merged = durations.setdefault(key, [0] * len(values[:-1]) + [0.0])
+                for i, value in enumerate(list(values)):
+                    merged[i] += value
+            for method, count in list(shard.in_flight.items()):
+                in_flight[method] = in_flight.get(method, 0) + count
+        return requests, durations, in_flight
+
+    def render(self) -> list[str]:
+        requests, durations, in_flight = self._merge()
+        lines = render_metric(
+            "http_requests_total",
+            "counter",
+            "Requisições HTTP concluídas, por método, rota e status.",
+            (
+                (format_labels(method=m, route=r, status=s), count)
+                for (m, r, s), count in sorted(requests.items())
+            ),
+        )
+
+        lines += [
+            "# HELP http_request_duration_seconds Duração das requisições HTTP.",
+            "# TYPE http_request_duration_seconds histogram",
+        ]
+        bounds = [*(str(bound) for bound in self.buckets), "+Inf"]
+        for (method, route), values in sorted(durations.items()):
+            running = 0
+            for bound, count in zip(bounds, values):
+                running += count
+                labels = format_labels(method=method, route=route, le=bound)
+                lines.append(
+                    f"http_request_duration_seconds_bucket{{{labels}}} {running}"
+                )
+            labels = format_labels(method=method, route=route)
+            lines.append(f"http_request_duration_seconds_sum{{{labels}}} {values[-1]}")
+            lines.append(f"http_request_duration_seconds_count{{{labels}}} {running}")
+
+        lines += render_metric(
+            "http_requests_in_flight",
+            "gauge",
+            "Requisições HTTP em andamento.",
+            (
+                (format_labels(method=m), count)
+                for m, count in sorted(in_flight.items())
+            ),
+        )
+        return lines
+
+    def reset(self) -> None:
+        with self._lock:
+            self._shards.clear()
+        self._local = threading.local()
+
+
+request_metrics = RequestMetrics()
+
+
+def route_template(scope: dict, root_path: str) -> str:
+    """
+    Caminho da rota que atendeu a requisição, com os parâmetros no lugar dos
+    valores (`/api/todos/{todo_id}`), para que cada ID não vire uma série
+    nova. O roteador do FastAPI guarda a rota em `scope["route"]`; para apps
+    montados (ex.: `/static`) usa o caminho da montagem.
+    """
+    route = scope.get("route")
+    path = getattr(route, "path", None)
+    if path is not None:
+        return path
+    mount_path = scope.get("root_path", "")
+    if mount_path != root_path:
+        return mount_path.removeprefix(root_path) + "/{path}"
+    return UNMATCHED_ROUTE
+
+
+class MetricsMiddleware:
+    """Middleware ASGI que alimenta `request_metrics`."""
+
+    def __init__(self, app, metrics: RequestMetrics = request_metrics):
+        self.app = app
+        self.metrics = metrics
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        method = scope["method"]
+        root_path = scope.get("root_path", "")
+        status = 500
+
+        async def send_with_status(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        shard = self.metrics.begin(method)
+        start = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            self.metrics.end(
+                shard,
+                method,
+                route_template(scope, root_path),
+                status,
+                time.perf_counter() - start,
+            )
@@ -0,0 +1,118 @@
+import threading
+import time
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
+
+from app.monitoring.histogram import Histogram
+
+
+class PoolStats:
+    """
+    Contadores de um pool de conexões: conexões criadas e invalidadas,
+    checkouts, timeouts e o histograma do tempo de espera por uma conexão.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.connections_created = 0
+        self.connections_invalidated = 0
+        self.checkouts = 0
+        self.checkout_timeouts = 0
+        self.checkout_wait = Histogram()
+
+    def _incr(self, name: str) -> None:
+        with self._lock:
+            setattr(self, name, getattr(self, name) + 1)
+
+    def on_connect(self, dbapi_connection, connection_record):
+        self._incr("connections_created")
+
+    def on_checkout(self, dbapi_connection, connection_record, connection_proxy):
+        self._incr("checkouts")
+
+    def on_invalidate(self, dbapi_connection, connection_record, exception):
+        self._incr("connections_invalidated")
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            counters = {
+                "connections_created": self.connections_created,
+                "connections_invalidated": self.connections_invalidated,
+                "checkouts": self.checkouts,
+                "checkout_timeouts": self.checkout_timeouts,
+            }
+        return {**counters, "checkout_wait_seconds": self.checkout_wait.snapshot()}
+
+
+class InstrumentedPoolMixin:
+    """
+    Mede quanto tempo cada `connect()` espera por uma conexão do pool.
+
+    O SQLAlchemy não tem um evento "antes do checkout", então a medição é
+    feita sobrescrevendo `connect()`. Sem `stats` associado, não mede nada.
+    """
+
+    stats: PoolStats | None = None
+
+    def connect(self):
+        stats = self.stats
+        if stats is None:
+            return super().connect()
+
+        start = time.perf_counter()
+        try:
+            return super().connect()
+        except PoolTimeoutError:
+            stats._incr("checkout_timeouts")
+            raise
+        finally:
+            stats.checkout_wait.observe(time.perf_counter() - start)
+
+    def recreate(self):
+        # engine.dispose() recria o pool; as estatísticas continuam as mesmas.
+        pool = super().recreate()
+        pool.stats = self.stats
+        return pool
+
+
+class InstrumentedQueuePool(InstrumentedPoolMixin, QueuePool):
+    pass
+
+
+class InstrumentedAsyncQueuePool(InstrumentedPoolMixin, AsyncAdaptedQueuePool):
+    pass
+
+
+def instrument_pool(engine: Engine) -> PoolStats:
+    """
+    Associa um PoolStats ao pool do engine e registra os listeners de pool.
+    Para engines assíncronos, passe `async_engine.sync_engine`.
+    """
+    stats = PoolStats()
+    engine.pool.stats = stats
+    event.listen(engine, "connect", stats.on_connect)
+    event.listen(engine, "checkout", stats.on_checkout)
+    event.listen(engine, "invalidate", stats.on_invalidate)
+    event.listen(engine, "soft_invalidate", stats.on_invalidate)
+    return stats
+
+
+def pool_snapshot(engine: Engine) -> dict:
+    """Estado atual do pool do engine junto com os contadores acumulados."""
+    pool = engine.pool
+    snapshot = {"pool_class": type(pool).__name__}
+    if isinstance(pool, QueuePool):
+        snapshot.update(
+            size=pool.size(),
+            checked_in=pool.checkedin(),
+            checked_out=pool.checkedout(),
+            overflow=pool.overflow(),
+            timeout=pool.timeout(),
+        )
+    stats = getattr(pool, "stats", None)
+    if stats is not None:
+        snapshot.update(stats.snapshot())
+    return snapshot
@@ -0,0 +1,221 @@
+import asyncio
+import cProfile
+import hmac
+import os
+import re
+import threading
+import time
+import uuid
+from contextvars import ContextVar
+from urllib.parse import parse_qs
+
+from jinja2 import Template
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from starlette.concurrency import run_in_threadpool
+
+from app.settings import get_settings
+
+settings = get_settings()
+
+# Cabeçalho e parâmetro de query que pedem o perfil; o valor é PROFILING_TOKEN.
+PROFILE_HEADER = b"x-profile"
+PROFILE_QUERY = "profile"
+# Cabeçalho da resposta com o nome do arquivo .prof gravado.
+PROFILE_ID_HEADER = b"x-profile-id"
+
+_PROFILE_NAME = re.compile(r"^[\w.-]+\.prof$")
+
+
+class RequestProfile:
+    """Tempos de banco e de templates acumulados durante uma requisição."""
+
+    def __init__(self):
+        self.id = f"{time.strftime('%Y%m%d-%H%M%S')}-{uuid.uuid4().hex[:8]}"
+        self.start = time.perf_counter()
+        self.db_seconds = 0.0
+        self.db_queries = 0
+        self.template_seconds = 0.0
+        self.template_renders = 0
+        self._lock = threading.Lock()
+
+    def add_db(self, elapsed: float) -> None:
+        with self._lock:
+            self.db_seconds += elapsed
+            self.db_queries += 1
+
+    def add_template(self, elapsed: float) -> None:
+        with self._lock:
+            self.template_seconds += elapsed
+            self.template_renders += 1
+
+    def server_timing(self) -> str:
+        """Valor do cabeçalho `Server-Timing` (exibido no DevTools do navegador)."""
+        total = time.perf_counter() - self.start
+        return ", ".join(
+            [
+                f'db;dur={self.db_seconds * 1000:.1f};desc="{self.db_queries} consultas"',
+                f"template;dur={self.template_seconds * 1000:.1f};"
+                f'desc="{self.template_renders} templates"',
+                f"total;dur={total * 1000:.1f}",
+            ]
+        )
+
+
+# Perfil da requisição atual. As rotas rodam o banco no threadpool (ou via
+# greenlet, no modo assíncrono); os dois propagam o contexto.
+current_profile: ContextVar[RequestProfile | None] = ContextVar(
+    "current_profile", default=None
+)
+
+
+class ProfiledTemplate(Template):
+    """Template do Jinja que soma o tempo de renderização ao perfil atual."""
+
+    def render(self, *args, **kwargs) -> str:
+        profile = current_profile.get()
+        if profile is None:
+            return super().render(*args, **kwargs)
+        start = time.perf_counter()
+        try:
+            return super().render(*args, **kwargs)
+        finally:
+            profile.add_template(time.perf_counter() - start)
+
+
+def instrument_templates(templates) -> None:
+    """Mede a renderização dos templates de um Jinja2Templates (se ativo)."""
+    if settings.PROFILING_TOKEN:
+        templates.env.template_class = ProfiledTemplate
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, many):
+    if current_profile.get() is not None:
+        context._profile_start_time = time.perf_counter()
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, many):
+    profile = current_profile.get()
+    start = getattr(context, "_profile_start_time", None)
+    if profile is not None and start is not None:
+        profile.add_db(time.perf_counter() - start)
+
+
+def instrument_engine(engine: Engine) -> None:
+    """Mede o tempo dos comandos SQL do engine (se ativo)."""
+    if settings.PROFILING_TOKEN:
+        event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+        event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+
+
+class ProfileStore:
+    """Diretório com os perfis gravados (pstats), limitado a `max_files`."""
+
+    def __init__(self, directory: str, max_files: int = 100):
+        self.directory = directory
+        self.max_files = max_files
+
+    def path(self, name: str) -> str | None:
+        if not _PROFILE_NAME.match(name):
+            return None
+        path = os.path.join(self.directory, name)
+        return path if os.path.isfile(path) else None
+
+    def list(self) -> list[dict]:
+        if not os.path.isdir(self.directory):
+            return []
+        entries = []
+        with os.scandir(self.directory) as it:
+            for entry in it:
+                if entry.is_file() and _PROFILE_NAME.match(entry.name):
+                    stat = entry.stat()
+                    entries.append(
+                        {
+                            "name": entry.name,
+                            "size": stat.st_size,
+                            "mtime": stat.st_mtime_ns / 1e9,
+                        }
+                    )
+        return sorted(entries, key=lambda e: e["mtime"], reverse=True)
+
+    def save(self, profiler: cProfile.Profile, name: str) -> str:
+        os.makedirs(self.directory, exist_ok=True)
+        path = os.path.join(self.directory, name)
+        profiler.dump_stats(path)
+        for old in self.list()[self.max_files :]:
+            os.unlink(os.path.join(self.directory, old["name"]))
+        return path
+
+
+profile_store = ProfileStore(settings.PROFILING_DIR, settings.PROFILING_MAX_FILES)
+
+
+def _requested(scope, token: str) -> bool:
+    # Compara bytes: com `str`, o compare_digest recusa (TypeError) valores
+    # com caracteres fora do ASCII, que vêm do cliente.
+    expected = token.encode()
+    for name, value in scope["headers"]:
+        if name == PROFILE_HEADER:
+            return hmac.compare_digest(value, expected)
+    query = scope.get("query_string", b"")
+    if PROFILE_QUERY.encode() in query:
+        values = parse_qs(query.decode("latin-1")).get(PROFILE_QUERY, [])
+        return any(hmac.compare_digest(value.encode(), expected) for value in values)
+    return False
+
+
+class ProfilingMiddleware:
+    """
+    Perfila as requisições que trazem o cabeçalho `X-Profile` (ou
+    `?profile=`) com o valor de PROFILING_TOKEN.
+
+    A requisição roda sob o cProfile e o resultado (pstats) é gravado em
+    PROFILING_DIR; a resposta traz o nome do arquivo em `X-Profile-Id` e os
+    tempos de banco, templates e total em `Server-Timing`. O banco e os
+    templates são medidos à parte porque rodam no threadpool, fora do alcance
+    do cProfile, que acompanha só a thread do event loop (e, nela, também as
+    outras requisições que estiverem em andamento). Um perfil por vez.
+
+    Só é instalado com PROFILING_TOKEN definido; sem ele não há custo.
+    """
+
+    def __init__(self, app, token: str, store: ProfileStore = profile_store):
+        self.app = app
+        self.token = token
+        self.store = store
+        self._lock = asyncio.Lock()
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not _requested(scope, self.token):
+            await self.app(scope, receive, send)
+            return
+
+        async with self._lock:
+            profile = RequestProfile()
+            name = f"{profile.id}-{scope['method']}{_slug(scope['path'])}.prof"
+
+            async def send_with_timing(message):
+                if message["type"] == "http.response.start":
+                    headers = list(message.get("headers", []))
+                    headers.append(
+                        (b"server-timing", profile.server_timing().encode("latin-1"))
+                    )
+                    headers.append((PROFILE_ID_HEADER, name.encode("latin-1")))
+                    message = {**message, "headers": headers}
+                await send(message)
+
+            token = current_profile.set(profile)
+            profiler = cProfile.Profile()
+            profiler.enable()
+            try:
+                await self.app(scope, receive, send_with_timing)
+            finally:
+                profiler.disable()
+                current_profile.reset(token)
+                # Gravar o .prof e apagar os antigos é E/S de disco: fora do
+                # event loop, mas ainda sob o lock (um perfil por vez).
+                await run_in_threadpool(self.store.save, profiler, name)
+
+
+def _slug(path: str) -> str:
+    return re.sub(r"[^\w]+", "_", path).rstrip("_")[:60]
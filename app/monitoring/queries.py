@@ -0,0 +1,151 @@
+import random
+import re
+import threading
+import time
+from functools import lru_cache
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from app.logger import logger
+
+sql_logger = logger.getChild("sql")
+
+# Chave usada para agrupar os comandos que excedem o limite de MAX_STATEMENTS.
+OTHER_STATEMENTS = "<outros>"
+
+_WHITESPACE = re.compile(r"\s+")
+_STRING_LITERAL = re.compile(r"'(?:[^']|'')*'")
+_NUMBER_LITERAL = re.compile(r"\b\d+(?:\.\d+)?\b")
+# Placeholders dos estilos usados pelos drivers: ?, %s, %(nome)s, $1, :nome
+_PLACEHOLDER = re.compile(r"\?|%s|%\(\w+\)s|\$\d+|(?<![:\w]):[a-zA-Z_]\w*")
+# Listas de placeholders, como as geradas por IN (...) com muitos valores.
+_PLACEHOLDER_LIST = re.compile(r"\?(?:\s*,\s*\?)+")
+
+_SENSITIVE_PARAMS = ("password", "secret", "token")
+_MAX_PARAM_LENGTH = 32
+
+
+@lru_cache(maxsize=1024)
+def normalize_statement(statement: str) -> str:
+    """
+    Normaliza um comando SQL para agregação: literais e placeholders viram
+    `?`, listas de placeholders viram `?, ...` e os espaços são colapsados.
+    """
+    normalized = _WHITESPACE.sub(" ", statement).strip()
+    normalized = _STRING_LITERAL.sub("?", normalized)
+    normalized = _PLACEHOLDER.sub("?", normalized)
+    normalized = _NUMBER_LITERAL.sub("?", normalized)
+    return _PLACEHOLDER_LIST.sub("?, ...", normalized)
+
+
+def _format_value(key, value):
+    if key is not None and any(word in str(key).lower() for word in _SENSITIVE_PARAMS):
+        return "***"
+    if isinstance(value, (str, bytes)) and len(value) > _MAX_PARAM_LENGTH:
+        return f"{value[:_MAX_PARAM_LENGTH]!r}... ({len(value)} chars)"
+    return repr(value)
+
+
+def format_parameters(parameters) -> str:
+    """
+    Representação curta dos parâmetros para o log: valores longos são
+    truncados e parâmetros sensíveis (senhas, tokens) são mascarados.
+    """
+    if isinstance(parameters, dict):
+        items = (f"{k}={_format_value(k, v)}" for k, v in parameters.items())
+        return "{" + ", ".join(items) + "}"
+    if isinstance(parameters, (list, tuple)):
+        if parameters and isinstance(parameters[0], (dict, list, tuple)):
+            # executemany: registra só o tamanho do lote.
+            return f"<{len(parameters)} conjuntos de parâmetros>"
+        return "(" + ", ".join(_format_value(None, v) for v in parameters) + ")"
+    return repr(parameters)
+
+
+class QueryStats:
+    """
+    Registra a duração de cada comando SQL de um engine, escreve no log os
+    comandos lentos (ou uma amostra dos demais) e mantém tempos agregados por
+    comando normalizado.
+    """
+
+    def __init__(
+        self,
+        slow_threshold_ms: float = 200.0,
+        sample_rate: float = 0.0,
+        max_statements: int = 500,
+    ):
+        self.slow_threshold = slow_threshold_ms / 1000
+        self.sample_rate = sample_rate
+        self.max_statements = max_statements
+        self._lock = threading.Lock()
+        # comando normalizado -> [chamadas, tempo total, tempo máximo]
+        self._stats: dict[str, list] = {}
+
+    def attach(self, engine: Engine) -> None:
+        event.listen(engine, "before_cursor_execute", self.before_cursor_execute)
+        event.listen(engine, "after_cursor_execute", self.after_cursor_execute)
+
+    def before_cursor_execute(
+        self, conn, cursor, statement, parameters, context, executemany
+    ):
+        # Guardado no contexto da execução: se o comando falhar, não sobra
+        # nada pendurado na conexão.
+        context._query_start_time = time.perf_counter()
+
+    def after_cursor_execute(
+        self, conn, cursor, statement, parameters, context, executemany
+    ):
+        elapsed = time.perf_counter() - context._query_start_time
+        normalized = normalize_statement(statement)
+        self.record(normalized, elapsed)
+
+        if elapsed >= self.slow_threshold:
+            sql_logger.warning(
+                "Consulta lenta (%.1f ms): %s | parâmetros: %s",
+                elapsed * 1000,
+                normalized,
+                format_parameters(parameters),
+            )
+        elif self.sample_rate and random.random() < self.sample_rate:
+            sql_logger.info(
+                "Consulta (%.1f ms): %s | parâmetros: %s",
+                elapsed * 1000,
+                normalized,
+                format_parameters(parameters),
+            )
+
+    def record(self, normalized: str, elapsed: float) -> None:
+        with self._lock:
+            entry = self._stats.get(normalized)
+            if entry is None:
+                if len(self._stats) >= self.max_statements:
+                    normalized = OTHER_STATEMENTS
+                entry = self._stats.setdefault(normalized, [0, 0.0, 0.0])
+            entry[0] += 1
+            entry[1] += elapsed
+            if elapsed > entry[2]:
+                entry[2] = elapsed
+
+    def snapshot(self, order_by: str = "total_ms", limit: int | None = None) -> list:
+        """Tempos agregados por comando, do mais custoso para o menos custoso."""
+        with self._lock:
+            items = [(stmt, *entry) for stmt, entry in self._stats.items()]
+
+        rows = [
+            {
+                "statement": stmt,
+                "calls": calls,
+                "total_ms": round(total * 1000, 3),
+                "mean_ms": round(total * 1000 / calls, 3),
+                "max_ms": round(maximum * 1000, 3),
+            }
+            for stmt, calls, total, maximum in items
+        ]
+        rows.sort(key=lambda row: row[order_by], reverse=True)
+        return rows[:limit] if limit else rows
+
+    def reset(self) -> None:
+        with self._lock:
+            self._stats.clear()
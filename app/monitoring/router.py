@@ -0,0 +1,182 @@
+from typing import Literal
+
+from fastapi import APIRouter, HTTPException, Query, Response, status
+from fastapi.responses import FileResponse
+
+from app import db
+from app.auth.current_user import AdminUser, CurrentUser
+from app.auth.hashing import password_hasher
+from app.auth.user_cache import user_cache
+from app.events import event_dispatcher
+from app.monitoring.metrics import (
+    CONTENT_TYPE,
+    format_labels,
+    render_metric,
+    request_metrics,
+)
+from app.monitoring.pool import pool_snapshot
+from app.monitoring.profiling import profile_store
+from app.monitoring.startup import startup_report
+from app.outbox.relay import outbox_relay
+from app.todo.live import todo_changes
+
+router = APIRouter(
+    prefix="/monitoring",
+    tags=["Monitoramento"],
+    responses={404: {"description": "Não encontrado"}},
+)
+
+# `/metrics` fica fora do prefixo e sem autenticação, como o Prometheus espera.
+metrics_router = APIRouter(tags=["Monitoramento"])
+
+
+@metrics_router.get(
+    "/metrics",
+    response_class=Response,
+    summary="Métricas no formato de texto do Prometheus",
+)
+async def get_metrics():
+    """
+    Retorna, para este worker, as contagens de requisições por método, rota
+    (o caminho com os parâmetros, ex.: `/api/todos/{todo_id}`) e status, os
+    histogramas de latência por rota, as requisições em andamento, as
+    conexões em uso de cada pool e as operações de hash de senhas em
+    andamento.
+    """
+    lines = request_metrics.render()
+
+    pools = {
+        name: pool_snapshot(engine) for name, engine in db.created_engines().items()
+    }
+    lines += render_metric(
+        "db_pool_connections_in_use",
+        "gauge",
+        "Conexões do pool emprestadas no momento.",
+        (
+            (format_labels(engine=name), pool["checked_out"])
+            for name, pool in pools.items()
+            if "checked_out" in pool
+        ),
+    )
+    lines += render_metric(
+        "password_hash_in_flight",
+        "gauge",
+        "Operações de hash de senhas em execução ou na fila.",
+        [("", password_hasher.snapshot()["in_flight"])],
+    )
+    return Response("\n".join(lines) + "\n", media_type=CONTENT_TYPE)
+
+
+@router.get("/db/pool", summary="Estatísticas do pool de conexões")
+async def get_pool_stats(current_user: CurrentUser):
+    """
+    Retorna o estado dos pools de conexão deste worker: tamanho, conexões em
+    uso, overflow, contadores de conexões criadas/invalidadas e o histograma
+    do tempo de espera por uma conexão (em segundos).
+    """
+    return {
+        name: pool_snapshot(engine) for name, engine in db.created_engines().items()
+    }
+
+
+@router.get("/db/queries", summary="Tempos agregados por comando SQL")
+async def get_query_stats(
+    current_user: CurrentUser,
+    order_by: Literal["total_ms", "mean_ms", "max_ms", "calls"] = "total_ms",
+    limit: int = Query(50, ge=1, le=500),
+):
+    """
+    Retorna, para cada comando SQL normalizado executado por este worker, o
+    número de chamadas e os tempos total, médio e máximo (em ms).
+    """
+    return db.query_stats.snapshot(order_by=order_by, limit=limit)
+
+
+@router.delete(
+    "/db/queries",
+    status_code=status.HTTP_204_NO_CONTENT,
+    summary="Zera os tempos agregados por comando SQL",
+)
+async def reset_query_stats(current_user: AdminUser):
+    """Zera os tempos de todos os comandos. Apenas administradores (ADMIN_USERNAMES)."""
+    db.query_stats.reset()
+
+
+@router.get("/auth/user-cache", summary="Estatísticas do cache de usuários")
+async def get_user_cache_stats(current_user: CurrentUser):
+    """
+    Retorna o tamanho do cache de usuários autenticados deste worker e os
+    contadores de hits, misses, remoções por LRU e invalidações.
+    """
+    return user_cache.snapshot()
+
+
+@router.get("/auth/hashing", summary="Estatísticas do pool de hash de senhas")
+async def get_password_hashing_stats(current_user: CurrentUser):
+    """
+    Retorna o tamanho do pool de hash de senhas deste worker, as operações em
+    andamento e na fila, quantas foram recusadas (503) e os histogramas de
+    latência do hash e da verificação (em segundos, incluindo a espera).
+    """
+    return password_hasher.snapshot()
+
+
+@router.get("/events", summary="Estatísticas da entrega assíncrona de eventos")
+async def get_event_dispatcher_stats(current_user: CurrentUser):
+    """
+    Retorna, para cada handler inscrito com `subscribe`, a profundidade atual
+    e máxima da fila, os eventos entregues, descartados por fila cheia e com
+    erro, e o histograma do tempo de cada lote. Inclui também os eventos
+    descartados por rollback.
+    """
+    return event_dispatcher.snapshot()
+
+
+@router.get("/outbox", summary="Estatísticas do relay do outbox")
+async def get_outbox_relay_stats(current_user: CurrentUser):
+    """
+    Retorna o estado do relay do outbox deste worker (ativo apenas com
+    OUTBOX_RELAY_ENABLED): eventos e lotes entregues, erros do sink e o
+    histograma do tempo de cada lote (em segundos).
+    """
+    return outbox_relay.snapshot()
+
+
+@router.get("/todos/live", summary="Estatísticas das atualizações em tempo real")
+async def get_todo_live_stats(current_user: CurrentUser):
+    """
+    Retorna o modo de entrega dos avisos (LISTEN/NOTIFY ou local), se a
+    conexão de LISTEN deste worker está ativa, quantos clientes SSE estão
+    conectados e os avisos recebidos, entregues e agrupados.
+    """
+    return todo_changes.snapshot()
+
+
+@router.get("/startup", summary="Tempos da inicialização deste worker")
+async def get_startup(current_user: CurrentUser):
+    """
+    Retorna quanto este worker levou para importar `app.main` e para cada
+    fase do startup do lifespan (banco, templates, listeners...), em segundos.
+    """
+    return startup_report.snapshot()
+
+
+@router.get("/profiles", summary="Perfis de requisições gravados")
+async def list_profiles(current_user: AdminUser):
+    """
+    Lista os perfis gravados pelo perfil sob demanda (cabeçalho `X-Profile`),
+    do mais recente para o mais antigo. Apenas administradores (ADMIN_USERNAMES).
+    """
+    return profile_store.list()
+
+
+@router.get("/profiles/{name}", summary="Baixa um perfil gravado (pstats)")
+async def get_profile(name: str, current_user: AdminUser):
+    """
+    Retorna o arquivo pstats do perfil, para abrir com `python -m pstats`,
+    snakeviz ou `gprof2dot`. Apenas administradores (ADMIN_USERNAMES).
+    """
+    path = profile_store.path(name)
+    if path is None:
+        raise HTTPException(status_code=404, detail="Perfil não encontrado.")
+    return FileResponse(path, media_type="application/octet-stream", filename=name)
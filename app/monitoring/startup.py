@@ -0,0 +1,216 @@
+"""
+Tempo de inicialização (cold start): importação da aplicação e fases do
+`lifespan`, medidos no próprio processo (`startup_report`, exposto em
+/monitoring/startup), e um relatório por módulo importado:
+
+    python -m app.monitoring.startup --top 20 --budget 3
+
+O relatório sobe um processo novo com `python -X importtime`, importa
+`app.main` e roda o startup do `lifespan`. Com `--budget` sai com erro se o
+processo levar mais que isso (em segundos) para ficar pronto.
+
+Só usa a biblioteca padrão no topo: é importado antes do resto da aplicação.
+"""
+
+import argparse
+import asyncio
+import contextlib
+import json
+import logging
+import os
+import re
+import subprocess
+import sys
+import threading
+import time
+
+# Tempo máximo padrão (segundos) entre criar o processo e o lifespan terminar
+# o startup; COLD_START_BUDGET_SECONDS sobrescreve.
+DEFAULT_BUDGET_SECONDS = 5.0
+
+_IMPORTTIME_LINE = re.compile(r"^import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)$")
+
+# Importado primeiro por `app.main`: o início da importação da aplicação.
+_IMPORT_STARTED = time.perf_counter()
+
+logger = logging.getLogger("main")
+
+
+class StartupReport:
+    """Tempos da importação de `app.main` e de cada fase do startup do lifespan."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.import_seconds: float | None = None
+        self.phases: dict[str, float] = {}
+        self.ready_at: float | None = None
+
+    def record_import(self, seconds: float | None = None) -> None:
+        """Sem `seconds`, registra o tempo desde a importação deste módulo."""
+        if seconds is None:
+            seconds = time.perf_counter() - _IMPORT_STARTED
+        self.import_seconds = seconds
+
+    @contextlib.contextmanager
+    def phase(self, name: str):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            with self._lock:
+                self.phases[name] = time.perf_counter() - start
+
+    def ready(self) -> None:
+        """Marca o fim do startup e escreve o resumo no log."""
+        self.ready_at = time.time()
+        lifespan = sum(self.phases.values())
+        logger.info(
+            "Inicialização: importação em %.0f ms, lifespan em %.0f ms (%s).",
+            (self.import_seconds or 0.0) * 1000,
+            lifespan * 1000,
+            ", ".join(
+                f"{name} {seconds * 1000:.0f} ms"
+                for name, seconds in self.phases.items()
+            ),
+        )
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            phases = dict(self.phases)
+        return {
+            "import_seconds": self.import_seconds,
+            "lifespan_seconds": sum(phases.values()),
+            "phases": phases,
+            "ready_at": self.ready_at,
+        }
+
+
+startup_report = StartupReport()
+
+
+def parse_importtime(output: str) -> list[dict]:
+    """
+    Linhas de `python -X importtime` (stderr) -> módulos com os tempos
+    próprio e acumulado (com os módulos que ele importou), em segundos.
+    """
+    modules = []
+    for line in output.splitlines():
+        match = _IMPORTTIME_LINE.match(line)
+        if match:
+            self_us, cumulative_us, indent, name = match.groups()
+            modules.append(
+                {
+                    "module": name,
+                    "self_seconds": int(self_us) / 1e6,
+                    "cumulative_seconds": int(cumulative_us) / 1e6,
+                    "depth": len(indent) // 2,
+                }
+            )
+    return modules
+
+
+def run_child() -> None:
+    """Processo medido: importa a aplicação, roda o startup e imprime o relatório."""
+    from app.main import app
+
+    async def startup():
+        async with app.router.lifespan_context(app):
+            pass
+
+    asyncio.run(startup())
+    print(json.dumps(startup_report.snapshot()))
+
+
+def measure_cold_start(env: dict | None = None) -> dict:
+    """
+    Sobe um processo novo e mede quanto ele leva para ficar pronto (do
+    `Popen` até o fim do startup do lifespan), com o tempo de importação de
+    cada módulo.
+    """
+    started_at = time.time()
+    result = subprocess.run(
+        [
+            sys.executable,
+            "-X",
+            "importtime",
+            "-c",
+            "from app.monitoring.startup import run_child; run_child()",
+        ],
+        env={**os.environ, **(env or {})},
+        capture_output=True,
+        text=True,
+        check=False,
+    )
+    if result.returncode != 0:
+        raise RuntimeError(f"O processo medido falhou:\n{result.stderr[-4000:]}")
+    report = json.loads(result.stdout.strip().splitlines()[-1])
+    report["cold_start_seconds"] = report["ready_at"] - started_at
+    report["modules"] = parse_importtime(result.stderr)
+    return report
+
+
+def format_report(report: dict, top: int = 20) -> str:
+    lines = [
+        f"Pronto em {report['cold_start_seconds'] * 1000:.0f} ms "
+        f"(importação de app.main {report['import_seconds'] * 1000:.0f} ms, "
+        f"lifespan {report['lifespan_seconds'] * 1000:.0f} ms)",
+        "",
+        "Fases do lifespan:",
+    ]
+    lines += [
+        f"  {name:<20} {seconds * 1000:8.1f} ms"
+        for name, seconds in report["phases"].items()
+    ]
+
+    def table(title, modules, key):
+        rows = sorted(modules, key=lambda m: m[key], reverse=True)[:top]
+        return ["", title] + [
+            f"  {m['module']:<50} {m['self_seconds'] * 1000:8.1f} "
+            f"{m['cumulative_seconds'] * 1000:8.1f} ms"
+            for m in rows
+        ]
+
+    modules = report["modules"]
+    lines += table(
+        f"Módulos da aplicação, por tempo acumulado (top {top}; próprio, acumulado):",
+        [m for m in modules if m["module"].split(".")[0] == "app"],
+        "cumulative_seconds",
+    )
+    lines += table(
+        f"Todos os módulos, por tempo próprio (top {top}; próprio, acumulado):",
+        modules,
+        "self_seconds",
+    )
+    return "\n".join(lines)
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="python -m app.monitoring.startup",
+        description="Tempo de inicialização da aplicação, por módulo e por fase.",
+    )
+    parser.add_argument("--top", type=int, default=20)
+    parser.add_argument("--json", help="Grava o relatório completo neste arquivo.")
+    parser.add_argument(
+        "--budget",
+        type=float,
+        help="Falha se o processo levar mais que isso (segundos) para ficar pronto.",
+    )
+    args = parser.parse_args(argv)
+
+    report = measure_cold_start()
+    print(format_report(report, top=args.top))
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as file:
+            json.dump(report, file, indent=2)
+    if args.budget is not None and report["cold_start_seconds"] > args.budget:
+        print(
+            f"\nInicialização em {report['cold_start_seconds']:.2f} s, "
+            f"acima do limite de {args.budget:.2f} s."
+        )
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,33 @@
+from datetime import datetime
+from typing import Optional
+
+from sqlalchemy import JSON, Column, Index, func, text
+from sqlmodel import Field, SQLModel
+
+
+class OutboxEvent(SQLModel, table=True):
+    """
+    Evento a publicar para fora da aplicação, gravado na mesma transação da
+    alteração que o originou e entregue depois pelo relay (app/outbox/relay.py).
+    """
+
+    __tablename__ = "outbox_event"
+    # O relay busca os pendentes em ordem de id; o índice parcial só contém
+    # esses, então não cresce com os já processados.
+    __table_args__ = (
+        Index(
+            "ix_outbox_event_pending",
+            "id",
+            postgresql_where=text("processed_at IS NULL"),
+            sqlite_where=text("processed_at IS NULL"),
+        ),
+    )
+
+    id: Optional[int] = Field(default=None, primary_key=True)
+    event_type: str = Field(max_length=100)  # ex.: "todo.created"
+    aggregate_id: int
+    payload: dict = Field(sa_column=Column(JSON, nullable=False))
+    created_at: Optional[datetime] = Field(
+        default=None, sa_column_kwargs={"server_default": func.now()}
+    )
+    processed_at: Optional[datetime] = None
@@ -0,0 +1,171 @@
+"""
+Relay do outbox: lê os eventos pendentes em `outbox_event` e os entrega a um
+sink, fora das requisições.
+
+Pode rodar como processo separado (`python -m app.outbox.relay`) ou dentro
+da aplicação (OUTBOX_RELAY_ENABLED). Vários relays podem rodar ao mesmo
+tempo: cada lote é reservado com `FOR UPDATE SKIP LOCKED`, então um relay
+pula as linhas que outro já está entregando em vez de esperar por elas.
+"""
+
+import asyncio
+import threading
+import time
+
+from sqlalchemy import delete, func, update
+from sqlalchemy.engine import Engine
+from sqlmodel import Session, select
+from starlette.concurrency import run_in_threadpool
+
+from app.db import get_engine
+from app.logger import logger
+from app.monitoring.histogram import Histogram
+from app.outbox.models import OutboxEvent
+from app.outbox.sinks import OutboxSink, create_sink
+from app.settings import get_settings
+
+settings = get_settings()
+
+
+def claim_statement(batch_size: int):
+    """SELECT que reserva o próximo lote de eventos pendentes, em ordem de id."""
+    return (
+        select(OutboxEvent)
+        .where(OutboxEvent.processed_at.is_(None))
+        .order_by(OutboxEvent.id)
+        .limit(batch_size)
+        .with_for_update(skip_locked=True)
+    )
+
+
+def serialize_event(event: OutboxEvent) -> dict:
+    return {
+        "id": event.id,
+        "event_type": event.event_type,
+        "aggregate_id": event.aggregate_id,
+        "payload": event.payload,
+        "created_at": event.created_at.isoformat() if event.created_at else None,
+    }
+
+
+class OutboxRelay:
+    """
+    Entrega os eventos do outbox em lotes de até `batch_size`.
+
+    Cada lote é reservado, enviado ao sink e removido (ou marcado com
+    `processed_at`, com `delete_delivered=False`) na mesma transação. Se o
+    sink falhar, a transação é desfeita e o lote volta a ficar pendente. A
+    entrega é "pelo menos uma vez": se o commit falhar depois do envio, o
+    lote é enviado de novo, e o consumidor deduplica pelo `id`.
+    """
+
+    def __init__(
+        self,
+        engine: Engine | None,
+        sink: OutboxSink,
+        batch_size: int = 100,
+        delete_delivered: bool = True,
+    ):
+        self.engine = engine
+        self.sink = sink
+        self.batch_size = batch_size
+        self.delete_delivered = delete_delivered
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._task: asyncio.Task | None = None
+        self.delivered = 0
+        self.batches = 0
+        self.errors = 0
+        self.latency = Histogram()
+
+    def run_once(self) -> int:
+        """Entrega um lote; retorna quantos eventos foram entregues."""
+        start = time.perf_counter()
+        with Session(self.engine or get_engine()) as session:
+            events = session.exec(claim_statement(self.batch_size)).all()
+            if not events:
+                return 0
+            ids = [event.id for event in events]
+            try:
+                self.sink.send([serialize_event(event) for event in events])
+            except Exception:
+                session.rollback()
+                with self._lock:
+                    self.errors += 1
+                raise
+
+            if self.delete_delivered:
+                session.execute(delete(OutboxEvent).where(OutboxEvent.id.in_(ids)))
+            else:
+                session.execute(
+                    update(OutboxEvent)
+                    .where(OutboxEvent.id.in_(ids))
+                    .values(processed_at=func.now())
+                )
+            session.commit()
+
+        with self._lock:
+            self.delivered += len(ids)
+            self.batches += 1
+        self.latency.observe(time.perf_counter() - start)
+        return len(ids)
+
+    def run_forever(self, poll_interval: float = 1.0) -> None:
+        """
+        Entrega lotes até `stop()`. Enquanto houver lotes cheios continua sem
+        esperar; com a fila vazia (ou após um erro) espera `poll_interval`.
+        """
+        self._stop.clear()
+        while not self._stop.is_set():
+            try:
+                delivered = self.run_once()
+            except Exception:
+                logger.exception("Erro ao entregar um lote do outbox.")
+                delivered = 0
+            if delivered < self.batch_size:
+                self._stop.wait(poll_interval)
+
+    async def start(self, poll_interval: float = 1.0) -> None:
+        """Roda `run_forever` no threadpool, como uma task da aplicação."""
+        self._task = asyncio.create_task(
+            run_in_threadpool(self.run_forever, poll_interval)
+        )
+
+    async def stop(self) -> None:
+        self._stop.set()
+        if self._task is not None:
+            await self._task
+            self._task = None
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            return {
+                "running": self._task is not None,
+                "batch_size": self.batch_size,
+                "delete_delivered": self.delete_delivered,
+                "delivered": self.delivered,
+                "batches": self.batches,
+                "errors": self.errors,
+                "batch_seconds": self.latency.snapshot(),
+            }
+
+
+# Sem engine: usa o da aplicação (`get_engine()`), criado no primeiro lote.
+outbox_relay = OutboxRelay(
+    None,
+    create_sink(settings.OUTBOX_SINK),
+    batch_size=settings.OUTBOX_BATCH_SIZE,
+    delete_delivered=settings.OUTBOX_DELETE_DELIVERED,
+)
+
+
+def main() -> None:
+    logger.info("Relay do outbox iniciado (sink: %s).", settings.OUTBOX_SINK)
+    try:
+        outbox_relay.run_forever(settings.OUTBOX_POLL_INTERVAL_SECONDS)
+    except KeyboardInterrupt:
+        logger.info("Relay do outbox encerrado.")
+
+
+if __name__ == "__main__":
+    main()
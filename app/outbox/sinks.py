@@ -0,0 +1,64 @@
+import json
+import os
+import threading
+from typing import Protocol
+
+from app.logger import logger
+
+
+class OutboxSink(Protocol):
+    """
+    Destino dos eventos do outbox. `send` recebe um lote e deve levantar uma
+    exceção se não conseguir entregá-lo: nesse caso o lote continua no outbox
+    e é tentado de novo. Um lote pode ser entregue mais de uma vez (ex.: falha
+    no commit depois do envio); o `id` de cada evento permite deduplicar.
+    """
+
+    def send(self, events: list[dict]) -> None: ...
+
+
+class LogSink:
+    """Escreve os eventos no log. Útil em desenvolvimento."""
+
+    def send(self, events: list[dict]) -> None:
+        for event in events:
+            logger.info("Evento do outbox: %s", json.dumps(event, default=str))
+
+
+class FileSink:
+    """Acrescenta os eventos a um arquivo NDJSON local, um por linha."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+
+    def send(self, events: list[dict]) -> None:
+        lines = "".join(json.dumps(event, default=str) + "\n" for event in events)
+        with self._lock, open(self.path, "a", encoding="utf-8") as file:
+            file.write(lines)
+            file.flush()
+            os.fsync(file.fileno())
+
+
+class InMemorySink:
+    """Guarda os eventos em uma lista. Para testes."""
+
+    def __init__(self):
+        self.events: list[dict] = []
+
+    def send(self, events: list[dict]) -> None:
+        self.events.extend(events)
+
+
+def create_sink(spec: str) -> OutboxSink:
+    """
+    Cria o sink a partir da configuração OUTBOX_SINK: `log`, `memory` ou
+    `file:<caminho>`.
+    """
+    if spec == "log":
+        return LogSink()
+    if spec == "memory":
+        return InMemorySink()
+    if spec.startswith("file:"):
+        return FileSink(spec.removeprefix("file:"))
+    raise ValueError(f"Sink do outbox desconhecido: '{spec}'.")
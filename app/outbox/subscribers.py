@@ -0,0 +1,60 @@
+from sqlalchemy import inspect, insert
+from sqlalchemy.orm import Session, object_session
+
+from app.events import listens_for
+from app.outbox.models import OutboxEvent
+from app.settings import get_settings
+from app.todo.models import Todo
+
+settings = get_settings()
+
+# Chave em `session.info` com as linhas do outbox geradas na transação.
+_PENDING_OUTBOX = "pending_outbox_events"
+
+# Nome publicado para cada evento de mapper de Todo.
+TODO_EVENT_TYPES = {
+    "after_insert": "todo.created",
+    "after_update": "todo.updated",
+    "after_delete": "todo.deleted",
+}
+
+
+def _outbox_listener(identifier: str):
+    event_type = TODO_EVENT_TYPES[identifier]
+
+    def record(mapper, connection, target: Todo):
+        if not settings.OUTBOX_ENABLED:
+            return
+        session = object_session(target)
+        if session is None:
+            return
+        state = inspect(target)
+        payload = {attr.key: state.dict.get(attr.key) for attr in mapper.column_attrs}
+        session.info.setdefault(_PENDING_OUTBOX, []).append(
+            {"event_type": event_type, "aggregate_id": target.id, "payload": payload}
+        )
+
+    record.__name__ = f"outbox_todo_{identifier}"
+    return record
+
+
+for _identifier in TODO_EVENT_TYPES:
+    listens_for(Todo, _identifier)(_outbox_listener(_identifier))
+
+
+@listens_for(Session, "before_commit")
+def before_commit_write_outbox(session):
+    """
+    Grava no outbox, na mesma transação das alterações, os eventos de Todo
+    acumulados: um único INSERT com todas as linhas. Se a transação for
+    desfeita, os eventos somem junto; se for confirmada, o relay os entrega.
+    """
+    session.flush()
+    rows = session.info.pop(_PENDING_OUTBOX, None)
+    if rows:
+        session.execute(insert(OutboxEvent), rows)
+
+
+@listens_for(Session, "after_rollback")
+def after_rollback_discard_outbox(session):
+    session.info.pop(_PENDING_OUTBOX, None)
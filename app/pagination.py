@@ -0,0 +1,28 @@
+import base64
+import json
+
+from fastapi import HTTPException, status
+
+
+def encode_cursor(last_id: int) -> str:
+    """Gera um cursor opaco (base64 url-safe) que aponta para depois de `last_id`."""
+    raw = json.dumps({"id": last_id}, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> int:
+    """
+    Decodifica um cursor gerado por `encode_cursor`.
+    Levanta HTTP 400 se o cursor for inválido.
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        last_id = json.loads(base64.urlsafe_b64decode(padded))["id"]
+        # `bool` é subclasse de `int`: {"id": true} não pode virar o ID 1.
+        if type(last_id) is not int:
+            raise ValueError(cursor)
+        return last_id
+    except (ValueError, KeyError, TypeError):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST, detail="Cursor inválido."
+        )
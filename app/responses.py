@@ -0,0 +1,80 @@
+import json
+from datetime import date, datetime
+from functools import cache
+
+from fastapi.responses import JSONResponse
+
+# Codificador JSON das respostas rápidas: orjson ou msgspec, se instalados
+# (`pip install .[fast-json]`), ou o json da biblioteca padrão.
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import msgspec
+except ImportError:
+    msgspec = None
+
+
+def _default(value):
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    raise TypeError(f"{type(value).__name__} não é serializável em JSON")
+
+
+if orjson is not None:
+    JSON_BACKEND = "orjson"
+
+    def dumps(content) -> bytes:
+        return orjson.dumps(content)
+
+elif msgspec is not None:
+    JSON_BACKEND = "msgspec"
+    dumps = msgspec.json.Encoder().encode
+
+else:
+    JSON_BACKEND = "json"
+
+    def dumps(content) -> bytes:
+        return json.dumps(
+            content, ensure_ascii=False, separators=(",", ":"), default=_default
+        ).encode("utf-8")
+
+
+class FastJSONResponse(JSONResponse):
+    """JSONResponse codificada com orjson/msgspec (ver `JSON_BACKEND`)."""
+
+    def render(self, content) -> bytes:
+        return dumps(content)
+
+
+@cache
+def _fields(model) -> tuple[str, ...]:
+    return tuple(model.model_fields)
+
+
+def trusted_rows(rows, model) -> list[dict]:
+    """
+    Converte objetos do ORM em dicts com os campos de `model` (o
+    `response_model` da rota), lendo os atributos diretamente.
+
+    O FastAPI validaria cada objeto de novo contra o `response_model` antes
+    de serializá-lo; para linhas que acabaram de vir do banco essa validação
+    não acrescenta nada e, em listas grandes, domina o tempo de CPU. Os
+    valores precisam ser tipos que o codificador já entende (str, int, bool,
+    None, datetime).
+
+    Os valores carregados ficam no `__dict__` da instância; lê-los dali evita
+    o descritor do SQLAlchemy em cada atributo. Atributos expirados (fora do
+    `__dict__`) passam pelo getattr, que os recarrega.
+    """
+    fields = _fields(model)
+    result = []
+    for row in rows:
+        values = row.__dict__
+        try:
+            result.append({field: values[field] for field in fields})
+        except KeyError:
+            result.append({field: getattr(row, field) for field in fields})
+    return result
@@ -1,3 +1,6 @@
+from functools import cache
+from typing import Literal
+
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
 
@@ -11,3 +14,106 @@ class Settings(BaseSettings):
     POSTGRES_USER: str
     POSTGRES_PASSWORD: str
     POSTGRES_DB: str
+
+    # Logging (app/logger.py). LOG_LEVELS e LOG_SAMPLE_RATES são por logger,
+    # em JSON: LOG_LEVELS='{"main.sql": "WARNING"}',
+    # LOG_SAMPLE_RATES='{"uvicorn.access": 0.1}' (fração mantida abaixo de WARNING).
+    LOG_LEVEL: str = "INFO"
+    LOG_FORMAT: Literal["text", "json"] = "text"
+    LOG_LEVELS: dict[str, str] = {}
+    LOG_SAMPLE_RATES: dict[str, float] = {}
+
+    # Contagens e latências por rota, servidas em /metrics (Prometheus).
+    METRICS_ENABLED: bool = True
+
+    # Perfil sob demanda (app/monitoring/profiling.py): requisições com o
+    # cabeçalho `X-Profile` ou `?profile=` iguais ao token rodam sob o
+    # cProfile. Vazio desativa (o middleware nem é instalado).
+    PROFILING_TOKEN: str = ""
+    PROFILING_DIR: str = "/tmp/profiles"
+    PROFILING_MAX_FILES: int = 100
+
+    # Pragmas do SQLite (app/sqlite.py) que sobrescrevem os padrões, em JSON:
+    # SQLITE_PRAGMAS='{"synchronous": "full"}'.
+    SQLITE_PRAGMAS: dict[str, str] = {}
+
+    # Usa o engine assíncrono (asyncpg) e AsyncSession nas rotas.
+    DATABASE_ASYNC: bool = False
+
+    # Pool de conexões (por processo/worker).
+    DB_POOL_SIZE: int = 5
+    DB_MAX_OVERFLOW: int = 10
+    DB_POOL_TIMEOUT: float = 30.0
+    DB_POOL_RECYCLE: int = 1800  # segundos; -1 desativa
+    DB_POOL_PRE_PING: bool = True
+
+    # Log de SQL. DB_ECHO escreve todos os comandos (apenas para depuração);
+    # em produção use o log de consultas lentas e a amostragem.
+    DB_ECHO: bool = False
+    SLOW_QUERY_THRESHOLD_MS: float = 200.0
+    QUERY_LOG_SAMPLE_RATE: float = 0.0  # fração das demais consultas a registrar
+    QUERY_STATS_MAX_STATEMENTS: int = 500
+
+    # Máximo de tarefas por resposta em GET /api/todos (também o padrão de `limit`).
+    TODO_LIST_MAX_ITEMS: int = 1000
+
+    # Listas de tarefas e de usuários serializadas direto das linhas do ORM,
+    # sem a validação do response_model, com orjson/msgspec se instalados
+    # (app/responses.py).
+    FAST_JSON_RESPONSES: bool = False
+
+    # Usuários que podem exportar as tarefas de todos os usuários e usar as
+    # rotas de monitoramento que alteram estado ou expõem perfis.
+    ADMIN_USERNAMES: list[str] = []
+    # Linhas buscadas por vez pelo cursor da exportação.
+    TODO_EXPORT_BATCH_SIZE: int = 1000
+
+    # Máximo de operações em POST /api/todos/batch.
+    TODO_BATCH_MAX_ITEMS: int = 1000
+
+    # Cache dos usuários autenticados (por processo). TTL 0 desativa.
+    USER_CACHE_MAX_SIZE: int = 1024
+    USER_CACHE_TTL_SECONDS: float = 60.0
+
+    # Pool de processos para o hash de senhas (argon2). 0 usa o threadpool.
+    PASSWORD_HASH_WORKERS: int = 2
+    # Operações esperando além das em execução; acima disso responde 503.
+    PASSWORD_HASH_QUEUE_LIMIT: int = 64
+
+    # Cache do fragmento HTML da lista de tarefas (por processo). TTL 0 desativa.
+    TODO_FRAGMENT_CACHE_MAX_SIZE: int = 1024
+    TODO_FRAGMENT_CACHE_TTL_SECONDS: float = 30.0
+
+    # Entrega assíncrona dos eventos de modelo (app/events.py: `subscribe`).
+    EVENT_QUEUE_MAX_SIZE: int = 10000  # por handler; acima disso descarta
+    EVENT_BATCH_MAX_SIZE: int = 100
+    EVENT_BATCH_MAX_DELAY_MS: float = 50.0
+
+    # Outbox de eventos de Todo (app/outbox), gravado na mesma transação.
+    # Só ative com um relay rodando (`python -m app.outbox.relay` ou
+    # OUTBOX_RELAY_ENABLED): sem ele a tabela cresce sem limite.
+    OUTBOX_ENABLED: bool = False
+    # Sink do relay: "log", "memory" ou "file:<caminho>" (NDJSON).
+    OUTBOX_SINK: str = "log"
+    OUTBOX_BATCH_SIZE: int = 100
+    OUTBOX_POLL_INTERVAL_SECONDS: float = 1.0
+    # Remove os eventos entregues; com False apenas preenche `processed_at`.
+    OUTBOX_DELETE_DELIVERED: bool = True
+    # Roda o relay dentro de cada worker da aplicação, em vez de um processo
+    # separado (`python -m app.outbox.relay`).
+    OUTBOX_RELAY_ENABLED: bool = False
+
+    # Atualizações em tempo real (SSE). No PostgreSQL os avisos passam pelo
+    # canal de LISTEN/NOTIFY abaixo, com uma conexão de LISTEN por worker.
+    TODO_CHANGES_CHANNEL: str = "todo_changes"
+    # Intervalo dos comentários de keep-alive enviados nas conexões ociosas.
+    SSE_KEEPALIVE_SECONDS: float = 15.0
+
+
+@cache
+def get_settings() -> Settings:
+    """
+    Configurações do processo, lidas (ambiente e `.env`) uma única vez, na
+    primeira chamada. Todos os módulos compartilham a mesma instância.
+    """
+    return Settings()
@@ -0,0 +1,125 @@
+import sqlite3
+import threading
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine, make_url
+
+# Pragmas aplicados a cada conexão nova. SQLITE_PRAGMAS (Settings) sobrescreve
+# ou acrescenta valores.
+DEFAULT_PRAGMAS = {
+    # Leitores não bloqueiam o escritor (e vice-versa). Bancos em memória
+    # ignoram e continuam com journal_mode=memory.
+    "journal_mode": "wal",
+    # Com WAL, NORMAL só sincroniza o disco nos checkpoints: um commit pode se
+    # perder numa queda de energia, mas o banco não se corrompe.
+    "synchronous": "normal",
+    "foreign_keys": "on",
+    # Espera (ms) pelo lock de escrita em vez de falhar na hora com
+    # "database is locked".
+    "busy_timeout": "5000",
+    # Valores negativos são em KiB: 64 MiB de cache de páginas por conexão.
+    "cache_size": "-65536",
+    "temp_store": "memory",
+    "mmap_size": "268435456",
+}
+
+# Nome do banco compartilhado quando DATABASE_URL é só `sqlite://`.
+DEFAULT_MEMORY_NAME = "app"
+
+
+def is_sqlite(url: str) -> bool:
+    return make_url(url).get_backend_name() == "sqlite"
+
+
+def memory_url(name: str = DEFAULT_MEMORY_NAME, driver: str = "sqlite") -> str:
+    """
+    URL de um banco em memória compartilhado (shared cache) entre as conexões
+    do processo. Um `sqlite://` comum dá um banco vazio e separado para cada
+    conexão do pool.
+    """
+    return f"{driver}:///file:{name}?mode=memory&cache=shared&uri=true"
+
+
+def is_memory(url: str) -> bool:
+    parsed = make_url(url)
+    if parsed.get_backend_name() != "sqlite":
+        return False
+    return parsed.database in (None, "", ":memory:") or (
+        parsed.query.get("mode") == "memory"
+    )
+
+
+def normalize_url(url: str) -> str:
+    """Troca o banco em memória privado (`sqlite://`) pelo compartilhado."""
+    parsed = make_url(url)
+    if parsed.get_backend_name() == "sqlite" and parsed.database in (
+        None,
+        "",
+        ":memory:",
+    ):
+        return memory_url(driver=parsed.drivername)
+    return url
+
+
+def engine_options(url: str) -> dict:
+    """Argumentos extras do `create_engine` para um banco SQLite."""
+    # O pool entrega a conexão a threads diferentes (threadpool do Starlette),
+    # nunca a duas ao mesmo tempo.
+    options = {"connect_args": {"check_same_thread": False}}
+    if is_memory(url):
+        # Conexões reaproveitadas nunca ficam velhas e não precisam de ping.
+        options |= {"pool_recycle": -1, "pool_pre_ping": False}
+    return options
+
+
+def _set_pragmas(pragmas: dict[str, str]):
+    def on_connect(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        try:
+            for name, value in pragmas.items():
+                cursor.execute(f"PRAGMA {name}={value}")
+        finally:
+            cursor.close()
+
+    return on_connect
+
+
+# Uma conexão aberta por banco em memória: o SQLite descarta o banco quando a
+# última conexão fecha (ex.: o pool reciclou todas, ou `engine.dispose()`).
+_keepalive: dict[str, sqlite3.Connection] = {}
+_keepalive_lock = threading.Lock()
+
+
+def _keep_alive(url: str) -> None:
+    parsed = make_url(url)
+    name = parsed.database
+    with _keepalive_lock:
+        if name not in _keepalive:
+            query = "&".join(
+                f"{key}={value}" for key, value in parsed.query.items() if key != "uri"
+            )
+            _keepalive[name] = sqlite3.connect(
+                f"{name}?{query}", uri=True, check_same_thread=False
+            )
+
+
+def release_memory_database(url: str) -> None:
+    """Fecha a conexão que mantém o banco em memória vivo (e o descarta)."""
+    with _keepalive_lock:
+        connection = _keepalive.pop(make_url(url).database, None)
+    if connection is not None:
+        connection.close()
+
+
+def configure_engine(engine: Engine, pragmas: dict[str, str] | None = None) -> None:
+    """
+    Aplica os pragmas (DEFAULT_PRAGMAS mais `pragmas`) a cada conexão do
+    engine e, para bancos em memória, mantém o banco vivo durante o processo.
+    Funciona também com o `sync_engine` de um engine assíncrono (aiosqlite).
+    """
+    event.listen(
+        engine, "connect", _set_pragmas({**DEFAULT_PRAGMAS, **(pragmas or {})})
+    )
+    url = engine.url.render_as_string(hide_password=False)
+    if is_memory(url):
+        _keep_alive(url)
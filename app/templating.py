@@ -0,0 +1,20 @@
+import os
+from functools import cache
+
+from fastapi.templating import Jinja2Templates
+
+from app.monitoring.profiling import instrument_templates
+
+TEMPLATES_DIR = os.path.join(os.path.dirname(__file__), "templates")
+
+
+@cache
+def get_templates() -> Jinja2Templates:
+    """
+    Templates da interface (HTMX), compartilhados pelos routers e criados na
+    primeira chamada (no `lifespan` da aplicação). Cada template é compilado
+    no primeiro uso e fica no cache do ambiente do Jinja.
+    """
+    templates = Jinja2Templates(directory=TEMPLATES_DIR)
+    instrument_templates(templates)
+    return templates
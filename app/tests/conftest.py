@@ -1,22 +1,74 @@
+import os
+
 import pytest
+import pytest_asyncio
 from fastapi.testclient import TestClient
+from sqlalchemy.ext.asyncio import create_async_engine
 from sqlmodel import Session, SQLModel, create_engine
+from sqlmodel.ext.asyncio.session import AsyncSession
 from app.main import app
-from app.db import get_session
+from app.db import async_database_url, get_session
+from app.sqlite import configure_engine as configure_sqlite
 from app.auth.security import get_password_hash
+from app.auth.user_cache import user_cache
+from app.todo.fragments import fragment_cache
 from app.tests.factories.todo import TodoFactory
 from app.tests.factories.users import UserFactory
-from testcontainers.postgres import PostgresContainer
+
+
+# Os testes rodam num arquivo SQLite novo por teste (com os mesmos pragmas da
+# aplicação). TEST_DATABASE=postgres usa um contêiner do PostgreSQL (Docker).
+TEST_DATABASE = os.environ.get("TEST_DATABASE", "sqlite")
+
+
+@pytest.fixture
+def database_url(tmp_path):
+    if TEST_DATABASE == "postgres":
+        from testcontainers.postgres import PostgresContainer
+
+        with PostgresContainer("postgres:16", driver="psycopg2") as postgres:
+            yield postgres.get_connection_url()
+    else:
+        yield f"sqlite:///{tmp_path / 'test.db'}"
+
+
+def _configure(engine):
+    if engine.dialect.name == "sqlite":
+        configure_sqlite(engine)
+    return engine
 
 
 @pytest.fixture
-def session():
-    with PostgresContainer("postgres:16", driver="psycopg2") as postgres:
-        engine = create_engine(postgres.get_connection_url())
-        SQLModel.metadata.create_all(engine)
-        with Session(engine) as session:
-            yield session
-        SQLModel.metadata.drop_all(engine)
+def session(database_url):
+    engine = _configure(create_engine(database_url))
+    SQLModel.metadata.create_all(engine)
+    with Session(engine) as session:
+        yield session
+    SQLModel.metadata.drop_all(engine)
+    engine.dispose()
+
+
+@pytest_asyncio.fixture
+async def async_session(database_url, session):
+    """
+    AsyncSession apontando para o mesmo banco da fixture `session`
+    (que já criou as tabelas).
+    """
+    engine = create_async_engine(async_database_url(database_url))
+    _configure(engine.sync_engine)
+    async with AsyncSession(engine, expire_on_commit=False) as async_session:
+        yield async_session
+    await engine.dispose()
+
+
+@pytest.fixture(autouse=True)
+def clear_caches():
+    # Cada teste tem um banco novo; o que ficou em cache de outro teste não vale.
+    user_cache.clear()
+    fragment_cache.clear()
+    yield
+    user_cache.clear()
+    fragment_cache.clear()
 
 
 # --- Client Fixture for API Testing ---
@@ -32,6 +84,13 @@ def client(session):
     app.dependency_overrides.clear()
 
 
+@pytest.fixture
+def ui_client(client, token):
+    """Cliente autenticado pelo cookie, como a interface HTMX."""
+    client.cookies.set("access_token", f"Bearer {token}")
+    return client
+
+
 @pytest.fixture
 def todo_factory(session) -> type[TodoFactory]:
     """
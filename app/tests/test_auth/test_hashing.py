@@ -0,0 +1,53 @@
+import asyncio
+
+import pytest
+from fastapi import HTTPException
+
+from app.auth.hashing import PasswordHasher
+from app.auth.security import verify_password
+
+
+@pytest.mark.asyncio
+async def test_hash_e_verificacao_no_pool_de_processos():
+    hasher = PasswordHasher(workers=1, queue_limit=4)
+    try:
+        hashed = await hasher.hash("segredo")
+        assert verify_password("segredo", hashed)
+        assert await hasher.verify("segredo", hashed)
+        assert not await hasher.verify("errada", hashed)
+    finally:
+        hasher.shutdown()
+
+    stats = hasher.snapshot()
+    assert stats["in_flight"] == 0
+    assert stats["hash_seconds"]["count"] == 1
+    assert stats["verify_seconds"]["count"] == 2
+
+
+@pytest.mark.asyncio
+async def test_fila_cheia_responde_503():
+    hasher = PasswordHasher(workers=0, queue_limit=1)
+    hashed = await hasher.hash("segredo")
+
+    results = await asyncio.gather(
+        hasher.verify("segredo", hashed),
+        hasher.verify("segredo", hashed),
+        return_exceptions=True,
+    )
+
+    assert results[0] is True
+    assert isinstance(results[1], HTTPException)
+    assert results[1].status_code == 503
+    assert results[1].headers["Retry-After"] == "1"
+    assert hasher.snapshot()["rejected"] == 1
+
+
+def test_login_com_fila_cheia_responde_503(client, user, monkeypatch):
+    monkeypatch.setattr("app.auth.router.password_hasher.queue_limit", 0)
+    monkeypatch.setattr("app.auth.router.password_hasher.workers", 0)
+
+    response = client.post(
+        "/auth/login", data={"username": user.username, "password": "teste"}
+    )
+
+    assert response.status_code == 503
@@ -0,0 +1,71 @@
+from app.auth.user_cache import UserCache, user_cache
+from app.user.models import User
+
+
+def _user(id: int, username: str) -> User:
+    return User(id=id, username=username, email=f"{username}@x.com", password="h")
+
+
+def test_user_cache_lru_remove_o_menos_usado():
+    cache = UserCache(max_size=2, ttl_seconds=60)
+    cache.put(_user(1, "a"))
+    cache.put(_user(2, "b"))
+    assert cache.get("a") is not None  # "b" passa a ser o menos usado
+    cache.put(_user(3, "c"))
+
+    assert cache.get("b") is None
+    assert cache.get("a").id == 1
+    stats = cache.snapshot()
+    assert stats["size"] == 2
+    assert stats["evictions"] == 1
+
+
+def test_user_cache_expira_pelo_ttl(monkeypatch):
+    cache = UserCache(max_size=10, ttl_seconds=5)
+    now = 1000.0
+    monkeypatch.setattr("app.auth.user_cache.time.monotonic", lambda: now)
+    cache.put(_user(1, "a"))
+    assert cache.get("a") is not None
+
+    now += 5
+    assert cache.get("a") is None
+    assert cache.snapshot()["size"] == 0
+
+
+def test_user_cache_invalida_pelo_id():
+    cache = UserCache()
+    cache.put(_user(1, "a"))
+    cache.invalidate(1)
+    assert cache.get("a") is None
+    assert cache.snapshot()["invalidations"] == 1
+
+
+def test_current_user_usa_o_cache(client, token):
+    headers = {"Authorization": f"Bearer {token}"}
+    client.get("/api/todos", headers=headers)
+    client.get("/api/todos", headers=headers)
+
+    stats = user_cache.snapshot()
+    assert stats["misses"] == 1
+    assert stats["hits"] == 1
+
+
+def test_update_do_usuario_invalida_o_cache(client, token, user):
+    headers = {"Authorization": f"Bearer {token}"}
+    client.get("/api/todos", headers=headers)
+    assert user_cache.snapshot()["size"] == 1
+
+    response = client.put(
+        f"/users/{user.id}", json={"email": "novo@example.com"}, headers=headers
+    )
+    assert response.status_code == 200
+    assert user_cache.snapshot()["size"] == 0
+
+
+def test_delete_do_usuario_invalida_o_cache(client, token, user):
+    headers = {"Authorization": f"Bearer {token}"}
+    response = client.delete(f"/users/{user.id}", headers=headers)
+    assert response.status_code == 204
+
+    response = client.get("/api/todos", headers=headers)
+    assert response.status_code == 401
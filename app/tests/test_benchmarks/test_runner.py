@@ -0,0 +1,83 @@
+import json
+import os
+from unittest.mock import patch
+
+import pytest
+
+from benchmarks.__main__ import main
+from benchmarks.runner import compare, format_comparison, measure, save_results
+
+
+def _result(median_s: float) -> dict:
+    return {"median_s": median_s, "min_s": median_s, "loops": 1, "rounds": 1}
+
+
+def test_compara_com_o_baseline():
+    baseline = {
+        "results": {
+            "lento": _result(0.010),
+            "estavel": _result(0.010),
+            "rapido": _result(0.010),
+        }
+    }
+    results = {
+        "lento": _result(0.0125),
+        "estavel": _result(0.0115),
+        "rapido": _result(0.005),
+        "novo": _result(0.001),
+    }
+
+    rows = {row["name"]: row for row in compare(baseline, results, 20.0)}
+
+    assert rows["lento"]["status"] == "regressed"
+    assert round(rows["lento"]["delta_pct"]) == 25
+    assert rows["estavel"]["status"] == "ok"
+    assert rows["rapido"]["status"] == "ok"
+    assert rows["novo"]["status"] == "new"
+    assert "PIOROU" in format_comparison(list(rows.values()))
+
+
+def test_limite_configuravel():
+    baseline = {"results": {"a": _result(0.010)}}
+    results = {"a": _result(0.0125)}
+
+    assert compare(baseline, results, 30.0)[0]["status"] == "ok"
+    assert compare(baseline, results, 10.0)[0]["status"] == "regressed"
+
+
+def test_mede_tempo_por_chamada():
+    result = measure(lambda: sum(range(100)), rounds=3)
+    assert result["rounds"] == 3
+    assert result["loops"] >= 1
+    assert 0 < result["min_s"] <= result["median_s"]
+
+
+# Só um benchmark barato, sobre uma base mínima.
+ARGS = ["--sizes", "3", "--rounds", "1", "--filter", "auth.decode"]
+
+
+@pytest.fixture
+def environ():
+    # main() completa os.environ com as variáveis padrão; desfeito no final.
+    with patch.dict(os.environ):
+        yield
+
+
+def test_sem_baseline_falha(tmp_path, environ):
+    assert main([*ARGS, "--baseline", str(tmp_path / "baseline.json")]) != 0
+
+
+def test_save_grava_o_baseline(tmp_path, environ):
+    path = tmp_path / "baseline.json"
+
+    assert main([*ARGS, "--baseline", str(path), "--save"]) == 0
+    assert "auth.decode" in json.loads(path.read_text())["results"]
+    assert main([*ARGS, "--baseline", str(path), "--max-regression", "1000"]) == 0
+
+
+def test_regressao_sai_com_erro(tmp_path, environ):
+    path = tmp_path / "baseline.json"
+    # Um baseline muito mais rápido que qualquer medição real.
+    save_results(str(path), {"auth.decode": _result(1e-12)})
+
+    assert main([*ARGS, "--baseline", str(path)]) != 0
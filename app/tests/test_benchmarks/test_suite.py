@@ -0,0 +1,31 @@
+import pytest
+from sqlalchemy import inspect
+from sqlmodel import Session, SQLModel, create_engine, select
+
+from app.user.models import User
+from benchmarks.suite import DatabaseNotEmpty, Suite
+
+
+def test_suite_cria_e_remove_o_esquema(tmp_path):
+    url = f"sqlite:///{tmp_path / 'bench.db'}"
+
+    with Suite(url, sizes=(3,)) as benchmarks:
+        assert benchmarks["todo_service.get_all_todos[3]"]()
+        assert benchmarks["serialize.response_model[3]"]()
+
+    assert inspect(create_engine(url)).get_table_names() == []
+
+
+def test_suite_recusa_banco_com_tabelas(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'dev.db'}")
+    SQLModel.metadata.create_all(engine)
+    with Session(engine) as session:
+        session.add(User(username="bench-3", email="b@b.com", password="hash"))
+        session.commit()
+
+    with pytest.raises(DatabaseNotEmpty):
+        with Suite(str(engine.url), sizes=(3,)):
+            pass
+
+    with Session(engine) as session:
+        assert session.exec(select(User.username)).all() == ["bench-3"]
@@ -0,0 +1,58 @@
+import pytest
+
+from app.db import async_database_url
+from app.todo.schemas import TodoUpdate
+from app.todo.services import AsyncTodoService
+from app.user.services import AsyncUserService
+
+
+def test_async_database_url_troca_o_driver():
+    assert (
+        async_database_url("postgresql+psycopg2://user:password@db:5432/mydatabase")
+        == "postgresql+asyncpg://user:password@db:5432/mydatabase"
+    )
+    assert (
+        async_database_url("postgresql://user:password@db:5432/mydatabase")
+        == "postgresql+asyncpg://user:password@db:5432/mydatabase"
+    )
+
+
+def test_async_database_url_sem_driver_assincrono():
+    with pytest.raises(ValueError):
+        async_database_url("mysql://user:password@db/mydatabase")
+
+
+@pytest.mark.asyncio
+async def test_async_todo_service_crud(async_session, user, session):
+    """
+    Testa o ciclo completo de uma tarefa usando o serviço sobre uma AsyncSession.
+    """
+    # O usuário da fixture só foi "flushed"; o commit o torna visível para a
+    # conexão da AsyncSession.
+    session.commit()
+    service = AsyncTodoService(async_session)
+
+    todo = await service.create_todo(content="Regar as plantas", user_id=user.id)
+    assert todo.id is not None
+
+    updated = await service.update_todo(
+        todo.id, TodoUpdate(completed=True), user_id=user.id
+    )
+    assert updated.completed is True
+
+    todos = await service.get_all_todos(user_id=user.id)
+    assert [t.id for t in todos] == [todo.id]
+
+    assert await service.delete_todo_by_id(todo.id, user_id=user.id) is True
+    assert await service.get_todo_by_id(todo.id) is None
+
+
+@pytest.mark.asyncio
+async def test_async_user_service_busca_por_username(async_session, user, session):
+    session.commit()
+    service = AsyncUserService(async_session)
+
+    found = await service.get_by_username(user.username)
+
+    assert found is not None
+    assert found.id == user.id
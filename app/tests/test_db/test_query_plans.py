@@ -0,0 +1,187 @@
+"""
+Regressão de planos de consulta.
+
+Os testes executam os métodos dos serviços sobre uma massa de dados, capturam
+cada comando SQL emitido e rodam `EXPLAIN` sobre ele. Um comando de caminho
+quente que faça varredura completa (seq scan) de `todo` ou `user` falha o
+teste, com o plano no relatório.
+"""
+
+import re
+from contextlib import contextmanager
+from datetime import datetime
+
+import pytest
+from sqlalchemy import event, insert
+
+from app.todo.models import Todo
+from app.todo.schemas import TodoBatchRequest, TodoPatch, TodoUpdate
+from app.todo.services import TodoService
+from app.user.models import User
+from app.user.schemas import UserUpdate
+from app.user.services import UserService
+
+# Tabelas pequenas demais levam o PostgreSQL a preferir seq scan mesmo com
+# índice; o volume aqui garante que o índice seja a escolha certa.
+USERS = 2000
+TODOS_PER_USER = 10
+HOT_TABLES = {"todo", "user"}
+
+_SQLITE_SCAN = re.compile(r'^SCAN (?:TABLE )?"?(\w+)"?')
+
+
+@pytest.fixture
+def dataset(client, session):
+    """
+    Massa de dados com USERS usuários e TODOS_PER_USER tarefas cada. A
+    fixture `client` garante que os listeners estão registrados, para que os
+    comandos que eles emitem também sejam verificados.
+    """
+    now = datetime.now()
+    session.execute(
+        insert(User),
+        [
+            {
+                "id": i,
+                "username": f"usuario{i}",
+                "email": f"usuario{i}@example.com",
+                "password": "hash",
+                "created_at": now,
+            }
+            for i in range(1, USERS + 1)
+        ],
+    )
+    session.execute(
+        insert(Todo),
+        [
+            {"content": f"tarefa {n}", "completed": n % 2 == 0, "user_id": user_id}
+            for user_id in range(1, USERS + 1)
+            for n in range(TODOS_PER_USER)
+        ],
+    )
+    session.commit()
+    with session.get_bind().connect() as connection:
+        connection.exec_driver_sql("ANALYZE")
+        connection.commit()
+    return session
+
+
+@contextmanager
+def capture_statements(engine):
+    """Captura (comando, parâmetros) de tudo que o engine executa."""
+    statements = []
+
+    def before_cursor_execute(conn, cursor, statement, parameters, context, many):
+        if not many and statement.lstrip().split(None, 1)[0].upper() in (
+            "SELECT",
+            "UPDATE",
+            "DELETE",
+        ):
+            statements.append((statement, parameters))
+
+    event.listen(engine, "before_cursor_execute", before_cursor_execute)
+    try:
+        yield statements
+    finally:
+        event.remove(engine, "before_cursor_execute", before_cursor_execute)
+
+
+def _pg_seq_scans(node, found):
+    if node.get("Node Type") == "Seq Scan":
+        found.add(node["Relation Name"])
+    for child in node.get("Plans", ()):
+        _pg_seq_scans(child, found)
+    return found
+
+
+def full_scans(connection, statement, parameters) -> tuple[set[str], str]:
+    """
+    Tabelas varridas por completo no plano do comando, e o plano em texto
+    para o relatório de falha.
+    """
+    if connection.dialect.name == "postgresql":
+        plan = connection.exec_driver_sql(
+            "EXPLAIN (FORMAT JSON) " + statement, parameters
+        ).scalar()
+        return _pg_seq_scans(plan[0]["Plan"], set()), str(plan)
+
+    rows = connection.exec_driver_sql(
+        "EXPLAIN QUERY PLAN " + statement, parameters
+    ).all()
+    details = [row[-1] for row in rows]
+    scans = {m.group(1) for d in details if (m := _SQLITE_SCAN.match(d))}
+    return scans, "\n".join(details)
+
+
+def assert_uses_indexes(session, statements):
+    offenders = []
+    with session.get_bind().connect() as connection:
+        for statement, parameters in statements:
+            scans, plan = full_scans(connection, statement, parameters)
+            if scans & HOT_TABLES:
+                offenders.append(f"{statement}\n{plan}")
+    assert not offenders, "Consultas sem índice:\n\n" + "\n\n".join(offenders)
+
+
+def test_explain_detecta_varredura_completa(dataset):
+    """Sanidade: um filtro por coluna sem índice precisa ser detectado."""
+    with capture_statements(dataset.get_bind()) as statements:
+        dataset.exec(Todo.__table__.select().where(Todo.content == "tarefa 1")).all()
+
+    with dataset.get_bind().connect() as connection:
+        scans, _ = full_scans(connection, *statements[0])
+    assert "todo" in scans
+
+
+def test_consultas_de_leitura_de_tarefas_usam_indices(dataset):
+    service = TodoService(dataset)
+    user_id = USERS // 2
+    todo_id = user_id * TODOS_PER_USER
+
+    with capture_statements(dataset.get_bind()) as statements:
+        service.get_all_todos(user_id=user_id)
+        service.get_todos_page(user_id=user_id, limit=10)
+        service.get_todos_page(
+            user_id=user_id, limit=10, after_id=todo_id - TODOS_PER_USER // 2
+        )
+        service.get_todo_by_id(todo_id)
+        service.get_todos_version(user_id)
+        service.search(user_id, "tarefa 3", limit=5)
+        for _ in service.stream_todos(user_id=user_id, batch_size=20):
+            pass
+
+    assert len(statements) >= 7
+    assert_uses_indexes(dataset, statements)
+
+
+def test_consultas_de_escrita_de_tarefas_usam_indices(dataset):
+    service = TodoService(dataset)
+    user_id = USERS // 2
+    ids = [todo.id for todo in service.get_all_todos(user_id=user_id)]
+
+    with capture_statements(dataset.get_bind()) as statements:
+        service.update_todo(ids[0], TodoUpdate(content="editada"), user_id=user_id)
+        service.toggle_todo(ids[1], user_id=user_id)
+        service.delete_todo_by_id(ids[2], user_id=user_id)
+        service.apply_batch(
+            TodoBatchRequest(
+                update=[TodoPatch(id=ids[3], completed=True)], delete=[ids[4]]
+            ),
+            user_id=user_id,
+        )
+
+    assert_uses_indexes(dataset, statements)
+
+
+def test_consultas_de_usuarios_usam_indices(dataset):
+    service = UserService(dataset)
+    user_id = USERS // 2
+
+    with capture_statements(dataset.get_bind()) as statements:
+        service.get_by_id(user_id)
+        service.get_by_username(f"usuario{user_id}")
+        service.update_user(user_id, UserUpdate(email="novo@example.com"))
+        # Apaga também as tarefas do usuário (cascade).
+        service.delete_user_by_id(user_id)
+
+    assert_uses_indexes(dataset, statements)
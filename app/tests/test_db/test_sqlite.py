@@ -0,0 +1,83 @@
+import pytest
+from sqlalchemy import inspect
+from sqlmodel import Session, create_engine, select
+
+from app.db import upgrade_database
+from app.sqlite import (
+    configure_engine,
+    engine_options,
+    is_memory,
+    memory_url,
+    normalize_url,
+    release_memory_database,
+)
+from app.todo.services import TodoService
+from app.user.models import User
+
+
+@pytest.fixture
+def memory_engine():
+    url = memory_url("teste")
+    engine = create_engine(url, **engine_options(url))
+    configure_engine(engine)
+    yield engine
+    engine.dispose()
+    release_memory_database(url)
+
+
+def test_normalize_url_compartilha_o_banco_em_memoria():
+    assert normalize_url("sqlite://") == memory_url()
+    assert normalize_url("sqlite:///:memory:") == memory_url()
+    assert normalize_url("sqlite+aiosqlite://").startswith("sqlite+aiosqlite:///file:")
+    assert normalize_url("sqlite:////tmp/app.db") == "sqlite:////tmp/app.db"
+    assert normalize_url("postgresql://u:p@db/app") == "postgresql://u:p@db/app"
+
+
+def test_is_memory():
+    assert is_memory("sqlite://")
+    assert is_memory(memory_url())
+    assert not is_memory("sqlite:////tmp/app.db")
+    assert not is_memory("postgresql://u:p@db/app")
+
+
+def test_pragmas_do_arquivo(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'app.db'}")
+    configure_engine(engine, {"synchronous": "full"})
+
+    with engine.connect() as connection:
+        pragma = connection.exec_driver_sql
+        assert pragma("PRAGMA journal_mode").scalar() == "wal"
+        assert pragma("PRAGMA foreign_keys").scalar() == 1
+        assert pragma("PRAGMA busy_timeout").scalar() == 5000
+        # 2 = FULL: SQLITE_PRAGMAS sobrescreve o padrão (NORMAL).
+        assert pragma("PRAGMA synchronous").scalar() == 2
+    engine.dispose()
+
+
+def test_memoria_compartilhada_e_mantida_viva(memory_engine):
+    """
+    As conexões do pool veem o mesmo banco, que sobrevive ao fechamento de
+    todas elas.
+    """
+    upgrade_database(memory_engine)
+    memory_engine.dispose()
+
+    assert "todo" in inspect(memory_engine).get_table_names()
+    with memory_engine.connect() as connection:
+        version = connection.exec_driver_sql("SELECT version_num FROM alembic_version")
+        assert version.scalar()
+
+
+def test_servicos_no_banco_em_memoria(memory_engine):
+    upgrade_database(memory_engine)
+
+    with Session(memory_engine) as session:
+        user = User(username="memoria", email="memoria@x.com", password="x")
+        session.add(user)
+        session.commit()
+        TodoService(session).create_todo("em memória", user_id=user.id)
+
+    with Session(memory_engine) as session:
+        user = session.exec(select(User)).one()
+        todos = TodoService(session).get_all_todos(user_id=user.id)
+        assert [todo.content for todo in todos] == ["em memória"]
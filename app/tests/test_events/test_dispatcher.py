@@ -0,0 +1,135 @@
+import asyncio
+import threading
+import time
+
+import pytest
+
+from app.dispatcher import EventDispatcher, ModelEvent
+from app.events import event_dispatcher
+from app.todo.models import Todo
+
+
+def _events(n, identifier="after_insert"):
+    return [ModelEvent(Todo, identifier, {"id": i}) for i in range(n)]
+
+
+@pytest.mark.asyncio
+async def test_entrega_em_lotes_para_handlers_sync_e_async():
+    dispatcher = EventDispatcher(batch_max_size=10, batch_max_delay=0.01)
+    async_batches, sync_batches = [], []
+
+    async def async_handler(events):
+        async_batches.append(events)
+
+    def sync_handler(events):
+        sync_batches.append((threading.current_thread().name, events))
+
+    dispatcher.subscribe(Todo, "after_insert", async_handler)
+    dispatcher.subscribe(Todo, "after_insert", sync_handler)
+    dispatcher.subscribe(Todo, "after_delete", sync_handler)
+    await dispatcher.start()
+
+    # Publicado de outra thread, como no commit de uma rota síncrona.
+    thread = threading.Thread(target=dispatcher.publish, args=(_events(25),))
+    thread.start()
+    thread.join()
+    await dispatcher.stop()
+
+    assert [len(batch) for batch in async_batches] == [10, 10, 5]
+    assert sum(len(batch) for _, batch in sync_batches) == 25
+    assert all(name != threading.current_thread().name for name, _ in sync_batches)
+    stats = dispatcher.snapshot()["subscriptions"]
+    assert stats["async_handler"]["delivered"] == 25
+    assert stats["async_handler"]["batches"] == 3
+
+
+@pytest.mark.asyncio
+async def test_fila_cheia_descarta_e_conta():
+    dispatcher = EventDispatcher(queue_max_size=3, batch_max_delay=0.01)
+    received = []
+
+    async def handler(events):
+        received.extend(events)
+
+    dispatcher.subscribe(Todo, "after_insert", handler)
+    await dispatcher.start()
+    dispatcher.publish(_events(5))
+    await dispatcher.stop()
+
+    stats = dispatcher.snapshot()["subscriptions"]["handler"]
+    assert len(received) == 3
+    assert stats["dropped_queue_full"] == 2
+    assert stats["queue_max_depth"] == 3
+
+
+@pytest.mark.asyncio
+async def test_erro_no_handler_nao_para_o_worker():
+    dispatcher = EventDispatcher(batch_max_size=1, batch_max_delay=0.01)
+    calls = []
+
+    async def handler(events):
+        calls.append(events)
+        if len(calls) == 1:
+            raise RuntimeError("falhou")
+
+    dispatcher.subscribe(Todo, "after_insert", handler)
+    await dispatcher.start()
+    dispatcher.publish(_events(2))
+    await dispatcher.stop()
+
+    stats = dispatcher.snapshot()["subscriptions"]["handler"]
+    assert stats["errors"] == 1
+    assert stats["delivered"] == 1
+
+
+def _wait_for(condition, timeout=2.0):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        if time.monotonic() > deadline:
+            raise AssertionError("condição não satisfeita a tempo")
+        time.sleep(0.01)
+
+
+def test_eventos_chegam_depois_do_commit(client, token):
+    before = event_dispatcher.snapshot()["subscriptions"]["log_todo_inserts"]
+
+    response = client.post(
+        "/api/todos/",
+        json={"content": "nova"},
+        headers={"Authorization": f"Bearer {token}"},
+    )
+    assert response.status_code == 201
+
+    def delivered():
+        stats = event_dispatcher.snapshot()["subscriptions"]["log_todo_inserts"]
+        return stats["delivered"] > before["delivered"]
+
+    _wait_for(delivered)
+
+
+def test_rollback_descarta_os_eventos(client, user, session):
+    before = event_dispatcher.snapshot()
+
+    session.add(Todo(content="desfeita", user_id=user.id))
+    session.flush()
+    session.rollback()
+
+    after = event_dispatcher.snapshot()
+    assert after["dropped_rollback"] == before["dropped_rollback"] + 1
+    assert after["published"] == before["published"]
+
+
+@pytest.mark.asyncio
+async def test_stop_entrega_o_que_esta_na_fila():
+    dispatcher = EventDispatcher(batch_max_delay=10)
+    received = []
+
+    async def handler(events):
+        received.extend(events)
+
+    dispatcher.subscribe(Todo, "after_insert", handler)
+    await dispatcher.start()
+    dispatcher.publish(_events(3))
+    await asyncio.wait_for(dispatcher.stop(), timeout=1)
+
+    assert len(received) == 3
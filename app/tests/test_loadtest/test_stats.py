@@ -0,0 +1,27 @@
+from loadtest.stats import Recorder, format_report, percentile
+
+
+def test_percentil_nearest_rank():
+    values = [i / 100 for i in range(1, 101)]
+    assert percentile(values, 0.50) == 0.50
+    assert percentile(values, 0.95) == 0.95
+    assert percentile(values, 0.99) == 0.99
+    assert percentile([0.3], 0.99) == 0.3
+    assert percentile([], 0.5) == 0.0
+
+
+def test_resumo_por_rota():
+    recorder = Recorder()
+    for i in range(10):
+        recorder.record("GET /api/todos/", 0.01 * (i + 1), ok=True)
+    recorder.record("PUT /api/todos/{todo_id}", 0.5, ok=False)
+    recorder.stop()
+
+    summary = recorder.summary()
+    listing = summary["routes"]["GET /api/todos/"]
+    assert listing["requests"] == 10
+    assert round(listing["p50_ms"]) == 50
+    assert round(listing["p99_ms"]) == 100
+    assert summary["errors"] == 1
+    assert summary["requests"] == 11
+    assert "PUT /api/todos/{todo_id}" in format_report(summary)
@@ -0,0 +1,92 @@
+import io
+import json
+import logging
+import sys
+
+import pytest
+
+from app.logger import JsonFormatter, SamplingFilter, setup_logging, stop_logging
+from app.settings import Settings
+
+
+@pytest.fixture
+def configure_logging():
+    """Reconfigura o logging com as opções do teste e restaura no final."""
+    stream = io.StringIO()
+
+    def configure(**options):
+        setup_logging(Settings(**options), stream=stream)
+
+    yield configure, stream
+    setup_logging(Settings())
+    for name in ("teste", "teste.filho"):
+        logging.getLogger(name).setLevel(logging.NOTSET)
+
+
+def _record(name="teste", level=logging.INFO, msg="ola %s", args=("mundo",)):
+    return logging.LogRecord(name, level, __file__, 1, msg, args, None)
+
+
+def test_json_formatter_inclui_extras_e_excecao():
+    try:
+        raise ValueError("falhou")
+    except ValueError:
+        record = logging.LogRecord(
+            "teste", logging.ERROR, __file__, 1, "erro %d", (42,), True
+        )
+        record.exc_info = sys.exc_info()
+    record.request_id = "abc"
+
+    entry = json.loads(JsonFormatter().format(record))
+
+    assert entry["level"] == "ERROR"
+    assert entry["logger"] == "teste"
+    assert entry["message"] == "erro 42"
+    assert entry["request_id"] == "abc"
+    assert "ValueError: falhou" in entry["exception"]
+    assert entry["timestamp"].endswith("Z")
+
+
+def test_amostragem_por_logger(monkeypatch):
+    sampling = SamplingFilter({"teste": 0.0, "teste.filho": 1.0})
+
+    assert not sampling.filter(_record("teste"))
+    assert not sampling.filter(_record("teste.outro"))
+    assert sampling.filter(_record("teste.filho.neto"))
+    assert sampling.filter(_record("outro"))
+    # Avisos e erros nunca são descartados.
+    assert sampling.filter(_record("teste", logging.WARNING))
+
+
+def test_escrita_em_segundo_plano_em_json(configure_logging):
+    configure, stream = configure_logging
+    configure(
+        LOG_FORMAT="json",
+        LOG_LEVELS={"teste.filho": "WARNING"},
+        LOG_SAMPLE_RATES={"teste.amostrado": 0.0},
+    )
+
+    logging.getLogger("teste").info("valor %s", "a", extra={"user_id": 7})
+    logging.getLogger("teste.filho").info("abaixo do nível")
+    logging.getLogger("teste.amostrado").info("descartado")
+    logging.getLogger("teste.filho").warning("acima do nível")
+    # Espera a thread de escrita esvaziar a fila.
+    stop_logging()
+
+    entries = [json.loads(line) for line in stream.getvalue().splitlines()]
+    assert [(e["logger"], e["message"]) for e in entries] == [
+        ("teste", "valor a"),
+        ("teste.filho", "acima do nível"),
+    ]
+    assert entries[0]["user_id"] == 7
+
+
+def test_argumentos_nao_sao_formatados_abaixo_do_nivel(configure_logging):
+    configure, _ = configure_logging
+    configure(LOG_LEVELS={"teste": "WARNING"})
+
+    class Explode:
+        def __str__(self):
+            raise AssertionError("formatado sem necessidade")
+
+    logging.getLogger("teste").info("%s", Explode())
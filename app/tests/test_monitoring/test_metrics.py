@@ -0,0 +1,78 @@
+import threading
+
+from app.monitoring.metrics import RequestMetrics, request_metrics
+
+
+def _metric_lines(client, prefix):
+    response = client.get("/metrics")
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain; version=0.0.4")
+    return [line for line in response.text.splitlines() if line.startswith(prefix)]
+
+
+def test_metricas_usam_o_template_da_rota(client, token, todo_factory, user):
+    request_metrics.reset()
+    headers = {"Authorization": f"Bearer {token}"}
+    todos = todo_factory.create_batch(2, user_id=user.id)
+    for todo in todos:
+        client.get(f"/api/todos/{todo.id}", headers=headers)
+    client.get("/api/todos/999999", headers=headers)
+    client.get("/nao-existe")
+
+    lines = _metric_lines(client, "http_requests_total")
+    assert (
+        'http_requests_total{method="GET",route="/api/todos/{todo_id}",status="200"} 2'
+        in lines
+    )
+    assert (
+        'http_requests_total{method="GET",route="/api/todos/{todo_id}",status="404"} 1'
+        in lines
+    )
+    assert any('route="<unmatched>"' in line for line in lines)
+    assert not any(f"/api/todos/{todos[0].id}" in line for line in lines)
+
+    count = _metric_lines(
+        client,
+        'http_request_duration_seconds_count{method="GET",route="/api/todos/{todo_id}"}',
+    )
+    assert count == [
+        'http_request_duration_seconds_count{method="GET",route="/api/todos/{todo_id}"} 3'
+    ]
+
+
+def test_requisicao_em_andamento_aparece_no_gauge(client):
+    request_metrics.reset()
+    # A própria leitura de /metrics está em andamento enquanto é renderizada.
+    assert 'http_requests_in_flight{method="GET"} 1' in _metric_lines(
+        client, "http_requests_in_flight"
+    )
+    assert _metric_lines(client, "db_pool_connections_in_use{")
+    assert _metric_lines(client, "password_hash_in_flight ")
+
+
+def test_agregacao_por_thread():
+    metrics = RequestMetrics(buckets=(0.1, 1.0))
+
+    def work():
+        for _ in range(1000):
+            shard = metrics.begin("GET")
+            metrics.end(shard, "GET", "/x", 200, 0.5)
+
+    threads = [threading.Thread(target=work) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    lines = metrics.render()
+    assert 'http_requests_total{method="GET",route="/x",status="200"} 4000' in lines
+    assert (
+        'http_request_duration_seconds_bucket{method="GET",route="/x",le="0.1"} 0'
+        in lines
+    )
+    assert (
+        'http_request_duration_seconds_bucket{method="GET",route="/x",le="1.0"} 4000'
+        in lines
+    )
+    assert 'http_request_duration_seconds_sum{method="GET",route="/x"} 2000.0' in lines
+    assert 'http_requests_in_flight{method="GET"} 0' in lines
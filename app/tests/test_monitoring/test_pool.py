@@ -0,0 +1,67 @@
+import pytest
+from sqlalchemy import create_engine, exc
+
+from app.monitoring.pool import InstrumentedQueuePool, instrument_pool, pool_snapshot
+
+
+@pytest.fixture
+def small_engine(database_url):
+    engine = create_engine(
+        database_url,
+        poolclass=InstrumentedQueuePool,
+        pool_size=1,
+        max_overflow=0,
+        pool_timeout=0.1,
+    )
+    instrument_pool(engine)
+    yield engine
+    engine.dispose()
+
+
+def test_pool_stats_conta_checkouts_e_timeouts(small_engine):
+    """
+    Com pool_size=1 e sem overflow, o segundo checkout simultâneo estoura o timeout.
+    """
+    with small_engine.connect():
+        snapshot = pool_snapshot(small_engine)
+        assert snapshot["checked_out"] == 1
+
+        with pytest.raises(exc.TimeoutError):
+            small_engine.connect()
+
+    snapshot = pool_snapshot(small_engine)
+    assert snapshot["checked_out"] == 0
+    assert snapshot["connections_created"] == 1
+    assert snapshot["checkouts"] == 1
+    assert snapshot["checkout_timeouts"] == 1
+    assert snapshot["checkout_wait_seconds"]["count"] == 2
+
+
+def test_pool_stats_sobrevive_ao_dispose(small_engine):
+    with small_engine.connect():
+        pass
+    small_engine.dispose()
+    with small_engine.connect():
+        pass
+
+    snapshot = pool_snapshot(small_engine)
+    assert snapshot["connections_created"] == 2
+    assert snapshot["checkouts"] == 2
+
+
+def test_endpoint_pool_stats(client, token):
+    response = client.get(
+        "/monitoring/db/pool",
+        headers={"Authorization": f"Bearer {token}"},
+    )
+
+    assert response.status_code == 200
+    data = response.json()
+    assert data["sync"]["pool_class"] == "InstrumentedQueuePool"
+    assert "checkout_wait_seconds" in data["sync"]
+
+
+def test_endpoint_pool_stats_exige_autenticacao(client):
+    response = client.get("/monitoring/db/pool")
+
+    assert response.status_code == 401
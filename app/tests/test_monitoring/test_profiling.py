@@ -0,0 +1,113 @@
+import pstats
+
+import pytest
+from fastapi import FastAPI
+from fastapi.responses import HTMLResponse
+from fastapi.testclient import TestClient
+from jinja2 import DictLoader, Environment
+from sqlalchemy import event, text
+
+from app.auth.current_user import settings
+from app.monitoring import profiling
+from app.monitoring.profiling import ProfiledTemplate, ProfileStore, ProfilingMiddleware
+
+TOKEN = "segredo"
+
+
+@pytest.fixture
+def profiled_app(session, tmp_path, monkeypatch):
+    monkeypatch.setattr(profiling.settings, "PROFILING_TOKEN", TOKEN)
+    engine = session.get_bind()
+    profiling.instrument_engine(engine)
+    env = Environment(loader=DictLoader({"t.html": "<p>{{ n }}</p>"}))
+    env.template_class = ProfiledTemplate
+
+    app = FastAPI()
+
+    @app.get("/lento")
+    def slow():
+        with engine.connect() as connection:
+            n = connection.execute(text("SELECT 1")).scalar()
+            connection.execute(text("SELECT 2"))
+        return HTMLResponse(env.get_template("t.html").render(n=n))
+
+    store = ProfileStore(str(tmp_path), max_files=2)
+    app.add_middleware(ProfilingMiddleware, token=TOKEN, store=store)
+    yield TestClient(app), store
+    event.remove(engine, "before_cursor_execute", profiling._before_cursor_execute)
+    event.remove(engine, "after_cursor_execute", profiling._after_cursor_execute)
+
+
+def test_perfil_com_cabecalho_autorizado(profiled_app):
+    client, store = profiled_app
+    response = client.get("/lento", headers={"X-Profile": TOKEN})
+
+    assert response.status_code == 200
+    timing = response.headers["server-timing"]
+    assert 'desc="2 consultas"' in timing
+    assert 'desc="1 templates"' in timing
+    assert "total;dur=" in timing
+
+    name = response.headers["x-profile-id"]
+    path = store.path(name)
+    assert path is not None
+    assert pstats.Stats(path).total_calls > 0
+    assert [entry["name"] for entry in store.list()] == [name]
+
+
+def test_perfil_pela_query(profiled_app):
+    client, store = profiled_app
+    response = client.get(f"/lento?profile={TOKEN}")
+    assert "x-profile-id" in response.headers
+
+
+def test_sem_token_valido_nao_perfila(profiled_app):
+    client, store = profiled_app
+    for headers, url in [({}, "/lento"), ({"X-Profile": "errado"}, "/lento?profile=x")]:
+        response = client.get(url, headers=headers)
+        assert response.status_code == 200
+        assert "server-timing" not in response.headers
+    assert store.list() == []
+
+
+def test_token_com_caracteres_fora_do_ascii_nao_perfila(profiled_app):
+    client, store = profiled_app
+    for headers, url in [
+        ({"X-Profile": "é".encode()}, "/lento"),
+        ({}, "/lento?profile=%C3%A9"),
+    ]:
+        response = client.get(url, headers=headers)
+        assert response.status_code == 200
+        assert "server-timing" not in response.headers
+    assert store.list() == []
+
+
+def test_guarda_no_maximo_max_files(profiled_app):
+    client, store = profiled_app
+    names = [
+        client.get("/lento", headers={"X-Profile": TOKEN}).headers["x-profile-id"]
+        for _ in range(3)
+    ]
+    assert len(store.list()) == 2
+    assert store.path(names[0]) is None
+    assert store.path(names[-1]) is not None
+    assert store.path("../segredo.prof") is None
+
+
+def test_baixar_perfil_exige_admin(client, token, user, monkeypatch):
+    headers = {"Authorization": f"Bearer {token}"}
+    url = "/monitoring/profiles/inexistente.prof"
+
+    assert client.get(url, headers=headers).status_code == 403
+
+    monkeypatch.setattr(settings, "ADMIN_USERNAMES", [user.username])
+    assert client.get(url, headers=headers).status_code == 404
+
+
+def test_listar_perfis_exige_admin(client, token, user, monkeypatch):
+    headers = {"Authorization": f"Bearer {token}"}
+
+    assert client.get("/monitoring/profiles", headers=headers).status_code == 403
+
+    monkeypatch.setattr(settings, "ADMIN_USERNAMES", [user.username])
+    assert client.get("/monitoring/profiles", headers=headers).status_code == 200
@@ -0,0 +1,85 @@
+import logging
+
+from sqlalchemy import create_engine, text
+
+from app.auth.current_user import settings
+from app.monitoring.queries import (
+    OTHER_STATEMENTS,
+    QueryStats,
+    format_parameters,
+    normalize_statement,
+)
+
+
+def test_normalize_statement():
+    assert (
+        normalize_statement(
+            "SELECT todo.id\n  FROM todo\n WHERE todo.user_id = %(user_id_1)s"
+            " AND todo.content = 'abc' LIMIT 10"
+        )
+        == "SELECT todo.id FROM todo WHERE todo.user_id = ? AND todo.content = ? LIMIT ?"
+    )
+    assert (
+        normalize_statement("SELECT * FROM todo WHERE id IN ($1, $2, $3)")
+        == "SELECT * FROM todo WHERE id IN (?, ...)"
+    )
+    assert normalize_statement("SELECT CAST(? AS INTEGER)::INTEGER") == (
+        "SELECT CAST(? AS INTEGER)::INTEGER"
+    )
+
+
+def test_format_parameters_mascara_e_trunca():
+    formatted = format_parameters({"password": "segredo", "content": "x" * 100})
+
+    assert "segredo" not in formatted
+    assert "password=***" in formatted
+    assert "(100 chars)" in formatted
+    assert format_parameters([{"a": 1}, {"a": 2}]) == "<2 conjuntos de parâmetros>"
+
+
+def test_query_stats_agrega_e_registra_consultas_lentas(database_url, caplog):
+    engine = create_engine(database_url)
+    stats = QueryStats(slow_threshold_ms=0)
+    stats.attach(engine)
+
+    with caplog.at_level(logging.WARNING, logger="main.sql"):
+        with engine.connect() as connection:
+            for value in range(3):
+                connection.execute(text("SELECT :value"), {"value": value})
+
+    rows = [row for row in stats.snapshot() if row["statement"] == "SELECT ?"]
+    assert rows and rows[0]["calls"] == 3
+    assert "Consulta lenta" in caplog.text
+    engine.dispose()
+
+
+def test_query_stats_limita_numero_de_comandos():
+    stats = QueryStats(max_statements=2)
+    for statement in ("SELECT 1", "SELECT 2", "SELECT 3", "SELECT 4"):
+        stats.record(statement, 0.001)
+
+    statements = {row["statement"]: row["calls"] for row in stats.snapshot()}
+    assert statements == {"SELECT 1": 1, "SELECT 2": 1, OTHER_STATEMENTS: 2}
+
+    stats.reset()
+    assert stats.snapshot() == []
+
+
+def test_endpoint_query_stats(client, token):
+    headers = {"Authorization": f"Bearer {token}"}
+
+    response = client.get("/monitoring/db/queries", headers=headers)
+    assert response.status_code == 200
+    assert isinstance(response.json(), list)
+
+    response = client.delete("/monitoring/db/queries", headers=headers)
+    assert response.status_code == 403
+
+
+def test_zerar_query_stats_como_admin(client, token, user, monkeypatch):
+    monkeypatch.setattr(settings, "ADMIN_USERNAMES", [user.username])
+
+    response = client.delete(
+        "/monitoring/db/queries", headers={"Authorization": f"Bearer {token}"}
+    )
+    assert response.status_code == 204
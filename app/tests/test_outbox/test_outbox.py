@@ -0,0 +1,140 @@
+import json
+
+import pytest
+from sqlalchemy.dialects import postgresql
+from sqlmodel import select
+
+from app.outbox.models import OutboxEvent
+from app.outbox.relay import OutboxRelay, claim_statement
+from app.outbox.sinks import FileSink, InMemorySink, create_sink
+from app.outbox.subscribers import settings
+from app.todo.models import Todo
+
+
+@pytest.fixture(autouse=True)
+def outbox_enabled(monkeypatch):
+    monkeypatch.setattr(settings, "OUTBOX_ENABLED", True)
+
+
+class FailingSink:
+    def send(self, events):
+        raise RuntimeError("destino indisponível")
+
+
+def _outbox(session):
+    session.expire_all()
+    return session.exec(select(OutboxEvent).order_by(OutboxEvent.id)).all()
+
+
+def test_alteracoes_de_tarefas_gravam_no_outbox(client, token, session):
+    session.commit()
+    headers = {"Authorization": f"Bearer {token}"}
+    todo_id = client.post(
+        "/api/todos/", json={"content": "nova"}, headers=headers
+    ).json()["id"]
+    client.put(f"/api/todos/{todo_id}", json={"completed": True}, headers=headers)
+    client.delete(f"/api/todos/{todo_id}", headers=headers)
+
+    events = _outbox(session)
+    assert [e.event_type for e in events] == [
+        "todo.created",
+        "todo.updated",
+        "todo.deleted",
+    ]
+    assert all(e.aggregate_id == todo_id for e in events)
+    assert events[0].payload["content"] == "nova"
+    assert events[1].payload["completed"] is True
+    assert all(e.processed_at is None for e in events)
+
+
+def test_lote_grava_um_evento_por_tarefa(client, token, session):
+    session.commit()
+    headers = {"Authorization": f"Bearer {token}"}
+    response = client.post(
+        "/api/todos/batch",
+        json={"create": [{"content": "a"}, {"content": "b"}]},
+        headers=headers,
+    )
+    a, b = (item["id"] for item in response.json()["create"])
+    client.post(
+        "/api/todos/batch",
+        json={"update": [{"id": a, "completed": True}], "delete": [b]},
+        headers=headers,
+    )
+
+    events = [(e.event_type, e.aggregate_id) for e in _outbox(session)]
+    assert events == [
+        ("todo.created", a),
+        ("todo.created", b),
+        ("todo.updated", a),
+        ("todo.deleted", b),
+    ]
+
+
+def test_rollback_nao_grava_no_outbox(client, user, session):
+    session.commit()
+    session.add(Todo(content="desfeita", user_id=user.id))
+    session.flush()
+    session.rollback()
+
+    assert _outbox(session) == []
+
+
+def test_relay_entrega_e_remove_os_eventos(client, user, session, todo_factory):
+    todo_factory.create_batch(5, user_id=user.id)
+    session.commit()
+    sink = InMemorySink()
+    relay = OutboxRelay(session.get_bind(), sink, batch_size=2)
+
+    assert [relay.run_once() for _ in range(4)] == [2, 2, 1, 0]
+    assert [e["event_type"] for e in sink.events] == ["todo.created"] * 5
+    ids = [e["id"] for e in sink.events]
+    assert ids == sorted(ids)
+    assert _outbox(session) == []
+    assert relay.snapshot()["delivered"] == 5
+
+
+def test_relay_pode_marcar_como_processado(client, user, session, todo_factory):
+    todo_factory(user_id=user.id)
+    session.commit()
+    relay = OutboxRelay(session.get_bind(), InMemorySink(), delete_delivered=False)
+
+    assert relay.run_once() == 1
+    assert relay.run_once() == 0
+    [event] = _outbox(session)
+    assert event.processed_at is not None
+
+
+def test_falha_no_sink_mantem_os_eventos(client, user, session, todo_factory):
+    todo_factory(user_id=user.id)
+    session.commit()
+    relay = OutboxRelay(session.get_bind(), FailingSink())
+
+    with pytest.raises(RuntimeError):
+        relay.run_once()
+
+    assert len(_outbox(session)) == 1
+    assert relay.snapshot()["errors"] == 1
+
+
+def test_file_sink_grava_ndjson(tmp_path):
+    path = tmp_path / "eventos.ndjson"
+    sink = FileSink(str(path))
+    sink.send([{"id": 1}, {"id": 2}])
+    sink.send([{"id": 3}])
+
+    lines = path.read_text().splitlines()
+    assert [json.loads(line)["id"] for line in lines] == [1, 2, 3]
+
+
+def test_create_sink():
+    assert isinstance(create_sink("memory"), InMemorySink)
+    assert create_sink("file:/tmp/x.ndjson").path == "/tmp/x.ndjson"
+    with pytest.raises(ValueError):
+        create_sink("kafka")
+
+
+def test_reserva_usa_skip_locked():
+    sql = str(claim_statement(10).compile(dialect=postgresql.dialect()))
+    assert "FOR UPDATE SKIP LOCKED" in sql
+    assert "processed_at IS NULL" in sql
@@ -0,0 +1,107 @@
+import pytest
+
+from app.todo.models import Todo
+from app.todo.router import settings
+
+
+@pytest.mark.todos
+def test_lote_cria_atualiza_e_deleta(client, todo_factory, session, token, user):
+    """
+    Testa um lote com as três operações, aplicado em uma única requisição.
+    """
+    a = todo_factory(content="A", completed=False, user_id=user.id)
+    b = todo_factory(content="B", completed=False, user_id=user.id)
+    c = todo_factory(content="C", completed=False, user_id=user.id)
+    d = todo_factory(content="D", completed=False, user_id=user.id)
+
+    response = client.post(
+        "/api/todos/batch",
+        json={
+            "create": [{"content": "Nova 1"}, {"content": "Nova 2"}],
+            "update": [
+                {"id": a.id, "completed": True},
+                {"id": b.id, "completed": True},
+                {"id": c.id, "content": "C editada"},
+            ],
+            "delete": [d.id],
+        },
+        headers={"Authorization": f"Bearer {token}"},
+    )
+
+    assert response.status_code == 200
+    data = response.json()
+    assert [item["status"] for item in data["create"]] == [201, 201]
+    assert [item["todo"]["content"] for item in data["create"]] == ["Nova 1", "Nova 2"]
+    assert [item["status"] for item in data["update"]] == [200, 200, 200]
+    assert data["update"][0]["todo"]["completed"] is True
+    assert data["delete"] == [{"id": d.id, "status": 204, "todo": None}]
+
+    session.expire_all()
+    assert session.get(Todo, a.id).completed is True
+    assert session.get(Todo, b.id).completed is True
+    assert session.get(Todo, c.id).content == "C editada"
+    assert session.get(Todo, c.id).completed is False
+    assert session.get(Todo, d.id) is None
+    assert session.get(Todo, data["create"][0]["id"]).user_id == user.id
+
+
+@pytest.mark.todos
+def test_lote_verifica_o_dono(client, todo_factory, user_factory, session, token):
+    """
+    Tarefas de outro usuário (ou inexistentes) retornam 404 e não são alteradas.
+    """
+    outro = user_factory()
+    alheia = todo_factory(content="Alheia", completed=False, user_id=outro.id)
+
+    response = client.post(
+        "/api/todos/batch",
+        json={
+            "update": [
+                {"id": alheia.id, "completed": True},
+                {"id": 999, "content": "x"},
+            ],
+            "delete": [alheia.id],
+        },
+        headers={"Authorization": f"Bearer {token}"},
+    )
+
+    data = response.json()
+    assert response.status_code == 200
+    assert [item["status"] for item in data["update"]] == [404, 404]
+    assert [item["status"] for item in data["delete"]] == [404]
+
+    session.expire_all()
+    tarefa = session.get(Todo, alheia.id)
+    assert tarefa is not None
+    assert tarefa.completed is False
+
+
+@pytest.mark.todos
+def test_lote_muito_grande(client, token, monkeypatch):
+    monkeypatch.setattr(settings, "TODO_BATCH_MAX_ITEMS", 2)
+
+    response = client.post(
+        "/api/todos/batch",
+        json={"delete": [1, 2, 3]},
+        headers={"Authorization": f"Bearer {token}"},
+    )
+
+    assert response.status_code == 413
+
+
+@pytest.mark.todos
+def test_lote_recusa_tarefa_repetida_em_update(client, todo_factory, token, user):
+    tarefa = todo_factory(user_id=user.id, completed=False)
+
+    response = client.post(
+        "/api/todos/batch",
+        json={
+            "update": [
+                {"id": tarefa.id, "completed": True},
+                {"id": tarefa.id, "content": "outro texto"},
+            ]
+        },
+        headers={"Authorization": f"Bearer {token}"},
+    )
+
+    assert response.status_code == 422
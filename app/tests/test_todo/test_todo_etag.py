@@ -0,0 +1,72 @@
+from app.etag import etag_matches, make_etag
+
+
+def test_etag_matches():
+    etag = make_etag("todos", 1, 3)
+    assert etag == make_etag("todos", 1, 3)
+    assert etag != make_etag("todos", 1, 4)
+    assert etag_matches(etag, etag)
+    assert etag_matches(f'"outro", W/{etag}', etag)
+    assert etag_matches("*", etag)
+    assert not etag_matches(None, etag)
+    assert not etag_matches('"outro"', etag)
+
+
+def test_lista_sem_alteracoes_retorna_304(client, token, user, todo_factory):
+    todo_factory.create_batch(3, user_id=user.id)
+    headers = {"Authorization": f"Bearer {token}"}
+
+    response = client.get("/api/todos/", headers=headers)
+    assert response.status_code == 200
+    etag = response.headers["ETag"]
+
+    response = client.get("/api/todos/", headers={**headers, "If-None-Match": etag})
+    assert response.status_code == 304
+    assert response.headers["ETag"] == etag
+    assert response.content == b""
+
+
+def test_alteracao_muda_o_etag_da_lista(client, token, user, session):
+    session.commit()
+    headers = {"Authorization": f"Bearer {token}"}
+    etag = client.get("/api/todos/", headers=headers).headers["ETag"]
+
+    client.post("/api/todos/", json={"content": "nova"}, headers=headers)
+
+    response = client.get("/api/todos/", headers={**headers, "If-None-Match": etag})
+    assert response.status_code == 200
+    assert response.headers["ETag"] != etag
+    assert [todo["content"] for todo in response.json()] == ["nova"]
+    session.refresh(user)
+    assert user.todo_version == 1
+
+
+def test_etag_depende_da_pagina(client, token, user, todo_factory):
+    todo_factory.create_batch(3, user_id=user.id)
+    headers = {"Authorization": f"Bearer {token}"}
+
+    first = client.get("/api/todos/?limit=1", headers=headers)
+    second = client.get(
+        "/api/todos/",
+        params={"limit": 1, "after": first.headers["X-Next-Cursor"]},
+        headers={**headers, "If-None-Match": first.headers["ETag"]},
+    )
+
+    assert second.status_code == 200
+
+
+def test_usuario_retorna_304_ate_ser_alterado(client, token, user):
+    headers = {"Authorization": f"Bearer {token}"}
+    etag = client.get(f"/users/{user.id}", headers=headers).headers["ETag"]
+
+    response = client.get(
+        f"/users/{user.id}", headers={**headers, "If-None-Match": etag}
+    )
+    assert response.status_code == 304
+
+    client.put(f"/users/{user.id}", json={"email": "novo@example.com"}, headers=headers)
+    response = client.get(
+        f"/users/{user.id}", headers={**headers, "If-None-Match": etag}
+    )
+    assert response.status_code == 200
+    assert response.headers["ETag"] != etag
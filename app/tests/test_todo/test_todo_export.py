@@ -0,0 +1,80 @@
+import csv
+import io
+import json
+
+import pytest
+
+from app.todo.router import settings
+
+
+@pytest.fixture
+def tarefas(session, todo_factory, user_factory, user):
+    outro = user_factory()
+    minhas = [
+        todo_factory(content=f"Tarefa {i}", completed=i % 2 == 0, user_id=user.id)
+        for i in range(3)
+    ]
+    todo_factory(user_id=outro.id)
+    # A exportação usa uma sessão própria: os dados precisam estar commitados.
+    session.commit()
+    return minhas
+
+
+@pytest.mark.todos
+def test_exportar_ndjson(client, token, tarefas, monkeypatch):
+    monkeypatch.setattr(settings, "TODO_EXPORT_BATCH_SIZE", 2)
+
+    response = client.get(
+        "/api/todos/export",
+        headers={"Authorization": f"Bearer {token}"},
+    )
+
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/x-ndjson"
+    linhas = [json.loads(line) for line in response.text.splitlines()]
+    assert [linha["id"] for linha in linhas] == [t.id for t in tarefas]
+    assert linhas[0] == {
+        "id": tarefas[0].id,
+        "content": "Tarefa 0",
+        "completed": True,
+        "user_id": tarefas[0].user_id,
+    }
+
+
+@pytest.mark.todos
+def test_exportar_csv(client, token, tarefas):
+    response = client.get(
+        "/api/todos/export",
+        params={"format": "csv"},
+        headers={"Authorization": f"Bearer {token}"},
+    )
+
+    assert response.status_code == 200
+    assert "attachment" in response.headers["content-disposition"]
+    linhas = list(csv.DictReader(io.StringIO(response.text)))
+    assert [int(linha["id"]) for linha in linhas] == [t.id for t in tarefas]
+
+
+@pytest.mark.todos
+def test_exportar_todas_exige_admin(client, token, tarefas):
+    response = client.get(
+        "/api/todos/export",
+        params={"scope": "all"},
+        headers={"Authorization": f"Bearer {token}"},
+    )
+
+    assert response.status_code == 403
+
+
+@pytest.mark.todos
+def test_exportar_todas_como_admin(client, token, user, tarefas, monkeypatch):
+    monkeypatch.setattr(settings, "ADMIN_USERNAMES", [user.username])
+
+    response = client.get(
+        "/api/todos/export",
+        params={"scope": "all"},
+        headers={"Authorization": f"Bearer {token}"},
+    )
+
+    assert response.status_code == 200
+    assert len(response.text.splitlines()) == len(tarefas) + 1
@@ -0,0 +1,85 @@
+import pytest
+
+from app.responses import FastJSONResponse, trusted_rows
+from app.todo import router as todo_router
+from app.todo.models import Todo
+from app.user import router as user_router
+
+
+@pytest.fixture
+def fast_json(monkeypatch):
+    monkeypatch.setattr(todo_router.settings, "FAST_JSON_RESPONSES", True)
+    monkeypatch.setattr(user_router.settings, "FAST_JSON_RESPONSES", True)
+
+
+def _get_both(client, monkeypatch, url, **kwargs):
+    lenta = client.get(url, **kwargs)
+    monkeypatch.setattr(todo_router.settings, "FAST_JSON_RESPONSES", True)
+    monkeypatch.setattr(user_router.settings, "FAST_JSON_RESPONSES", True)
+    rapida = client.get(url, **kwargs)
+    return lenta, rapida
+
+
+@pytest.mark.todos
+def test_lista_de_tarefas_igual_a_do_response_model(
+    client, todo_factory, token, user, monkeypatch
+):
+    todo_factory(user_id=user.id, content="ação com acento", completed=True)
+    todo_factory(user_id=user.id)
+    todo_factory(user_id=user.id)
+
+    lenta, rapida = _get_both(
+        client,
+        monkeypatch,
+        "/api/todos/",
+        params={"limit": 2},
+        headers={"Authorization": f"Bearer {token}"},
+    )
+
+    assert rapida.status_code == 200
+    assert rapida.json() == lenta.json()
+    for header in ("ETag", "Cache-Control", "X-Next-Cursor", "Link"):
+        assert rapida.headers[header] == lenta.headers[header]
+
+
+@pytest.mark.todos
+def test_lista_rapida_respeita_o_etag(client, todo_factory, token, user, fast_json):
+    todo_factory(user_id=user.id)
+    headers = {"Authorization": f"Bearer {token}"}
+
+    etag = client.get("/api/todos/", headers=headers).headers["ETag"]
+    response = client.get("/api/todos/", headers={**headers, "If-None-Match": etag})
+
+    assert response.status_code == 304
+
+
+@pytest.mark.users
+def test_lista_de_usuarios_igual_a_do_response_model(
+    client, user_factory, token, monkeypatch
+):
+    user_factory()
+
+    lenta, rapida = _get_both(
+        client, monkeypatch, "/users/", headers={"Authorization": f"Bearer {token}"}
+    )
+
+    assert rapida.status_code == 200
+    assert rapida.json() == lenta.json()
+    assert all("password" not in user for user in rapida.json())
+
+
+def test_trusted_rows_usa_os_campos_do_modelo():
+    todo = Todo(id=1, content="x", completed=False, user_id=2)
+
+    assert trusted_rows([todo], Todo) == [
+        {"id": 1, "content": "x", "completed": False, "user_id": 2}
+    ]
+    assert FastJSONResponse([{"a": "é"}]).body.decode() == '[{"a":"é"}]'
+
+
+def test_trusted_rows_recarrega_atributos_expirados(session, todo_factory, user):
+    todo = todo_factory(user_id=user.id, content="antes")
+    session.commit()
+    session.expire(todo)
+
+    assert trusted_rows([todo], Todo)[0]["content"] == "antes"
@@ -0,0 +1,43 @@
+from app.todo.fragments import TodoFragmentCache, fragment_cache
+
+
+def test_fragmento_so_vale_na_versao_atual():
+    cache = TodoFragmentCache()
+    version = cache.version(1)
+    cache.put(1, version, "<ul></ul>")
+    assert cache.get(1) == "<ul></ul>"
+
+    cache.bump(1)
+    assert cache.get(1) is None
+
+
+def test_fragmento_renderizado_durante_alteracao_e_descartado():
+    cache = TodoFragmentCache()
+    version = cache.version(1)
+    cache.bump(1)  # a lista mudou enquanto o fragmento era renderizado
+    cache.put(1, version, "<ul>antiga</ul>")
+
+    assert cache.get(1) is None
+
+
+def test_lista_sem_alteracoes_vem_do_cache(ui_client, user, todo_factory):
+    todo_factory(user_id=user.id, content="primeira")
+
+    first = ui_client.get("/")
+    second = ui_client.get("/")
+
+    assert "primeira" in first.text
+    assert "primeira" in second.text
+    stats = fragment_cache.snapshot()
+    assert stats["misses"] == 1
+    assert stats["hits"] == 1
+
+
+def test_mutacao_invalida_o_fragmento(ui_client, user):
+    ui_client.get("/")
+
+    response = ui_client.post("/ui/todos", data={"content": "nova tarefa"})
+    assert "nova tarefa" in response.text
+
+    response = ui_client.get("/")
+    assert "nova tarefa" in response.text
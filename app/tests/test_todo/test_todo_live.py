@@ -0,0 +1,172 @@
+import asyncio
+import json
+import threading
+
+import pytest
+from sqlalchemy.dialects import postgresql
+
+from app.events import register_sqlalchemy_listeners, remove_sqlalchemy_listeners
+from app.todo.live import (
+    SSE_EVENT,
+    TodoChangeFeed,
+    change_origin,
+    sse_stream,
+    todo_changes,
+)
+from app.todo.models import Todo
+
+
+async def _wait_listening(feed, timeout: float = 10.0):
+    """No PostgreSQL, espera a conexão de LISTEN antes de gravar."""
+    async with asyncio.timeout(timeout):
+        while feed.uses_notify and not feed.snapshot()["listening"]:
+            await asyncio.sleep(0.05)
+
+
+@pytest.mark.asyncio
+async def test_aviso_chega_so_aos_assinantes_do_usuario(database_url):
+    feed = TodoChangeFeed()
+    await feed.start(database_url)
+    async with feed.subscribe(1) as mine, feed.subscribe(2) as other:
+        # publish é chamado da thread do commit (threadpool).
+        thread = threading.Thread(target=feed.publish, args=([1],))
+        thread.start()
+        thread.join()
+
+        assert await asyncio.wait_for(mine.get(), 1) == {"user_id": 1}
+        assert other.empty()
+    assert feed.snapshot()["subscribers"] == 0
+    await feed.stop()
+
+
+@pytest.mark.asyncio
+async def test_avisos_pendentes_sao_agrupados(database_url):
+    feed = TodoChangeFeed()
+    await feed.start(database_url)
+    async with feed.subscribe(1) as queue:
+        feed.publish([1, 1, 1])
+        await asyncio.sleep(0)
+
+        assert queue.qsize() == 1
+        assert feed.snapshot()["coalesced"] == 2
+    await feed.stop()
+
+
+@pytest.mark.asyncio
+async def test_avisos_de_origens_diferentes_perdem_a_origem(database_url):
+    feed = TodoChangeFeed()
+    await feed.start(database_url)
+    async with feed.subscribe(1) as queue:
+        change_origin.set("aba-a")
+        feed.publish([1])
+        change_origin.set("aba-b")
+        feed.publish([1])
+        await asyncio.sleep(0)
+
+        assert await queue.get() == {"user_id": 1}
+    await feed.stop()
+
+
+def test_aviso_invalido_e_ignorado():
+    feed = TodoChangeFeed()
+    feed._on_notification(None, 0, "todo_changes", "lixo")
+    assert feed.snapshot()["notifications"] == 0
+
+
+@pytest.mark.asyncio
+async def test_segundo_start_sem_stop_falha(database_url):
+    feed = TodoChangeFeed()
+    await feed.start(database_url)
+    try:
+        with pytest.raises(RuntimeError):
+            await feed.start(database_url)
+    finally:
+        await feed.stop()
+
+
+@pytest.mark.asyncio
+async def test_commit_envia_evento_sse(user, session, database_url):
+    session.commit()
+    # Sem o `client`: o lifespan iniciaria o feed em outro event loop e no
+    # banco de DATABASE_URL. Aqui o feed escuta no banco da fixture, onde a
+    # sessão grava (no PostgreSQL, via LISTEN/NOTIFY).
+    register_sqlalchemy_listeners()
+    await todo_changes.start(database_url)
+    stream = sse_stream(user.id)
+    try:
+        await _wait_listening(todo_changes)
+        assert await anext(stream) == "retry: 3000\n\n"
+        next_event = asyncio.ensure_future(anext(stream))
+        await asyncio.sleep(0)
+
+        session.add(Todo(content="de outro dispositivo", user_id=user.id))
+        session.commit()
+
+        message = await asyncio.wait_for(next_event, 5)
+        event, data = message.strip().split("\n")
+        assert event == f"event: {SSE_EVENT}"
+        assert json.loads(data.removeprefix("data: ")) == {"user_id": user.id}
+    finally:
+        await stream.aclose()
+        await todo_changes.stop()
+        remove_sqlalchemy_listeners()
+
+
+@pytest.mark.asyncio
+async def test_sse_nao_avisa_a_aba_que_fez_a_alteracao(database_url):
+    await todo_changes.start(database_url)
+    stream = sse_stream(1, client_id="aba-a")
+    try:
+        assert await anext(stream) == "retry: 3000\n\n"
+        next_event = asyncio.ensure_future(anext(stream))
+        await asyncio.sleep(0)
+
+        change_origin.set("aba-a")
+        todo_changes.publish([1])
+        await asyncio.sleep(0.01)
+        assert not next_event.done()
+
+        change_origin.set("aba-b")
+        todo_changes.publish([1])
+        message = await asyncio.wait_for(next_event, 1)
+        data = message.strip().split("\n")[1].removeprefix("data: ")
+        assert json.loads(data) == {"user_id": 1, "origin": "aba-b"}
+    finally:
+        await stream.aclose()
+        await todo_changes.stop()
+
+
+def test_feed_usa_o_banco_recebido_no_start():
+    feed = TodoChangeFeed()
+    feed._url = "postgresql://u:p@outro-host:5432/app"
+    assert feed.uses_notify
+    feed._url = "sqlite:///app.db"
+    assert not feed.uses_notify
+
+
+def test_aviso_com_origem_invalida_e_ignorado():
+    feed = TodoChangeFeed()
+    feed._on_notification(None, 0, "todo_changes", '{"user_id": 1, "origin": 2}')
+    assert feed.snapshot()["notifications"] == 0
+
+
+def test_notify_usa_pg_notify():
+    statements = []
+
+    class FakeSession:
+        def execute(self, statement):
+            statements.append(statement)
+
+    TodoChangeFeed("canal").notify(FakeSession(), {2, 1})
+
+    compiled = [s.compile(dialect=postgresql.dialect()) for s in statements]
+    assert all("pg_notify" in str(c) for c in compiled)
+    assert [list(c.params.values()) for c in compiled] == [
+        ["canal", '{"user_id": 1}'],
+        ["canal", '{"user_id": 2}'],
+    ]
+
+
+def test_sse_exige_autenticacao(client):
+    response = client.get("/ui/todos/events")
+    assert response.status_code == 401
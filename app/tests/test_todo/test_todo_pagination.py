@@ -0,0 +1,91 @@
+import base64
+
+import pytest
+from fastapi import HTTPException
+
+from app.pagination import decode_cursor, encode_cursor
+
+
+@pytest.mark.todos
+def test_paginacao_por_cursor(client, todo_factory, token, user):
+    """
+    Percorre todas as páginas seguindo o cabeçalho X-Next-Cursor.
+    """
+    criadas = [todo_factory(user_id=user.id).id for _ in range(5)]
+    headers = {"Authorization": f"Bearer {token}"}
+
+    vistas = []
+    params = {"limit": 2}
+    while True:
+        response = client.get("/api/todos/", params=params, headers=headers)
+        assert response.status_code == 200
+        page = response.json()
+        assert len(page) <= 2
+        vistas.extend(todo["id"] for todo in page)
+
+        cursor = response.headers.get("X-Next-Cursor")
+        if cursor is None:
+            assert "Link" not in response.headers
+            break
+        assert 'rel="next"' in response.headers["Link"]
+        params = {"limit": 2, "after": cursor}
+
+    assert vistas == sorted(criadas)
+
+
+@pytest.mark.todos
+def test_paginacao_respeita_o_usuario(client, todo_factory, user_factory, token, user):
+    outro = user_factory()
+    todo_factory(user_id=outro.id)
+    minha = todo_factory(user_id=user.id)
+
+    response = client.get(
+        "/api/todos/",
+        params={"limit": 10},
+        headers={"Authorization": f"Bearer {token}"},
+    )
+
+    assert [todo["id"] for todo in response.json()] == [minha.id]
+
+
+@pytest.mark.todos
+def test_lista_sem_limit_tem_teto(client, todo_factory, token, user):
+    """
+    Sem parâmetros, a lista continua sendo retornada inteira até o teto configurado.
+    """
+    for _ in range(3):
+        todo_factory(user_id=user.id)
+
+    response = client.get("/api/todos/", headers={"Authorization": f"Bearer {token}"})
+
+    assert response.status_code == 200
+    assert len(response.json()) == 3
+    assert "X-Next-Cursor" not in response.headers
+
+
+@pytest.mark.todos
+def test_cursor_invalido(client, token):
+    headers = {"Authorization": f"Bearer {token}"}
+
+    response = client.get(
+        "/api/todos/", params={"after": "nao-e-um-cursor"}, headers=headers
+    )
+    assert response.status_code == 400
+
+    response = client.get(
+        "/api/todos/", params={"after": encode_cursor(10), "limit": 0}, headers=headers
+    )
+    assert response.status_code == 422
+
+
+@pytest.mark.parametrize("last_id", ["true", "false", "1.0", '"1"', "null"])
+def test_cursor_com_id_que_nao_e_inteiro(last_id):
+    cursor = base64.urlsafe_b64encode(f'{{"id":{last_id}}}'.encode()).decode()
+
+    with pytest.raises(HTTPException) as error:
+        decode_cursor(cursor)
+    assert error.value.status_code == 400
+
+
+def test_cursor_ida_e_volta():
+    assert decode_cursor(encode_cursor(42)) == 42
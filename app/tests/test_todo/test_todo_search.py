@@ -0,0 +1,62 @@
+def test_busca_retorna_so_tarefas_do_usuario(
+    client, token, user, user_factory, todo_factory
+):
+    other = user_factory()
+    todo_factory(user_id=user.id, content="comprar pão")
+    todo_factory(user_id=user.id, content="lavar o carro")
+    todo_factory(user_id=other.id, content="comprar leite")
+
+    response = client.get(
+        "/api/todos/search",
+        params={"q": "comprar"},
+        headers={"Authorization": f"Bearer {token}"},
+    )
+
+    assert response.status_code == 200
+    results = response.json()
+    assert [r["content"] for r in results] == ["comprar pão"]
+    assert "rank" in results[0]
+    assert "X-Next-Offset" not in response.headers
+
+
+def test_busca_paginada(client, token, user, todo_factory):
+    for i in range(5):
+        todo_factory(user_id=user.id, content=f"reunião {i}")
+    headers = {"Authorization": f"Bearer {token}"}
+
+    first = client.get(
+        "/api/todos/search", params={"q": "reunião", "limit": 3}, headers=headers
+    )
+    assert len(first.json()) == 3
+    assert first.headers["X-Next-Offset"] == "3"
+
+    second = client.get(
+        "/api/todos/search",
+        params={"q": "reunião", "limit": 3, "offset": 3},
+        headers=headers,
+    )
+    assert len(second.json()) == 2
+    ids = {r["id"] for r in first.json()} | {r["id"] for r in second.json()}
+    assert len(ids) == 5
+
+
+def test_busca_exige_termo(client, token):
+    response = client.get(
+        "/api/todos/search",
+        params={"q": ""},
+        headers={"Authorization": f"Bearer {token}"},
+    )
+    assert response.status_code == 422
+
+
+def test_caixa_de_busca_da_interface(ui_client, user, todo_factory):
+    todo_factory(user_id=user.id, content="comprar pão")
+    todo_factory(user_id=user.id, content="lavar o carro")
+
+    response = ui_client.get("/ui/todos/search", params={"q": "carro"})
+    assert "lavar o carro" in response.text
+    assert "comprar pão" not in response.text
+
+    response = ui_client.get("/ui/todos/search", params={"q": ""})
+    assert "lavar o carro" in response.text
+    assert "comprar pão" in response.text
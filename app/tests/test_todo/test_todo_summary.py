@@ -0,0 +1,49 @@
+def _summary(client, token):
+    response = client.get(
+        "/api/todos/summary", headers={"Authorization": f"Bearer {token}"}
+    )
+    assert response.status_code == 200
+    return response.json()
+
+
+def test_summary_acompanha_as_alteracoes(client, token, session):
+    session.commit()
+    headers = {"Authorization": f"Bearer {token}"}
+    assert _summary(client, token) == {"open": 0, "done": 0, "total": 0}
+
+    ids = [
+        client.post("/api/todos/", json={"content": f"t{i}"}, headers=headers).json()[
+            "id"
+        ]
+        for i in range(3)
+    ]
+    assert _summary(client, token) == {"open": 3, "done": 0, "total": 3}
+
+    client.put(f"/api/todos/{ids[0]}", json={"completed": True}, headers=headers)
+    # Atualização sem mudar o estado não altera os contadores.
+    client.put(f"/api/todos/{ids[0]}", json={"completed": True}, headers=headers)
+    client.put(f"/api/todos/{ids[1]}", json={"content": "editada"}, headers=headers)
+    assert _summary(client, token) == {"open": 2, "done": 1, "total": 3}
+
+    client.delete(f"/api/todos/{ids[0]}", headers=headers)
+    client.delete(f"/api/todos/{ids[1]}", headers=headers)
+    assert _summary(client, token) == {"open": 1, "done": 0, "total": 1}
+
+
+def test_summary_com_lote(client, token, session):
+    session.commit()
+    headers = {"Authorization": f"Bearer {token}"}
+    response = client.post(
+        "/api/todos/batch",
+        json={"create": [{"content": "a"}, {"content": "b"}, {"content": "c"}]},
+        headers=headers,
+    )
+    a, b, c = (item["id"] for item in response.json()["create"])
+
+    client.post(
+        "/api/todos/batch",
+        json={"update": [{"id": a, "completed": True}], "delete": [b]},
+        headers=headers,
+    )
+
+    assert _summary(client, token) == {"open": 1, "done": 1, "total": 2}
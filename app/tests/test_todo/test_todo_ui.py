@@ -0,0 +1,71 @@
+import re
+
+import pytest
+from starlette.requests import Request
+
+from app.todo.live import change_origin
+from app.todo.ui import track_change_origin
+
+
+def test_toggle_retorna_so_o_item(ui_client, user, todo_factory):
+    todos = todo_factory.create_batch(50, user_id=user.id, completed=False)
+    todo = todos[0]
+
+    response = ui_client.put(f"/ui/todos/{todo.id}")
+
+    assert response.status_code == 200
+    assert response.text.count("<li") == 1
+    assert f'id="todo-{todo.id}"' in response.text
+    assert "checked" in response.text
+    assert len(response.content) < 2000
+
+    response = ui_client.put(f"/ui/todos/{todo.id}")
+    assert "checked" not in response.text
+
+
+def test_toggle_de_tarefa_de_outro_usuario(ui_client, user_factory, todo_factory):
+    other = user_factory()
+    todo = todo_factory(user_id=other.id)
+
+    response = ui_client.put(f"/ui/todos/{todo.id}")
+
+    assert response.status_code == 404
+
+
+def test_create_retorna_o_item_fora_da_lista(ui_client, user, todo_factory):
+    todo_factory.create_batch(50, user_id=user.id)
+
+    response = ui_client.post("/ui/todos", data={"content": "nova tarefa"})
+
+    assert response.status_code == 201
+    assert 'hx-swap-oob="beforeend:#todo-list"' in response.text
+    assert response.text.count("<li") == 1
+    assert "nova tarefa" in response.text
+
+
+def test_delete_retorna_resposta_vazia(ui_client, user, todo_factory):
+    todo = todo_factory(user_id=user.id)
+
+    response = ui_client.delete(f"/ui/todos/{todo.id}")
+    assert response.status_code == 200
+    assert response.text == ""
+
+    response = ui_client.delete(f"/ui/todos/{todo.id}")
+    assert response.status_code == 404
+
+
+def test_pagina_identifica_a_aba(ui_client, user):
+    response = ui_client.get("/")
+
+    client_id = re.search(r'"X-Client-Id": "(\w+)"', response.text).group(1)
+    assert f'sse-connect="/ui/todos/events?client={client_id}"' in response.text
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    "header, origin", [(b"aba-1", "aba-1"), (b"<script>", None), (b"", None)]
+)
+async def test_cabecalho_x_client_id_marca_a_origem(header, origin):
+    request = Request({"type": "http", "headers": [(b"x-client-id", header)]})
+    await track_change_origin(request)
+    assert change_origin.get() == origin
@@ -0,0 +1,37 @@
+import csv
+import io
+import json
+from typing import AsyncIterator
+
+EXPORT_FIELDS = ["id", "content", "completed", "user_id"]
+
+MEDIA_TYPES = {
+    "ndjson": "application/x-ndjson",
+    "csv": "text/csv; charset=utf-8",
+}
+
+
+async def ndjson_chunks(batches: AsyncIterator[list]) -> AsyncIterator[str]:
+    """Converte cada lote de linhas em um bloco NDJSON (um objeto por linha)."""
+    async for rows in batches:
+        yield "".join(json.dumps(row, ensure_ascii=False) + "\n" for row in rows)
+
+
+async def csv_chunks(batches: AsyncIterator[list]) -> AsyncIterator[str]:
+    """Converte cada lote de linhas em um bloco CSV, com cabeçalho no início."""
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=EXPORT_FIELDS)
+    writer.writeheader()
+    yield buffer.getvalue()
+
+    async for rows in batches:
+        buffer.seek(0)
+        buffer.truncate()
+        writer.writerows(rows)
+        yield buffer.getvalue()
+
+
+ENCODERS = {
+    "ndjson": ndjson_chunks,
+    "csv": csv_chunks,
+}
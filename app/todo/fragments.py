@@ -0,0 +1,96 @@
+import threading
+import time
+from collections import OrderedDict
+
+from app.settings import get_settings
+
+settings = get_settings()
+
+
+class TodoFragmentCache:
+    """
+    Cache do fragmento `todos.html` já renderizado, por usuário.
+
+    Cada usuário tem um contador de versão, incrementado pelos listeners de
+    Todo (app/todo/subscribers.py) a cada insert/update/delete. Um fragmento
+    só é servido se foi renderizado na versão atual; assim uma lista que não
+    mudou não passa de novo pelo banco nem pelo Jinja.
+
+    As versões são deste processo: alterações feitas por outro worker não as
+    incrementam, e o TTL limita por quanto tempo um fragmento pode ficar
+    desatualizado nesse caso.
+    """
+
+    def __init__(self, max_size: int = 1024, ttl_seconds: float = 30.0):
+        self.max_size = max_size
+        self.ttl = ttl_seconds
+        self._lock = threading.Lock()
+        self._versions: dict[int, int] = {}
+        # user_id -> (versão, expira_em, html)
+        self._fragments: OrderedDict[int, tuple[int, float, str]] = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_size > 0 and self.ttl > 0
+
+    def version(self, user_id: int) -> int:
+        with self._lock:
+            return self._versions.get(user_id, 0)
+
+    def bump(self, user_id: int) -> None:
+        with self._lock:
+            self._versions[user_id] = self._versions.get(user_id, 0) + 1
+            self._fragments.pop(user_id, None)
+
+    def get(self, user_id: int) -> str | None:
+        with self._lock:
+            entry = self._fragments.get(user_id)
+            if (
+                entry is None
+                or entry[0] != self._versions.get(user_id, 0)
+                or entry[1] <= time.monotonic()
+            ):
+                self.misses += 1
+                return None
+            self._fragments.move_to_end(user_id)
+            self.hits += 1
+            return entry[2]
+
+    def put(self, user_id: int, version: int, html: str) -> None:
+        """
+        Guarda o fragmento renderizado a partir dos dados lidos na `version`
+        (obtida antes da consulta). Se a lista mudou nesse meio tempo, o
+        fragmento já nasce desatualizado e é descartado.
+        """
+        if not self.enabled:
+            return
+        with self._lock:
+            if version != self._versions.get(user_id, 0):
+                return
+            self._fragments[user_id] = (version, time.monotonic() + self.ttl, html)
+            self._fragments.move_to_end(user_id)
+            while len(self._fragments) > self.max_size:
+                self._fragments.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._versions.clear()
+            self._fragments.clear()
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            return {
+                "size": len(self._fragments),
+                "max_size": self.max_size,
+                "ttl_seconds": self.ttl,
+                "hits": self.hits,
+                "misses": self.misses,
+            }
+
+
+fragment_cache = TodoFragmentCache(
+    max_size=settings.TODO_FRAGMENT_CACHE_MAX_SIZE,
+    ttl_seconds=settings.TODO_FRAGMENT_CACHE_TTL_SECONDS,
+)
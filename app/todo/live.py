@@ -0,0 +1,241 @@
+import asyncio
+import contextlib
+import json
+import threading
+from collections import defaultdict
+from collections.abc import AsyncIterator, Iterable
+from contextvars import ContextVar
+
+from sqlalchemy import func, select
+from sqlalchemy.engine import make_url
+
+from app.db import get_engine
+from app.logger import logger
+from app.settings import get_settings
+from app.todo.fragments import fragment_cache
+
+settings = get_settings()
+
+# Nome do evento SSE enviado quando as tarefas do usuário mudam.
+SSE_EVENT = "todos-changed"
+# Cabeçalhos das respostas SSE: sem cache e sem buffer em proxies (nginx).
+SSE_HEADERS = {"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+
+# Aba (cliente SSE) que fez as alterações da requisição atual. Vai junto no
+# aviso, e o stream dessa aba o ignora: ela já recebeu o item na resposta.
+change_origin: ContextVar[str | None] = ContextVar("todo_change_origin", default=None)
+
+
+def listener_dsn(url: str) -> str:
+    """URL do banco no formato aceito pelo `asyncpg.connect`."""
+    return (
+        make_url(url).set(drivername="postgresql").render_as_string(hide_password=False)
+    )
+
+
+class TodoChangeFeed:
+    """
+    Avisa, em tempo real, os clientes conectados quando as tarefas de um
+    usuário mudam.
+
+    No PostgreSQL os listeners de Todo emitem um `pg_notify` por usuário
+    alterado dentro da transação (o aviso só sai no commit). Cada worker
+    mantém uma única conexão com `LISTEN` e repassa os avisos para as filas
+    dos seus assinantes; assim as abas abertas não ocupam conexões do banco,
+    e um commit feito em qualquer worker chega a todos. Nos demais bancos o
+    aviso é publicado só neste processo, depois do commit.
+
+    Cada assinante tem uma fila de um item: o aviso diz apenas que a lista
+    mudou, então avisos acumulados enquanto o cliente não leu o anterior são
+    agrupados em um só (sem a origem, se vieram de abas diferentes).
+    """
+
+    def __init__(self, channel: str = "todo_changes"):
+        self.channel = channel
+        self._lock = threading.Lock()
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._url: str | None = None
+        self._listener: asyncio.Task | None = None
+        self._connection = None
+        self._queues: dict[int, set[asyncio.Queue]] = defaultdict(set)
+        self.notifications = 0
+        self.delivered = 0
+        self.coalesced = 0
+
+    @property
+    def uses_notify(self) -> bool:
+        # Decidido pelo banco em que o feed escuta (o do engine que grava as
+        # tarefas), não por DATABASE_URL: os dois precisam ser o mesmo.
+        return (
+            self._url is not None
+            and make_url(self._url).get_backend_name() == "postgresql"
+        )
+
+    # --- Lado da escrita (chamado pelos listeners de Todo) ---
+
+    @staticmethod
+    def notify_supported(session) -> bool:
+        return session.get_bind().dialect.name == "postgresql"
+
+    def notify(self, session, user_ids: Iterable[int]) -> None:
+        """Emite um NOTIFY por usuário na transação de `session` (PostgreSQL)."""
+        origin = change_origin.get()
+        for user_id in sorted(user_ids):
+            payload = json.dumps(_change(user_id, origin))
+            session.execute(select(func.pg_notify(self.channel, payload)))
+
+    def publish(self, user_ids: Iterable[int]) -> None:
+        """Avisa os assinantes deste processo; pode ser chamado de qualquer thread."""
+        loop = self._loop
+        if loop is None:
+            return
+        origin = change_origin.get()
+        for user_id in user_ids:
+            loop.call_soon_threadsafe(self._deliver, user_id, origin)
+
+    # --- Lado da leitura ---
+
+    @contextlib.asynccontextmanager
+    async def subscribe(self, user_id: int) -> AsyncIterator[asyncio.Queue]:
+        queue: asyncio.Queue = asyncio.Queue(maxsize=1)
+        with self._lock:
+            self._queues[user_id].add(queue)
+        try:
+            yield queue
+        finally:
+            with self._lock:
+                queues = self._queues.get(user_id)
+                if queues is not None:
+                    queues.discard(queue)
+                    if not queues:
+                        del self._queues[user_id]
+
+    def _deliver(self, user_id: int, origin: str | None = None) -> None:
+        change = _change(user_id, origin)
+        with self._lock:
+            self.notifications += 1
+            queues = list(self._queues.get(user_id, ()))
+        for queue in queues:
+            try:
+                queue.put_nowait(change)
+            except asyncio.QueueFull:
+                self.coalesced += 1
+                # Agrupado com um aviso de outra origem: nenhuma aba pode
+                # ignorar o resultado.
+                pending = queue.get_nowait()
+                queue.put_nowait(pending if pending == change else _change(user_id))
+            else:
+                self.delivered += 1
+
+    def _on_notification(self, connection, pid, channel, payload) -> None:
+        try:
+            data = json.loads(payload)
+            user_id = int(data["user_id"])
+            origin = data.get("origin")
+            if origin is not None and not isinstance(origin, str):
+                raise TypeError(origin)
+        except (ValueError, KeyError, TypeError):
+            logger.warning("Aviso inválido no canal '%s': %r", channel, payload)
+            return
+        # A alteração pode ter vindo de outro worker, que não invalida o
+        # cache de fragmentos deste.
+        fragment_cache.bump(user_id)
+        self._deliver(user_id, origin)
+
+    async def _listen(self, retry_delay: float = 5.0) -> None:
+        # Importado só aqui: fora do PostgreSQL o driver nem é carregado.
+        import asyncpg
+
+        dsn = listener_dsn(self._url)
+        while True:
+            connection = None
+            try:
+                connection = await asyncpg.connect(dsn)
+                await connection.add_listener(self.channel, self._on_notification)
+                # Só a partir daqui o feed aparece como `listening`.
+                self._connection = connection
+                logger.info("Escutando o canal '%s'.", self.channel)
+                while not connection.is_closed():
+                    await asyncio.sleep(retry_delay)
+                logger.warning("Conexão de LISTEN encerrada; reconectando.")
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                logger.exception("Erro na conexão de LISTEN; reconectando.")
+            finally:
+                self._connection = None
+                if connection is not None and not connection.is_closed():
+                    await connection.close()
+            await asyncio.sleep(retry_delay)
+
+    async def start(self, url: str | None = None) -> None:
+        """
+        Começa a entregar avisos. `url` é o banco onde as tarefas são
+        gravadas; por padrão, o do engine da aplicação (`get_engine()`). No
+        PostgreSQL o LISTEN precisa ser feito nesse mesmo banco, onde os
+        listeners de Todo emitem o NOTIFY.
+
+        Um feed iniciado precisa de `stop()` antes de outro `start()`: o
+        listener pertence ao event loop em que foi criado.
+        """
+        if self._loop is not None:
+            raise RuntimeError("O feed de alterações já foi iniciado.")
+        self._loop = asyncio.get_running_loop()
+        if url is None:
+            url = get_engine().url.render_as_string(hide_password=False)
+        self._url = url
+        if self.uses_notify:
+            self._listener = asyncio.create_task(self._listen())
+
+    async def stop(self) -> None:
+        self._loop = None
+        self._url = None
+        if self._listener is not None:
+            self._listener.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._listener
+            self._listener = None
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            return {
+                "mode": "listen/notify" if self.uses_notify else "local",
+                "listening": self._connection is not None,
+                "users": len(self._queues),
+                "subscribers": sum(len(q) for q in self._queues.values()),
+                "notifications": self.notifications,
+                "delivered": self.delivered,
+                "coalesced": self.coalesced,
+            }
+
+
+def _change(user_id: int, origin: str | None = None) -> dict:
+    change = {"user_id": user_id}
+    if origin is not None:
+        change["origin"] = origin
+    return change
+
+
+todo_changes = TodoChangeFeed(channel=settings.TODO_CHANGES_CHANNEL)
+
+
+async def sse_stream(user_id: int, client_id: str | None = None) -> AsyncIterator[str]:
+    """
+    Corpo de uma resposta `text/event-stream`: um evento `todos-changed` a
+    cada alteração das tarefas do usuário e um comentário de keep-alive nos
+    intervalos, para que proxies não encerrem a conexão ociosa. Alterações
+    feitas pela própria aba (`client_id`, ver `change_origin`) não geram evento.
+    """
+    async with todo_changes.subscribe(user_id) as queue:
+        yield "retry: 3000\n\n"
+        while True:
+            try:
+                change = await asyncio.wait_for(
+                    queue.get(), timeout=settings.SSE_KEEPALIVE_SECONDS
+                )
+            except asyncio.TimeoutError:
+                yield ": keep-alive\n\n"
+                continue
+            if client_id is not None and change.get("origin") == client_id:
+                continue
+            yield f"event: {SSE_EVENT}\ndata: {json.dumps(change)}\n\n"
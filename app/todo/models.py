@@ -1,8 +1,15 @@
+from sqlalchemy import DDL, Index, event
 from sqlmodel import SQLModel, Field, Relationship
 from typing import Optional
 
+# Configuração de texto do PostgreSQL usada na busca (stemming em português).
+SEARCH_CONFIG = "portuguese"
+
 
 class Todo(SQLModel, table=True):
+    # As consultas por usuário filtram por user_id e ordenam/paginam por id.
+    __table_args__ = (Index("ix_todo_user_id_id", "user_id", "id"),)
+
     id: Optional[int] = Field(default=None, primary_key=True)
     content: str
     completed: bool = False
@@ -12,3 +19,24 @@ class Todo(SQLModel, table=True):
 
     # 2. Adiciona a referência de volta para o objeto User
     user: Optional["User"] = Relationship(back_populates="todos")
+
+
+# Coluna `content_search` (tsvector gerado a partir de `content`) e seu índice
+# GIN, usados na busca textual. Existem só no PostgreSQL e não são mapeadas no
+# modelo, para que `select(Todo)` não as carregue; a migração as cria no banco
+# e estes eventos as criam junto com a tabela no `create_all` (testes).
+event.listen(
+    Todo.__table__,
+    "after_create",
+    DDL(
+        "ALTER TABLE todo ADD COLUMN content_search tsvector GENERATED ALWAYS AS "
+        f"(to_tsvector('{SEARCH_CONFIG}', content)) STORED"
+    ).execute_if(dialect="postgresql"),
+)
+event.listen(
+    Todo.__table__,
+    "after_create",
+    DDL(
+        "CREATE INDEX ix_todo_content_search ON todo USING gin (content_search)"
+    ).execute_if(dialect="postgresql"),
+)
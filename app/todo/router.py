@@ -1,11 +1,27 @@
-from fastapi import APIRouter, HTTPException, status
-from typing import List
+from fastapi import APIRouter, Header, HTTPException, Query, Request, Response, status
+from fastapi.responses import StreamingResponse
+from typing import List, Literal
 
+from app.etag import CACHE_CONTROL, etag_matches, make_etag, not_modified
+from app.pagination import decode_cursor, encode_cursor
+from app.responses import FastJSONResponse, trusted_rows
+from app.settings import get_settings
+from app.todo.export import ENCODERS, MEDIA_TYPES
+from app.todo.live import SSE_HEADERS, sse_stream
 from app.todo.models import Todo
 from app.todo.services import TodoServiceDep
-from app.todo.schemas import TodoCreate, TodoUpdate
-from app.auth.current_user import CurrentUser
+from app.todo.schemas import (
+    TodoBatchRequest,
+    TodoBatchResponse,
+    TodoCreate,
+    TodoSearchResult,
+    TodoSummary,
+    TodoUpdate,
+)
+from app.auth.current_user import CurrentUser, is_admin
+
 
+settings = get_settings()
 
 # --- Configuração do Router para a API REST ---
 # É uma boa prática usar um prefixo para a API, como '/api/v1'
@@ -24,7 +40,7 @@ router = APIRouter(
     status_code=status.HTTP_201_CREATED,
     summary="Criar uma nova tarefa",
 )
-def create_new_todo(
+async def create_new_todo(
     todo_data: TodoCreate, service: TodoServiceDep, current_user: CurrentUser
 ):
     """
@@ -32,21 +48,192 @@ def create_new_todo(
     - **Corpo da Requisição**: Um JSON com o campo `content`.
     - **Retorna**: O objeto completo da tarefa criada.
     """
-    return service.create_todo(content=todo_data.content, user_id=current_user.id)
+    return await service.create_todo(content=todo_data.content, user_id=current_user.id)
 
 
 @router.get("/", response_model=List[Todo], summary="Listar todas as tarefas")
-def get_all_todos(
-    service: TodoServiceDep, current_user: CurrentUser
-):  # Usando o alias para a dependência
+async def get_all_todos(
+    request: Request,
+    response: Response,
+    service: TodoServiceDep,  # Usando o alias para a dependência
+    current_user: CurrentUser,
+    limit: int = Query(
+        settings.TODO_LIST_MAX_ITEMS,
+        ge=1,
+        le=settings.TODO_LIST_MAX_ITEMS,
+        description="Quantidade máxima de tarefas na resposta.",
+    ),
+    after: str | None = Query(
+        None, description="Cursor opaco recebido no cabeçalho `X-Next-Cursor`."
+    ),
+    if_none_match: str | None = Header(None),
+):
+    """
+    Busca e retorna as tarefas do usuário, ordenadas por ID.
+
+    A lista é paginada por cursor: quando há mais tarefas, a resposta traz o
+    cursor da próxima página no cabeçalho `X-Next-Cursor` (e um `Link` com
+    `rel="next"`). Sem `limit`, retorna até `TODO_LIST_MAX_ITEMS` tarefas.
+
+    A resposta tem um `ETag` derivado da versão das tarefas do usuário; com
+    `If-None-Match` igual, retorna 304 sem carregar as tarefas.
+
+    Com `FAST_JSON_RESPONSES` a lista é serializada direto das linhas do
+    banco (ver `app/responses.py`).
+    """
+    after_id = decode_cursor(after) if after else None
+
+    # A versão vem do banco (não do usuário em cache), que é atualizada na
+    # mesma transação de qualquer alteração nas tarefas.
+    version = await service.get_todos_version(current_user.id)
+    etag = make_etag("todos", current_user.id, version, limit, after_id)
+    if etag_matches(if_none_match, etag):
+        return not_modified(etag)
+    response.headers["ETag"] = etag
+    response.headers["Cache-Control"] = CACHE_CONTROL
+
+    todos, next_id = await service.get_todos_page(
+        user_id=current_user.id, limit=limit, after_id=after_id
+    )
+
+    if next_id is not None:
+        cursor = encode_cursor(next_id)
+        next_url = request.url.include_query_params(limit=limit, after=cursor)
+        response.headers["X-Next-Cursor"] = cursor
+        response.headers["Link"] = f'<{next_url}>; rel="next"'
+    if settings.FAST_JSON_RESPONSES:
+        # Uma Response devolvida pela rota não recebe os cabeçalhos de `response`.
+        return FastJSONResponse(trusted_rows(todos, Todo), headers=response.headers)
+    return todos
+
+
+@router.get(
+    "/summary",
+    response_model=TodoSummary,
+    summary="Quantidade de tarefas abertas e concluídas",
+)
+async def get_todo_summary(service: TodoServiceDep, current_user: CurrentUser):
+    """
+    Retorna quantas tarefas do usuário estão abertas e concluídas. Os valores
+    vêm de contadores atualizados junto com as tarefas, sem percorrê-las.
+    """
+    return await service.get_summary(current_user.id)
+
+
+@router.get(
+    "/events",
+    response_class=StreamingResponse,
+    summary="Receber avisos de alteração das tarefas (SSE)",
+)
+async def todo_events(current_user: CurrentUser):
+    """
+    Mantém uma conexão `text/event-stream` aberta e envia um evento
+    `todos-changed` sempre que as tarefas do usuário mudarem, em qualquer
+    dispositivo. Substitui o polling de `GET /api/todos`: ao receber o evento,
+    o cliente busca a lista de novo (com `If-None-Match`).
     """
-    Busca e retorna uma lista de todas as tarefas existentes.
+    return StreamingResponse(
+        sse_stream(current_user.id),
+        media_type="text/event-stream",
+        headers=SSE_HEADERS,
+    )
+
+
+@router.get(
+    "/search",
+    response_model=List[TodoSearchResult],
+    summary="Buscar tarefas por texto",
+)
+async def search_todos(
+    request: Request,
+    response: Response,
+    service: TodoServiceDep,
+    current_user: CurrentUser,
+    q: str = Query(
+        ...,
+        min_length=1,
+        max_length=200,
+        description='Termos da busca. Aceita "frases", `or` e `-termo`.',
+    ),
+    limit: int = Query(20, ge=1, le=100),
+    offset: int = Query(0, ge=0),
+):
+    """
+    Busca nas tarefas do usuário pelo conteúdo, ordenando pela relevância.
+
+    Quando há mais resultados, a resposta traz o offset da próxima página no
+    cabeçalho `X-Next-Offset` (e um `Link` com `rel="next"`).
+    """
+    results, next_offset = await service.search(
+        current_user.id, q, limit=limit, offset=offset
+    )
+    if next_offset is not None:
+        next_url = request.url.include_query_params(offset=next_offset)
+        response.headers["X-Next-Offset"] = str(next_offset)
+        response.headers["Link"] = f'<{next_url}>; rel="next"'
+    return results
+
+
+@router.post(
+    "/batch",
+    response_model=TodoBatchResponse,
+    summary="Criar, atualizar e deletar tarefas em lote",
+)
+async def apply_todo_batch(
+    batch: TodoBatchRequest, service: TodoServiceDep, current_user: CurrentUser
+):
+    """
+    Aplica várias operações em uma única requisição e transação.
+    - **Corpo da Requisição**: `create` (lista de `{content}`), `update` (lista de
+      `{id, content?, completed?}`, no máximo uma por tarefa; IDs repetidos
+      retornam 422) e `delete` (lista de IDs).
+    - **Retorna**: O resultado de cada operação, na ordem do pedido, com `status`
+      201/200/204, ou 404 para tarefas inexistentes ou de outro usuário.
     """
-    return service.get_all_todos(user_id=current_user.id)
+    if batch.size() > settings.TODO_BATCH_MAX_ITEMS:
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=f"O lote aceita no máximo {settings.TODO_BATCH_MAX_ITEMS} operações.",
+        )
+    return await service.apply_batch(batch, user_id=current_user.id)
+
+
+@router.get(
+    "/export",
+    response_class=StreamingResponse,
+    summary="Exportar tarefas em NDJSON ou CSV",
+)
+async def export_todos(
+    service: TodoServiceDep,
+    current_user: CurrentUser,
+    format: Literal["ndjson", "csv"] = "ndjson",
+    scope: Literal["mine", "all"] = Query(
+        "mine", description="`all` exporta as tarefas de todos os usuários (admins)."
+    ),
+):
+    """
+    Exporta as tarefas em streaming, lidas em lotes por um cursor do lado do
+    servidor: o uso de memória não depende da quantidade de tarefas.
+    """
+    if scope == "all" and not is_admin(current_user):
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Apenas administradores podem exportar todas as tarefas.",
+        )
+
+    user_id = None if scope == "all" else current_user.id
+    batches = service.stream_todos(
+        user_id=user_id, batch_size=settings.TODO_EXPORT_BATCH_SIZE
+    )
+    return StreamingResponse(
+        ENCODERS[format](batches),
+        media_type=MEDIA_TYPES[format],
+        headers={"Content-Disposition": f'attachment; filename="todos.{format}"'},
+    )
 
 
 @router.get("/{todo_id}", response_model=Todo, summary="Buscar uma tarefa por ID")
-def get_todo_by_id(
+async def get_todo_by_id(
     todo_id: int,
     service: TodoServiceDep,  # Usando o alias para a dependência
 ):
@@ -54,16 +241,14 @@ def get_todo_by_id(
     Busca e retorna uma única tarefa pelo seu ID.
     Retorna um erro 404 se a tarefa não for encontrada.
     """
-    # Para a API REST, é melhor buscar o todo aqui para poder retornar 404.
-    # A camada de serviço poderia ser adaptada para isso.
-    db_todo = service.session.get(Todo, todo_id)
+    db_todo = await service.get_todo_by_id(todo_id)
     if db_todo is None:
         raise HTTPException(status_code=404, detail="Tarefa não encontrada")
     return db_todo
 
 
 @router.put("/{todo_id}", response_model=Todo, summary="Atualizar uma tarefa")
-def update_existing_todo(
+async def update_existing_todo(
     todo_id: int,
     todo_data: TodoUpdate,
     service: TodoServiceDep,  # Usando o alias para a dependência
@@ -74,7 +259,9 @@ def update_existing_todo(
     - **Corpo da Requisição**: Um JSON com os campos a serem atualizados (`content` e/ou `completed`).
     - **Retorna**: O objeto da tarefa atualizada.
     """
-    updated_todo = service.update_todo(todo_id, todo_data, user_id=current_user.id)
+    updated_todo = await service.update_todo(
+        todo_id, todo_data, user_id=current_user.id
+    )
 
     if updated_todo is None:
         raise HTTPException(status_code=404, detail="Tarefa não encontrada")
@@ -85,14 +272,14 @@ def update_existing_todo(
 @router.delete(
     "/{todo_id}", status_code=status.HTTP_204_NO_CONTENT, summary="Deletar uma tarefa"
 )
-def delete_existing_todo(
+async def delete_existing_todo(
     todo_id: int, service: TodoServiceDep, current_user: CurrentUser
 ):
     """
     Deleta uma tarefa específica pelo seu ID.
     Não retorna conteúdo em caso de sucesso.
     """
-    was_deleted = service.delete_todo_by_id(todo_id, user_id=current_user.id)
+    was_deleted = await service.delete_todo_by_id(todo_id, user_id=current_user.id)
     if not was_deleted:
         raise HTTPException(status_code=404, detail="Tarefa não encontrada")
     # Nenhum retorno é necessário para o status 204
@@ -1,4 +1,9 @@
-from sqlmodel import SQLModel
+from collections import Counter
+
+from pydantic import field_validator
+from sqlmodel import Field, SQLModel
+
+from app.todo.models import Todo
 
 
 class TodoCreate(SQLModel):
@@ -12,3 +17,66 @@ class TodoUpdate(SQLModel):
 
     content: str | None = None
     completed: bool | None = None
+
+
+class TodoPatch(TodoUpdate):
+    """Atualização de uma tarefa dentro de um lote: inclui o ID da tarefa."""
+
+    id: int
+
+
+class TodoBatchRequest(SQLModel):
+    """Lote de operações aplicado em uma única transação."""
+
+    create: list[TodoCreate] = Field(default_factory=list)
+    update: list[TodoPatch] = Field(default_factory=list)
+    delete: list[int] = Field(default_factory=list)
+
+    @field_validator("update")
+    @classmethod
+    def unique_update_ids(cls, patches: list[TodoPatch]) -> list[TodoPatch]:
+        # Duas atualizações da mesma tarefa cairiam em UPDATEs diferentes, sem
+        # ordem definida entre eles.
+        counts = Counter(patch.id for patch in patches)
+        duplicated = sorted(todo_id for todo_id, n in counts.items() if n > 1)
+        if duplicated:
+            raise ValueError(f"Tarefas repetidas em `update`: {duplicated}")
+        return patches
+
+    def size(self) -> int:
+        return len(self.create) + len(self.update) + len(self.delete)
+
+
+class TodoBatchItemResult(SQLModel):
+    """
+    Resultado de uma operação do lote, na mesma ordem do pedido.
+    `status` segue os códigos HTTP: 201, 200, 204 ou 404.
+    """
+
+    id: int | None = None
+    status: int
+    todo: Todo | None = None
+
+
+class TodoBatchResponse(SQLModel):
+    create: list[TodoBatchItemResult] = Field(default_factory=list)
+    update: list[TodoBatchItemResult] = Field(default_factory=list)
+    delete: list[TodoBatchItemResult] = Field(default_factory=list)
+
+
+class TodoSearchResult(SQLModel):
+    """Tarefa encontrada pela busca textual, com a relevância (`rank`)."""
+
+    id: int
+    content: str
+    completed: bool
+    user_id: int | None
+    rank: float
+
+
+class TodoSummary(SQLModel):
+    """Quantidade de tarefas abertas e concluídas do usuário."""
+
+    open: int
+    done: int
+    total: int
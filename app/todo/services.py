@@ -1,10 +1,37 @@
-from sqlmodel import select
-from typing import List, Annotated
+from collections import defaultdict
+
+from sqlalchemy import (
+    Integer,
+    any_,
+    cast,
+    delete,
+    func,
+    literal,
+    literal_column,
+    update,
+)
+from sqlalchemy.dialects.postgresql import ARRAY, REGCONFIG, TSVECTOR
+from sqlmodel import Session, select
+from sqlmodel.ext.asyncio.session import AsyncSession
+from starlette.concurrency import iterate_in_threadpool
+from typing import AsyncIterator, Iterator, List, Annotated
 
 from fastapi import Depends
-from app.db import DBSession
-from app.todo.models import Todo
-from app.todo.schemas import TodoUpdate
+from app.db import DBSession, run_sync
+from app.events import dispatch
+from app.todo.models import SEARCH_CONFIG, Todo
+from app.user.models import User
+from app.todo.schemas import (
+    TodoBatchItemResult,
+    TodoBatchRequest,
+    TodoBatchResponse,
+    TodoSearchResult,
+    TodoSummary,
+    TodoUpdate,
+)
+
+# Coluna gerada pela migração, não mapeada no modelo (ver app/todo/models.py).
+content_search = literal_column("todo.content_search", type_=TSVECTOR)
 
 
 class TodoService:
@@ -30,6 +57,117 @@ class TodoService:
             ).all()
         return self.session.exec(select(Todo).order_by(Todo.id)).all()
 
+    def get_todos_page(
+        self, user_id=None, limit: int = 100, after_id: int | None = None
+    ) -> tuple[List[Todo], int | None]:
+        """
+        Busca uma página de tarefas ordenada por ID (paginação por chave).
+
+        Retorna as tarefas e o ID a partir do qual começa a próxima página,
+        ou None se esta for a última.
+        """
+        query = select(Todo).order_by(Todo.id).limit(limit + 1)
+        if user_id:
+            query = query.where(Todo.user_id == user_id)
+        if after_id is not None:
+            query = query.where(Todo.id > after_id)
+
+        todos = self.session.exec(query).all()
+        if len(todos) > limit:
+            todos = todos[:limit]
+            return todos, todos[-1].id
+        return todos, None
+
+    def get_todo_by_id(self, todo_id: int) -> Todo | None:
+        """Busca uma tarefa pelo ID. Retorna None se não existir."""
+        return self.session.get(Todo, todo_id)
+
+    def get_todos_version(self, user_id: int) -> int:
+        """
+        Versão dos dados de tarefas do usuário, incrementada a cada transação
+        que as altera. Lê só uma coluna, sem carregar as tarefas.
+        """
+        version = self.session.exec(
+            select(User.todo_version).where(User.id == user_id)
+        ).first()
+        return version or 0
+
+    def get_summary(self, user_id: int) -> TodoSummary:
+        """
+        Quantidade de tarefas abertas e concluídas do usuário, lida dos
+        contadores mantidos em `user` (sem contar as tarefas).
+        """
+        row = self.session.exec(
+            select(User.todo_open_count, User.todo_done_count).where(User.id == user_id)
+        ).first()
+        open_count, done_count = row or (0, 0)
+        return TodoSummary(
+            open=open_count, done=done_count, total=open_count + done_count
+        )
+
+    def search(
+        self, user_id: int, query: str, limit: int = 20, offset: int = 0
+    ) -> tuple[List[TodoSearchResult], int | None]:
+        """
+        Busca textual nas tarefas do usuário, da mais para a menos relevante.
+
+        No PostgreSQL usa a coluna tsvector `content_search` (índice GIN) e
+        `websearch_to_tsquery`, que aceita "frases", OR e -exclusão. Nos demais
+        bancos cai para um filtro por substring, sem ranking.
+
+        Retorna os resultados e o offset da próxima página, ou None se esta
+        for a última.
+        """
+        if self.session.get_bind().dialect.name == "postgresql":
+            tsquery = func.websearch_to_tsquery(cast(SEARCH_CONFIG, REGCONFIG), query)
+            rank = func.ts_rank_cd(content_search, tsquery).label("rank")
+            statement = (
+                select(Todo, rank)
+                .where(Todo.user_id == user_id, content_search.op("@@")(tsquery))
+                .order_by(rank.desc(), Todo.id)
+            )
+        else:
+            statement = (
+                select(Todo, literal(0.0))
+                .where(
+                    Todo.user_id == user_id,
+                    Todo.content.icontains(query, autoescape=True),
+                )
+                .order_by(Todo.id)
+            )
+
+        rows = self.session.exec(statement.offset(offset).limit(limit + 1)).all()
+        results = [
+            TodoSearchResult(**todo.model_dump(), rank=rank) for todo, rank in rows
+        ]
+        if len(results) > limit:
+            return results[:limit], offset + limit
+        return results, None
+
+    @staticmethod
+    def export_query(user_id=None):
+        """Consulta da exportação: apenas colunas, sem carregar objetos ORM."""
+        query = select(Todo.id, Todo.content, Todo.completed, Todo.user_id)
+        if user_id:
+            query = query.where(Todo.user_id == user_id)
+        return query.order_by(Todo.id)
+
+    def stream_todos(self, user_id=None, batch_size: int = 1000) -> Iterator[list]:
+        """
+        Percorre as tarefas em lotes de `batch_size` linhas usando um cursor
+        do lado do servidor (`yield_per`), sem carregar o resultado inteiro.
+
+        Usa uma sessão própria, ligada ao mesmo engine, que vive enquanto o
+        gerador for consumido: a sessão da requisição é fechada antes de uma
+        resposta em streaming começar a ser enviada.
+        """
+        with Session(bind=self.session.get_bind()) as session:
+            result = session.execute(
+                self.export_query(user_id).execution_options(yield_per=batch_size)
+            )
+            for rows in result.mappings().partitions():
+                yield [dict(row) for row in rows]
+
     def create_todo(self, content: str, user_id=None) -> Todo:
         """Cria uma nova tarefa."""
         if user_id:
@@ -66,6 +204,21 @@ class TodoService:
         self.session.refresh(db_todo)
         return db_todo
 
+    def toggle_todo(self, todo_id: int, user_id: int) -> Todo | None:
+        """
+        Alterna o estado 'completed' de uma tarefa do usuário.
+        Retorna a tarefa atualizada ou None se não for encontrada.
+        """
+        db_todo = self.session.get(Todo, todo_id)
+        if not db_todo or db_todo.user_id != user_id:
+            return None
+
+        db_todo.completed = not db_todo.completed
+        self.session.add(db_todo)
+        self.session.commit()
+        self.session.refresh(db_todo)
+        return db_todo
+
     def delete_todo_by_id(self, todo_id: int, user_id: int) -> bool:
         """
         Deleta uma tarefa pelo seu ID.
@@ -78,24 +231,211 @@ class TodoService:
             return True
         return False
 
+    def _id_in(self, ids):
+        """
+        Filtro `todo.id IN ids`. No PostgreSQL vira `todo.id = ANY(:ids)`, com
+        um único parâmetro do tipo array, em vez de um placeholder por ID.
+        """
+        ids = sorted(ids)
+        if self.session.get_bind().dialect.name == "postgresql":
+            return Todo.id == any_(literal(ids, type_=ARRAY(Integer)))
+        return Todo.id.in_(ids)
+
+    def apply_batch(self, batch: TodoBatchRequest, user_id: int) -> TodoBatchResponse:
+        """
+        Aplica um lote de criações, atualizações e exclusões em uma única
+        transação, apenas sobre tarefas do usuário.
+
+        - Criações: um único flush, que o SQLAlchemy envia como INSERT de
+          múltiplas linhas.
+        - Atualizações: um `UPDATE ... WHERE id = ANY(...)` por combinação
+          distinta de valores (ex.: marcar 200 tarefas como concluídas é um
+          único comando).
+        - Exclusões: um único `DELETE ... WHERE id = ANY(...)`.
+
+        UPDATE/DELETE em lote não disparam os eventos de mapper, então os
+        listeners registados são chamados explicitamente para cada tarefa.
+        """
+        session = self.session
+        response = TodoBatchResponse()
+
+        created = [Todo(content=item.content, user_id=user_id) for item in batch.create]
+        session.add_all(created)
+        session.flush()
+        response.create = [
+            TodoBatchItemResult(id=todo.id, status=201, todo=todo) for todo in created
+        ]
+
+        # Carrega (e bloqueia) as tarefas do usuário que o lote altera.
+        ids = {patch.id for patch in batch.update} | set(batch.delete)
+        owned = {}
+        if ids:
+            owned = {
+                todo.id: todo
+                for todo in session.exec(
+                    select(Todo)
+                    .where(self._id_in(ids), Todo.user_id == user_id)
+                    .with_for_update()
+                )
+            }
+
+        connection = session.connection()
+        with session.no_autoflush:
+            # Agrupa as atualizações pelos valores aplicados.
+            groups = defaultdict(list)
+            for patch in batch.update:
+                todo = owned.get(patch.id)
+                if todo is None:
+                    response.update.append(TodoBatchItemResult(id=patch.id, status=404))
+                    continue
+                values = patch.model_dump(exclude_unset=True, exclude={"id"})
+                for key, value in values.items():
+                    setattr(todo, key, value)
+                if values:
+                    groups[tuple(sorted(values.items()))].append(todo)
+                response.update.append(
+                    TodoBatchItemResult(id=patch.id, status=200, todo=todo)
+                )
+
+            for values, todos in groups.items():
+                session.execute(
+                    update(Todo)
+                    .where(self._id_in({todo.id for todo in todos}))
+                    .where(Todo.user_id == user_id)
+                    .values(dict(values))
+                    .execution_options(synchronize_session=False)
+                )
+            updated = list(
+                {id(todo): todo for g in groups.values() for todo in g}.values()
+            )
+            dispatch(Todo, "after_update", connection, updated)
+
+            to_delete = [
+                owned[todo_id]
+                for todo_id in dict.fromkeys(batch.delete)
+                if todo_id in owned
+            ]
+            if to_delete:
+                session.execute(
+                    delete(Todo)
+                    .where(self._id_in({todo.id for todo in to_delete}))
+                    .where(Todo.user_id == user_id)
+                    .execution_options(synchronize_session=False)
+                )
+                dispatch(Todo, "after_delete", connection, to_delete)
+            response.delete = [
+                TodoBatchItemResult(id=todo_id, status=204 if todo_id in owned else 404)
+                for todo_id in batch.delete
+            ]
+
+        # As tarefas já estão gravadas: retira-as da sessão para que o commit
+        # não as envie de novo no flush nem as expire (a resposta as serializa).
+        for todo in {id(t): t for t in [*created, *owned.values()]}.values():
+            session.expunge(todo)
+        session.commit()
+        return response
+
+
+class AsyncTodoService:
+    """
+    Versão assíncrona do TodoService, usada pelas rotas `async def`.
+
+    A lógica continua no TodoService: cada método aqui apenas o executa via
+    `run_sync`, sobre a AsyncSession (modo DATABASE_ASYNC) ou no threadpool
+    (Session síncrona).
+    """
+
+    def __init__(self, session: DBSession):
+        self.session = session
+
+    async def _call(self, method, *args, **kwargs):
+        return await run_sync(
+            self.session, lambda session: method(TodoService(session), *args, **kwargs)
+        )
+
+    async def get_all_todos(self, user_id=None) -> List[Todo]:
+        return await self._call(TodoService.get_all_todos, user_id=user_id)
+
+    async def get_todos_page(
+        self, user_id=None, limit: int = 100, after_id: int | None = None
+    ) -> tuple[List[Todo], int | None]:
+        return await self._call(
+            TodoService.get_todos_page, user_id=user_id, limit=limit, after_id=after_id
+        )
+
+    async def get_todo_by_id(self, todo_id: int) -> Todo | None:
+        return await self._call(TodoService.get_todo_by_id, todo_id)
+
+    async def get_summary(self, user_id: int) -> TodoSummary:
+        return await self._call(TodoService.get_summary, user_id)
+
+    async def search(
+        self, user_id: int, query: str, limit: int = 20, offset: int = 0
+    ) -> tuple[List[TodoSearchResult], int | None]:
+        return await self._call(
+            TodoService.search, user_id, query, limit=limit, offset=offset
+        )
+
+    async def get_todos_version(self, user_id: int) -> int:
+        return await self._call(TodoService.get_todos_version, user_id)
+
+    async def stream_todos(
+        self, user_id=None, batch_size: int = 1000
+    ) -> AsyncIterator[list]:
+        if not isinstance(self.session, AsyncSession):
+            batches = TodoService(self.session).stream_todos(user_id, batch_size)
+            async for rows in iterate_in_threadpool(batches):
+                yield rows
+            return
+
+        async with AsyncSession(bind=self.session.bind) as session:
+            result = await session.stream(
+                TodoService.export_query(user_id).execution_options(
+                    yield_per=batch_size
+                )
+            )
+            async for rows in result.mappings().partitions():
+                yield [dict(row) for row in rows]
+
+    async def create_todo(self, content: str, user_id=None) -> Todo:
+        return await self._call(TodoService.create_todo, content, user_id=user_id)
+
+    async def apply_batch(
+        self, batch: TodoBatchRequest, user_id: int
+    ) -> TodoBatchResponse:
+        return await self._call(TodoService.apply_batch, batch, user_id=user_id)
+
+    async def update_todo(
+        self, todo_id: int, todo_data: TodoUpdate, user_id: int
+    ) -> Todo | None:
+        return await self._call(
+            TodoService.update_todo, todo_id, todo_data, user_id=user_id
+        )
+
+    async def toggle_todo(self, todo_id: int, user_id: int) -> Todo | None:
+        return await self._call(TodoService.toggle_todo, todo_id, user_id=user_id)
+
+    async def delete_todo_by_id(self, todo_id: int, user_id: int) -> bool:
+        return await self._call(TodoService.delete_todo_by_id, todo_id, user_id=user_id)
+
 
-def get_todo_service(
+async def get_todo_service(
     # A dependência da sessão agora é explícita usando Annotated
     session: DBSession,
-) -> TodoService:
+) -> AsyncTodoService:
     """
-    Cria e retorna uma instância do TodoService com a sessão
+    Cria e retorna uma instância do AsyncTodoService com a sessão
     de banco de dados injetada.
     """
-    return TodoService(session)
+    return AsyncTodoService(session)
 
 
-TodoServiceDep = Annotated[TodoService, Depends(get_todo_service)]
+TodoServiceDep = Annotated[AsyncTodoService, Depends(get_todo_service)]
 
 
-def create_todo_example(service: TodoServiceDep) -> Todo:
+async def create_todo_example(service: TodoServiceDep) -> Todo:
     """
     Função de exemplo para criar uma tarefa.
     Esta função pode ser usada para testes ou como um exemplo de uso do serviço.
     """
-    return service.create_todo(content="Exemplo de tarefa")
+    return await service.create_todo(content="Exemplo de tarefa")
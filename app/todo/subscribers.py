@@ -1,6 +1,40 @@
+from collections import defaultdict
+
+from sqlalchemy import inspect, update
+from sqlalchemy.orm import Session, object_session
+
+from app.todo.fragments import fragment_cache
+from app.todo.live import todo_changes
 from app.todo.models import Todo
+from app.user.models import User
 from app.logger import logger
-from app.events import listens_for
+from app.events import listens_for, subscribe
+
+# Chave em `session.info` com os usuários cujas tarefas mudaram na transação:
+# user_id -> [variação de abertas, variação de concluídas].
+_CHANGED_TODO_USERS = "changed_todo_user_ids"
+
+
+def _record_change(target: Todo, open_delta: int = 0, done_delta: int = 0) -> None:
+    if target.user_id is None:
+        return
+    fragment_cache.bump(target.user_id)
+    # Incrementa de novo no commit: entre o flush e o commit outra requisição
+    # ainda lê a lista antiga e poderia guardá-la na versão nova.
+    session = object_session(target)
+    if session is not None:
+        changes = session.info.setdefault(_CHANGED_TODO_USERS, {})
+        deltas = changes.setdefault(target.user_id, [0, 0])
+        deltas[0] += open_delta
+        deltas[1] += done_delta
+
+
+def _count_deltas(completed: bool, sign: int) -> tuple[int, int]:
+    return (0, sign) if completed else (sign, 0)
+
+
+# Listeners síncronos: rodam dentro do flush e mantêm os dados derivados
+# (versão, contadores, cache de fragmentos) na mesma transação.
 
 
 @listens_for(Todo, "after_insert")
@@ -8,20 +42,104 @@ def after_todo_insert(mapper, connection, target: Todo):
     """
     Este 'listener' é executado depois de um objeto Todo ser inserido.
     """
-    logger.info(
-        f"Nova tarefa criada com ID: {target.id} e Conteúdo: '{target.content}'"
-    )
+    _record_change(target, *_count_deltas(target.completed, +1))
 
 
 @listens_for(Todo, "after_update")
 def after_todo_update(mapper, connection, target: Todo):
     """Este 'listener' é executado depois de um objeto Todo ser atualizado."""
-    logger.info(
-        f"Tarefa com ID {target.id} foi atualizada. Novo estado 'completed': {target.completed}"
-    )
+    open_delta = done_delta = 0
+    history = inspect(target).attrs.completed.history
+    if history.deleted and history.deleted[0] != target.completed:
+        # Passou de aberta para concluída ou vice-versa.
+        done_delta = 1 if target.completed else -1
+        open_delta = -done_delta
+    _record_change(target, open_delta, done_delta)
 
 
 @listens_for(Todo, "after_delete")
 def after_todo_delete(mapper, connection, target: Todo):
     """Este 'listener' é executado depois de um objeto Todo ser deletado."""
-    logger.info(f"Tarefa com ID {target.id} foi deletada.")
+    _record_change(target, *_count_deltas(target.completed, -1))
+
+
+@listens_for(Session, "before_commit")
+def before_commit_bump_todo_versions(session):
+    """
+    Atualiza, na mesma transação, `user.todo_version` (usado nos ETags) e os
+    contadores de tarefas abertas/concluídas dos usuários cujas tarefas
+    mudaram: um UPDATE para cada combinação distinta de variações.
+    """
+    # O flush do commit só acontece depois deste evento; é feito antes para
+    # que todas as alterações já tenham passado pelos listeners de Todo.
+    session.flush()
+    changes = session.info.get(_CHANGED_TODO_USERS)
+    if not changes:
+        return
+
+    users_by_delta = defaultdict(list)
+    for user_id, (open_delta, done_delta) in changes.items():
+        users_by_delta[(open_delta, done_delta)].append(user_id)
+
+    for (open_delta, done_delta), user_ids in sorted(users_by_delta.items()):
+        session.execute(
+            update(User)
+            .where(User.id.in_(sorted(user_ids)))
+            .values(
+                todo_version=User.todo_version + 1,
+                todo_open_count=User.todo_open_count + open_delta,
+                todo_done_count=User.todo_done_count + done_delta,
+            )
+        )
+
+    # Avisa os clientes conectados (SSE); o NOTIFY só é entregue no commit.
+    if todo_changes.notify_supported(session):
+        todo_changes.notify(session, changes)
+
+
+@listens_for(Session, "after_commit")
+def after_commit_bump_todo_versions(session):
+    changes = session.info.pop(_CHANGED_TODO_USERS, None)
+    if not changes:
+        return
+    for user_id in changes:
+        fragment_cache.bump(user_id)
+    if not todo_changes.notify_supported(session):
+        todo_changes.publish(changes)
+
+
+@listens_for(Session, "after_rollback")
+def after_rollback_discard_todo_versions(session):
+    session.info.pop(_CHANGED_TODO_USERS, None)
+
+
+# Handlers assíncronos: recebem, depois do commit e fora da requisição, os
+# lotes de eventos já confirmados.
+
+
+@subscribe(Todo, "after_insert")
+def log_todo_inserts(events):
+    for event in events:
+        # Só o tamanho do conteúdo: o texto da tarefa é do usuário.
+        logger.debug(
+            "Nova tarefa criada com ID %s (usuário %s, %d caracteres).",
+            event.data["id"],
+            event.data["user_id"],
+            len(event.data["content"] or ""),
+        )
+
+
+@subscribe(Todo, "after_update")
+def log_todo_updates(events):
+    for event in events:
+        logger.debug(
+            "Tarefa com ID %s foi atualizada. Novo estado 'completed': %s",
+            event.data["id"],
+            event.data["completed"],
+        )
+
+
+@subscribe(Todo, "after_delete")
+def log_todo_deletes(events):
+    for event in events:
+        logger.debug("Tarefa com ID %s foi deletada.", event.data["id"])
@@ -1,42 +1,83 @@
+import re
+import uuid
 from typing import Annotated
 
-from fastapi import APIRouter, Request, Form, Path, status, Depends
-from fastapi.responses import HTMLResponse, RedirectResponse
-from fastapi.templating import Jinja2Templates
+from fastapi import APIRouter, Request, Form, Path, Query, status, Depends
+from fastapi.responses import HTMLResponse, RedirectResponse, StreamingResponse
+from markupsafe import Markup
 
-
-from app.todo.services import TodoServiceDep
-from app.todo.models import Todo
-from app.todo.schemas import TodoUpdate
+from app.todo.fragments import fragment_cache
+from app.todo.live import SSE_HEADERS, change_origin, sse_stream
+from app.todo.services import AsyncTodoService, TodoServiceDep
 from app.auth.auth_ui import get_current_user_from_cookie
+from app.templating import get_templates
 from app.user.models import User
 
-# Configuração do router e dos templates
+# Configuração do router (os templates vêm de app/templating.py)
 router = APIRouter(
     tags=["Interface de Tarefas (HTMX)"],
     responses={404: {"description": "Não encontrado"}},
 )
-templates = Jinja2Templates(directory="app/templates")
 
 UserDep = Annotated[User, Depends(get_current_user_from_cookie)]
 
+# Máximo de tarefas exibidas como resultado da caixa de busca.
+UI_SEARCH_LIMIT = 50
+
+# Identificador da aba, gerado a cada carregamento da página e enviado pelo
+# HTMX neste cabeçalho (hx-headers em base.html) e na conexão SSE.
+CLIENT_ID_HEADER = "X-Client-Id"
+_CLIENT_ID = re.compile(r"[\w-]{1,64}")
+
+
+async def track_change_origin(request: Request) -> None:
+    """
+    Marca as alterações da requisição com a aba que as fez: o aviso SSE não
+    volta para ela, que já recebeu o item alterado na resposta.
+    """
+    client_id = request.headers.get(CLIENT_ID_HEADER)
+    if client_id and _CLIENT_ID.fullmatch(client_id):
+        change_origin.set(client_id)
+
+
+async def render_todos(service: AsyncTodoService, user: User) -> Markup:
+    """
+    Retorna o fragmento `todos.html` do usuário, do cache se a lista não
+    mudou desde a última renderização.
+    """
+    html = fragment_cache.get(user.id)
+    if html is None:
+        # A versão é lida antes da consulta: se a lista mudar enquanto
+        # renderizamos, o fragmento não é guardado como atual.
+        version = fragment_cache.version(user.id)
+        todos = await service.get_all_todos(user_id=user.id)
+        html = get_templates().get_template("todos.html").render(todos=todos)
+        fragment_cache.put(user.id, version, html)
+    return Markup(html)
+
 
 @router.get(
     "/",
     response_class=HTMLResponse,
     summary="Busca a página HTML principal da aplicação",
 )
-def read_root(request: Request, service: TodoServiceDep, user: UserDep):
+async def read_root(request: Request, service: TodoServiceDep, user: UserDep):
     """
     Renderiza a página de login se o usuário não estiver autenticado.
     Caso contrário, renderiza a página principal com a lista de tarefas.
     """
     if not user:
-        return templates.TemplateResponse("login.html", {"request": request})
-
-    todos = service.get_all_todos(user_id=user.id)
-    return templates.TemplateResponse(
-        "base.html", {"request": request, "todos": todos, "user": user}
+        return get_templates().TemplateResponse("login.html", {"request": request})
+
+    todos_html = await render_todos(service, user)
+    return get_templates().TemplateResponse(
+        "base.html",
+        {
+            "request": request,
+            "todos_html": todos_html,
+            "user": user,
+            "client_id": uuid.uuid4().hex,
+        },
     )
 
 
@@ -44,9 +85,10 @@ def read_root(request: Request, service: TodoServiceDep, user: UserDep):
     "/ui/todos",
     response_class=HTMLResponse,
     status_code=status.HTTP_201_CREATED,
-    summary="Cria uma nova tarefa e retorna a lista atualizada",
+    summary="Cria uma nova tarefa e retorna o item criado",
+    dependencies=[Depends(track_change_origin)],
 )
-def create_todo(
+async def create_todo(
     request: Request,
     service: TodoServiceDep,
     user: UserDep,
@@ -59,31 +101,87 @@ def create_todo(
     Cria uma nova tarefa a partir dos dados de um formulário.
 
     Este endpoint recebe dados no formato `application/x-www-form-urlencoded`.
-    Após criar a tarefa no banco de dados, ele renderiza e retorna um **fragmento HTML**
-    (`todos.html`) contendo toda a lista de tarefas atualizada. A interface (HTMX)
-    substitui o conteúdo do elemento `#todos` por esta resposta.
+    Após criar a tarefa no banco de dados, ele retorna um **fragmento HTML** só
+    com o item novo, marcado com `hx-swap-oob="beforeend:#todo-list"`: o HTMX
+    o anexa ao fim da lista, sem reenviar as demais tarefas.
     """
     if not user:
         return RedirectResponse(url="/ui/auth/login", status_code=status.HTTP_302_FOUND)
 
-    todo = service.create_todo(content=content, user_id=user.id)
+    todo = await service.create_todo(content=content, user_id=user.id)
     if not todo:
         return HTMLResponse(
             status_code=status.HTTP_400_BAD_REQUEST, content="Erro ao criar a tarefa."
         )
 
-    todos = service.get_all_todos(user_id=user.id)
-    return templates.TemplateResponse(
+    return get_templates().TemplateResponse(
+        "components/todo_created.html",
+        {"request": request, "todo": todo},
+        status_code=status.HTTP_201_CREATED,
+    )
+
+
+@router.get(
+    "/ui/todos/search",
+    response_class=HTMLResponse,
+    summary="Busca tarefas e retorna a lista filtrada",
+)
+async def search_todos(
+    request: Request,
+    service: TodoServiceDep,
+    user: UserDep,
+    q: Annotated[str, Query(max_length=200, description="Termos da busca.")] = "",
+):
+    """
+    Usado pela caixa de busca: retorna o **fragmento HTML** `todos.html` só com
+    as tarefas encontradas, das mais para as menos relevantes. Com a busca
+    vazia, retorna a lista completa.
+    """
+    if not user:
+        return RedirectResponse(url="/ui/auth/login", status_code=status.HTTP_302_FOUND)
+
+    if not q.strip():
+        return HTMLResponse(await render_todos(service, user))
+
+    todos, _ = await service.search(user.id, q, limit=UI_SEARCH_LIMIT)
+    return get_templates().TemplateResponse(
         "todos.html", {"request": request, "todos": todos}
     )
 
 
+@router.get(
+    "/ui/todos/events",
+    response_class=StreamingResponse,
+    summary="Avisos de alteração das tarefas para a página (SSE)",
+)
+async def todo_events(
+    user: UserDep,
+    client: Annotated[
+        str | None,
+        Query(max_length=64, description="Identificador da aba (X-Client-Id)."),
+    ] = None,
+):
+    """
+    Conexão `text/event-stream` usada pela extensão SSE do HTMX: a cada
+    evento `todos-changed` a página busca a lista de novo, então alterações
+    feitas em outro dispositivo ou aba aparecem sem recarregar. As alterações
+    feitas pela própria aba (`client`) não geram evento.
+    """
+    if not user:
+        return HTMLResponse(status_code=status.HTTP_401_UNAUTHORIZED)
+
+    return StreamingResponse(
+        sse_stream(user.id, client), media_type="text/event-stream", headers=SSE_HEADERS
+    )
+
+
 @router.put(
     "/ui/todos/{todo_id}",
     response_class=HTMLResponse,
     summary="Atualiza o estado de uma tarefa",
+    dependencies=[Depends(track_change_origin)],
 )
-def update_todo(
+async def update_todo(
     request: Request,
     service: TodoServiceDep,
     user: UserDep,
@@ -91,27 +189,25 @@ def update_todo(
         int,
         Path(description="O ID da tarefa que terá seu estado 'completed' alternado."),
     ],
-    todo_data: TodoUpdate = None,
 ):
     """
     Alterna o estado de 'concluída' para uma tarefa específica.
 
     Este endpoint não espera um corpo na requisição. A ação é identificada pelo ID na URL.
-    Após atualizar o estado da tarefa, ele retorna um **fragmento HTML** (`todos.html`)
-    com a lista de tarefas atualizada, para ser usado pelo HTMX na substituição do conteúdo.
+    Após atualizar o estado da tarefa, ele retorna um **fragmento HTML** só com o
+    item alterado, que o HTMX troca no lugar do antigo (`hx-swap="outerHTML"`).
     """
     if not user:
         return RedirectResponse(url="/ui/auth/login", status_code=status.HTTP_302_FOUND)
 
-    todo = service.update_todo(todo_id, todo_data, user_id=user.id)
+    todo = await service.toggle_todo(todo_id, user_id=user.id)
     if not todo:
         return HTMLResponse(
             status_code=status.HTTP_404_NOT_FOUND, content="Tarefa não encontrada."
         )
 
-    todos = service.get_all_todos(user_id=user.id)
-    return templates.TemplateResponse(
-        "todos.html", {"request": request, "todos": todos}
+    return get_templates().TemplateResponse(
+        "components/todo_item.html", {"request": request, "todo": todo}
     )
 
 
@@ -119,8 +215,9 @@ def update_todo(
     "/ui/todos/{todo_id}",
     response_class=HTMLResponse,
     summary="Deleta uma tarefa específica",
+    dependencies=[Depends(track_change_origin)],
 )
-def delete_todo(
+async def delete_todo(
     request: Request,
     service: TodoServiceDep,
     user: UserDep,
@@ -129,22 +226,16 @@ def delete_todo(
     """
     Remove uma tarefa do banco de dados.
 
-    Após deletar a tarefa identificada pelo ID na URL, este endpoint retorna um
-    **fragmento HTML** (`todos.html`) com a lista de tarefas restante. Este
-    fragmento é então usado pelo cliente (HTMX) para atualizar a interface.
+    Após deletar a tarefa identificada pelo ID na URL, este endpoint retorna uma
+    resposta vazia: o HTMX remove o item da página (`hx-swap="delete"`).
     """
     if not user:
         return RedirectResponse(url="/ui/auth/login", status_code=status.HTTP_302_FOUND)
 
-    todo = service.session.get(Todo, todo_id)
-    if not todo or todo.user_id != user.id:
+    was_deleted = await service.delete_todo_by_id(todo_id, user_id=user.id)
+    if not was_deleted:
         return HTMLResponse(
             status_code=status.HTTP_404_NOT_FOUND, content="Tarefa não encontrada."
         )
 
-    service.delete_todo_by_id(todo_id, user_id=user.id)
-
-    todos = service.get_all_todos(user_id=user.id)
-    return templates.TemplateResponse(
-        "todos.html", {"request": request, "todos": todos}
-    )
+    return HTMLResponse(status_code=status.HTTP_200_OK)
@@ -10,6 +10,11 @@ class User(SQLModel, table=True):
     password: str
     email: str = Field(index=True, unique=True, max_length=100, min_length=5)
     created_at: datetime = Field(default_factory=func.now, nullable=False)
+    # Incrementado a cada transação que altera as tarefas do usuário (ETag).
+    todo_version: int = Field(default=0, sa_column_kwargs={"server_default": "0"})
+    # Contadores de tarefas, mantidos na mesma transação que as altera.
+    todo_open_count: int = Field(default=0, sa_column_kwargs={"server_default": "0"})
+    todo_done_count: int = Field(default=0, sa_column_kwargs={"server_default": "0"})
     todos: list["Todo"] = Relationship(
         back_populates="user", sa_relationship_kwargs={"cascade": "all, delete-orphan"}
     )
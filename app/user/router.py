@@ -1,10 +1,15 @@
 from typing import List
 
-from fastapi import APIRouter, HTTPException, status
+from fastapi import APIRouter, Header, HTTPException, Response, status
 
+from app.responses import FastJSONResponse, trusted_rows
+from app.settings import get_settings
 from app.user.schemas import UserCreate, UserPublic, UserUpdate
 from app.user.services import UserServiceDep
 from app.auth.current_user import CurrentUser
+from app.etag import CACHE_CONTROL, etag_matches, make_etag, not_modified
+
+settings = get_settings()
 
 router = APIRouter(prefix="/users", tags=["Users"])
 
@@ -15,7 +20,7 @@ router = APIRouter(prefix="/users", tags=["Users"])
     status_code=status.HTTP_201_CREATED,
     summary="Criar um novo usuário",
 )
-def create_user(
+async def create_user(
     user_data: UserCreate,
     service: UserServiceDep,
 ):
@@ -27,7 +32,7 @@ def create_user(
     - **Levanta exceção 400**: Se o nome de usuário ou e-mail já existir.
     """
     # Verifica se o usuário já existe para evitar duplicatas.
-    existing_user = service.get_by_username(user_data.username)
+    existing_user = await service.get_by_username(user_data.username)
     if existing_user:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -36,39 +41,57 @@ def create_user(
 
     # O e-mail também deve ser único, adicione uma verificação se necessário.
 
-    return service.create_user(user_data=user_data)
+    return await service.create_user(user_data=user_data)
 
 
 @router.get("/", response_model=List[UserPublic], summary="Listar todos os usuários")
-def get_all_users(service: UserServiceDep, current_user: CurrentUser):
+async def get_all_users(service: UserServiceDep, current_user: CurrentUser):
     """
     Retorna uma lista de todos os usuários cadastrados no sistema.
     """
-    return service.get_all_users()
+    users = await service.get_all_users()
+    if settings.FAST_JSON_RESPONSES:
+        return FastJSONResponse(trusted_rows(users, UserPublic))
+    return users
 
 
 @router.get(
     "/{user_id}", response_model=UserPublic, summary="Buscar um usuário pelo ID"
 )
-def get_user_by_id(user_id: int, service: UserServiceDep, current_user: CurrentUser):
+async def get_user_by_id(
+    user_id: int,
+    service: UserServiceDep,
+    current_user: CurrentUser,
+    response: Response,
+    if_none_match: str | None = Header(None),
+):
     """
     Busca e retorna os dados de um usuário específico pelo seu ID.
 
-    - **Retorna**: Os dados públicos do usuário.
+    - **Retorna**: Os dados públicos do usuário, com um `ETag` calculado a partir
+      deles. Com `If-None-Match` igual, retorna 304 sem corpo.
     - **Levanta exceção 404**: Se o usuário com o ID fornecido não for encontrado.
     """
     # A camada de serviço lida com a busca. Aqui, apenas tratamos o resultado.
-    # Nota: get_user_by_id não existe no serviço, vamos usar session.get.
-    user = service.get_by_id(user_id=user_id)
+    user = await service.get_by_id(user_id=user_id)
     if not user:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND, detail="Usuário não encontrado."
         )
+
+    # Hash dos campos que compõem a resposta: muda quando algum deles muda.
+    etag = make_etag(
+        "user", *(getattr(user, field) for field in UserPublic.model_fields)
+    )
+    if etag_matches(if_none_match, etag):
+        return not_modified(etag)
+    response.headers["ETag"] = etag
+    response.headers["Cache-Control"] = CACHE_CONTROL
     return user
 
 
 @router.put("/{user_id}", response_model=UserPublic, summary="Atualizar um usuário")
-def update_user(
+async def update_user(
     user_data: UserUpdate, current_user: CurrentUser, service: UserServiceDep
 ):
     """
@@ -78,21 +101,21 @@ def update_user(
     - **Retorna**: Os dados públicos do usuário atualizado.
     - **Levanta exceção 404**: Se o usuário não for encontrado.
     """
-    updated_data = service.update_user(current_user.id, user_data)
+    updated_data = await service.update_user(current_user.id, user_data)
     return updated_data
 
 
 @router.delete(
     "/{user_id}", status_code=status.HTTP_204_NO_CONTENT, summary="Deletar um usuário"
 )
-def delete_user(user_id: int, service: UserServiceDep, current_user: CurrentUser):
+async def delete_user(user_id: int, service: UserServiceDep, current_user: CurrentUser):
     """
     Deleta um usuário do sistema pelo seu ID.
 
     - **Não retorna conteúdo** em caso de sucesso (status 204).
     - **Levanta exceção 404**: Se o usuário não for encontrado.
     """
-    was_deleted = service.delete_user_by_id(user_id=user_id)
+    was_deleted = await service.delete_user_by_id(user_id=user_id)
     if not was_deleted:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND, detail="Usuário não encontrado."
@@ -3,8 +3,9 @@ from typing import List, Annotated, Optional
 from fastapi import Depends
 from sqlmodel import select
 
+from app.auth.hashing import password_hasher
 from app.auth.security import get_password_hash
-from app.db import DBSession
+from app.db import DBSession, run_sync
 from app.user.models import User
 from app.user.schemas import UserCreate, UserUpdate
 
@@ -51,12 +52,15 @@ class UserService:
         users = self.session.exec(select(User).order_by(User.id)).all()
         return users
 
-    def create_user(self, user_data: UserCreate) -> User:
+    def create_user(
+        self, user_data: UserCreate, hashed_password: Optional[str] = None
+    ) -> User:
         """
         Cria um novo usuário a partir dos dados do schema UserCreate.
 
         Args:
             user_data: Um objeto UserCreate com os dados do novo usuário.
+            hashed_password: O hash da senha, se já calculado pelo chamador.
 
         Returns:
             O objeto do usuário recém-criado.
@@ -65,7 +69,8 @@ class UserService:
         user_dict = user_data.model_dump(exclude={"password"})
 
         # Aplica o hash na senha antes de armazená-la.
-        hashed_password = get_password_hash(user_data.password)
+        if hashed_password is None:
+            hashed_password = get_password_hash(user_data.password)
 
         # Cria a instância do modelo User com os dados e a senha hasheada.
         db_user = User(**user_dict, password=hashed_password)
@@ -75,13 +80,19 @@ class UserService:
         self.session.refresh(db_user)
         return db_user
 
-    def update_user(self, user_id: int, user_data: UserUpdate) -> Optional[User]:
+    def update_user(
+        self,
+        user_id: int,
+        user_data: UserUpdate,
+        hashed_password: Optional[str] = None,
+    ) -> Optional[User]:
         """
         Atualiza um usuário existente a partir dos dados do schema UserUpdate.
 
         Args:
             user_id: O ID do usuário a ser atualizado.
             user_data: Um objeto UserUpdate com os campos a serem atualizados.
+            hashed_password: O hash da nova senha, se já calculado pelo chamador.
 
         Returns:
             O objeto do usuário atualizado, ou None se não for encontrado.
@@ -95,8 +106,9 @@ class UserService:
         update_data = user_data.model_dump(exclude_unset=True)
 
         # Trata a atualização da senha separadamente para aplicar o hash.
-        if "password" in update_data:
-            hashed_password = get_password_hash(update_data["password"])
+        if update_data.get("password"):
+            if hashed_password is None:
+                hashed_password = get_password_hash(update_data["password"])
             update_data["password"] = hashed_password
 
         # Atualiza os campos do objeto do banco de dados.
@@ -122,13 +134,56 @@ class UserService:
         return False
 
 
-def get_user_service(session: DBSession) -> UserService:
+class AsyncUserService:
     """
-    Cria e retorna uma instância do UserService com a sessão
+    Versão assíncrona do UserService, usada pelas rotas `async def`.
+
+    Cada método executa o equivalente do UserService via `run_sync`, sobre a
+    AsyncSession (modo DATABASE_ASYNC) ou no threadpool (Session síncrona).
+    """
+
+    def __init__(self, session: DBSession):
+        self.session = session
+
+    async def _call(self, method, *args, **kwargs):
+        return await run_sync(
+            self.session, lambda session: method(UserService(session), *args, **kwargs)
+        )
+
+    async def get_by_id(self, user_id: int) -> Optional[User]:
+        return await self._call(UserService.get_by_id, user_id)
+
+    async def get_by_username(self, username: str) -> Optional[User]:
+        return await self._call(UserService.get_by_username, username)
+
+    async def get_all_users(self) -> List[User]:
+        return await self._call(UserService.get_all_users)
+
+    # O hash da senha é calculado antes, no pool de processos, para não
+    # ocupar a conexão (nem o threadpool) durante o argon2.
+    async def create_user(self, user_data: UserCreate) -> User:
+        hashed_password = await password_hasher.hash(user_data.password)
+        return await self._call(UserService.create_user, user_data, hashed_password)
+
+    async def update_user(self, user_id: int, user_data: UserUpdate) -> Optional[User]:
+        hashed_password = None
+        if user_data.password:
+            hashed_password = await password_hasher.hash(user_data.password)
+        return await self._call(
+            UserService.update_user, user_id, user_data, hashed_password
+        )
+
+    async def delete_user_by_id(self, user_id: int) -> bool:
+        return await self._call(UserService.delete_user_by_id, user_id)
+
+
+async def get_user_service(session: DBSession) -> AsyncUserService:
+    """
+    Cria e retorna uma instância do AsyncUserService com a sessão
     de banco de dados injetada.
     """
-    return UserService(session)
+    return AsyncUserService(session)
 
 
 # Dependência para ser usada nos endpoints da API.
-UserServiceDep = Annotated[UserService, Depends(get_user_service)]
+UserServiceDep = Annotated[AsyncUserService, Depends(get_user_service)]
@@ -0,0 +1,40 @@
+from sqlalchemy.orm import Session, object_session
+
+from app.auth.user_cache import user_cache
+from app.events import listens_for
+from app.user.models import User
+
+# Chave em `session.info` com os ids de usuários alterados na transação.
+_CHANGED_USERS = "changed_user_ids"
+
+
+def _invalidate(target: User) -> None:
+    user_cache.invalidate(target.id)
+    # Invalida de novo no commit: entre o flush e o commit outra requisição
+    # ainda lê a versão antiga do banco e pode colocá-la de volta no cache.
+    session = object_session(target)
+    if session is not None:
+        session.info.setdefault(_CHANGED_USERS, set()).add(target.id)
+
+
+@listens_for(User, "after_update")
+def after_user_update(mapper, connection, target: User):
+    """Remove do cache de autenticação o usuário atualizado."""
+    _invalidate(target)
+
+
+@listens_for(User, "after_delete")
+def after_user_delete(mapper, connection, target: User):
+    """Remove do cache de autenticação o usuário deletado."""
+    _invalidate(target)
+
+
+@listens_for(Session, "after_commit")
+def after_commit_invalidate_users(session):
+    for user_id in session.info.pop(_CHANGED_USERS, ()):
+        user_cache.invalidate(user_id)
+
+
+@listens_for(Session, "after_rollback")
+def after_rollback_discard_users(session):
+    session.info.pop(_CHANGED_USERS, None)
@@ -0,0 +1,8 @@
+"""
+Microbenchmarks da camada de serviços, da autenticação (JWT) e da
+renderização de `todos.html`, com bases de 10, 1k e 100k tarefas. Os
+resultados são guardados como baseline em JSON e comparados a cada
+execução; uma piora acima do limite configurado falha o comando.
+
+Uso: `python -m benchmarks --help`.
+"""
@@ -0,0 +1,122 @@
+import argparse
+import os
+import sys
+import tempfile
+
+from benchmarks.runner import (
+    compare,
+    format_comparison,
+    format_time,
+    load_baseline,
+    measure,
+    save_results,
+)
+
+DEFAULT_BASELINE = os.path.join(os.path.dirname(__file__), "baseline.json")
+
+# Variáveis exigidas pelas Settings que os benchmarks não usam.
+DEFAULT_ENV = {
+    "SECRET_KEY": "benchmark-secret-key-with-at-least-32-bytes",
+    "ALGORITHM": "HS256",
+    "ACCESS_TOKEN_EXPIRE_MINUTES": "30",
+    "POSTGRES_USER": "bench",
+    "POSTGRES_PASSWORD": "bench",
+    "POSTGRES_DB": "bench",
+    "LOG_LEVEL": "WARNING",
+}
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(
+        prog="python -m benchmarks",
+        description="Microbenchmarks com comparação contra um baseline em JSON.",
+    )
+    parser.add_argument(
+        "--database-url",
+        help="Banco dos benchmarks. Padrão: SQLite temporário. "
+        "Precisa estar vazio: o esquema é criado e removido no final.",
+    )
+    parser.add_argument(
+        "--sizes",
+        default="10,1000,100000",
+        help="Quantidades de tarefas das bases, separadas por vírgula.",
+    )
+    parser.add_argument("--filter", help="Roda só os benchmarks que contêm o texto.")
+    parser.add_argument("--rounds", type=int, default=5)
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE)
+    parser.add_argument(
+        "--save", action="store_true", help="Grava os resultados como novo baseline."
+    )
+    parser.add_argument(
+        "--max-regression",
+        type=float,
+        default=float(os.environ.get("BENCHMARK_MAX_REGRESSION", 20.0)),
+        help="Piora máxima aceita, em %% da mediana do baseline (padrão: 20).",
+    )
+    parser.add_argument("--output", help="Grava também os resultados neste arquivo.")
+    return parser.parse_args(argv)
+
+
+def main(argv=None) -> int:
+    args = parse_args(argv)
+    tmpdir = None
+    database_url = args.database_url
+    if database_url is None:
+        tmpdir = tempfile.TemporaryDirectory(prefix="benchmarks-")
+        database_url = f"sqlite:///{os.path.join(tmpdir.name, 'bench.db')}"
+    for key, value in DEFAULT_ENV.items():
+        os.environ.setdefault(key, value)
+    os.environ.setdefault("DATABASE_URL", database_url)
+
+    # Importado só agora: a aplicação lê as Settings na importação.
+    from benchmarks.suite import DatabaseNotEmpty, Suite
+
+    sizes = tuple(int(size) for size in args.sizes.split(","))
+    results = {}
+    try:
+        with Suite(database_url, sizes) as benchmarks:
+            for name, fn in benchmarks.items():
+                if args.filter and args.filter not in name:
+                    continue
+                results[name] = measure(fn, rounds=args.rounds)
+                print(
+                    f"{name}: {format_time(results[name]['median_s'])}", file=sys.stderr
+                )
+    except DatabaseNotEmpty as error:
+        print(error, file=sys.stderr)
+        return 2
+    finally:
+        if tmpdir is not None:
+            tmpdir.cleanup()
+
+    if args.output:
+        save_results(args.output, results)
+
+    baseline = load_baseline(args.baseline)
+    if args.save:
+        if baseline is not None and args.filter:
+            # Atualiza só os benchmarks executados.
+            results = {**baseline["results"], **results}
+        save_results(args.baseline, results)
+        print(f"Baseline gravado em {args.baseline}.")
+        return 0
+    if baseline is None:
+        # Sem baseline não há com o que comparar: falha, para que um gate de
+        # CI sem o arquivo não passe sem medir nada.
+        print(f"Sem baseline em {args.baseline}; use --save para criar.")
+        return 1
+
+    rows = compare(baseline, results, args.max_regression)
+    print(format_comparison(rows))
+    regressed = [row["name"] for row in rows if row["status"] == "regressed"]
+    if regressed:
+        print(
+            f"\n{len(regressed)} benchmark(s) pioraram mais de "
+            f"{args.max_regression:.0f}%: {', '.join(regressed)}"
+        )
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,91 @@
+import json
+import platform
+import statistics
+import sys
+import timeit
+from datetime import datetime, timezone
+
+
+def measure(fn, rounds: int = 5) -> dict:
+    """
+    Tempo por chamada de `fn`. O número de chamadas por rodada é calibrado
+    (como no `timeit`) para cada rodada levar ao menos 0,2 s; o resultado
+    principal é a mediana entre as rodadas, menos sensível a ruído.
+    """
+    timer = timeit.Timer(fn)
+    loops, _ = timer.autorange()
+    per_call = [total / loops for total in timer.repeat(repeat=rounds, number=loops)]
+    return {
+        "median_s": statistics.median(per_call),
+        "min_s": min(per_call),
+        "loops": loops,
+        "rounds": rounds,
+    }
+
+
+def metadata() -> dict:
+    return {
+        "created_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "python": sys.version.split()[0],
+        "platform": platform.platform(),
+        "machine": platform.machine(),
+    }
+
+
+def load_baseline(path: str) -> dict | None:
+    try:
+        with open(path, encoding="utf-8") as file:
+            return json.load(file)
+    except FileNotFoundError:
+        return None
+
+
+def save_results(path: str, results: dict) -> None:
+    with open(path, "w", encoding="utf-8") as file:
+        json.dump({"meta": metadata(), "results": results}, file, indent=2)
+        file.write("\n")
+
+
+def compare(baseline: dict, results: dict, max_regression_pct: float) -> list[dict]:
+    """
+    Compara a mediana de cada benchmark com a do baseline. `status` é
+    `regressed` quando a piora passa de `max_regression_pct`, `new` quando o
+    benchmark não está no baseline e `ok` nos demais casos.
+    """
+    rows = []
+    for name, current in results.items():
+        base = baseline.get("results", {}).get(name)
+        row = {"name": name, "current_s": current["median_s"], "baseline_s": None}
+        if base is None:
+            row.update(delta_pct=None, status="new")
+        else:
+            delta = (current["median_s"] - base["median_s"]) / base["median_s"] * 100
+            row.update(
+                baseline_s=base["median_s"],
+                delta_pct=delta,
+                status="regressed" if delta > max_regression_pct else "ok",
+            )
+        rows.append(row)
+    return rows
+
+
+def format_time(seconds: float | None) -> str:
+    if seconds is None:
+        return "-"
+    for unit, scale in (("s", 1), ("ms", 1e-3), ("µs", 1e-6)):
+        if seconds >= scale:
+            return f"{seconds / scale:.2f} {unit}"
+    return f"{seconds / 1e-9:.0f} ns"
+
+
+def format_comparison(rows: list[dict]) -> str:
+    header = f"{'benchmark':<48} {'baseline':>10} {'atual':>10} {'variação':>9}  "
+    lines = [header, "-" * len(header)]
+    for row in rows:
+        delta = "-" if row["delta_pct"] is None else f"{row['delta_pct']:+.1f}%"
+        marker = {"regressed": "PIOROU", "new": "novo", "ok": ""}[row["status"]]
+        lines.append(
+            f"{row['name']:<48} {format_time(row['baseline_s']):>10} "
+            f"{format_time(row['current_s']):>10} {delta:>9}  {marker}"
+        )
+    return "\n".join(lines)
@@ -0,0 +1,207 @@
+"""
+Definição dos benchmarks e da massa de dados.
+
+Importa a aplicação: as variáveis de ambiente (DATABASE_URL etc.) precisam
+estar definidas antes (ver `benchmarks.__main__`).
+"""
+
+from datetime import datetime
+
+import json
+
+from jwt import decode
+from pydantic import TypeAdapter
+from sqlalchemy import insert, inspect, select
+from sqlmodel import Session, SQLModel, create_engine
+
+from app.auth.current_user import ALGORITHM, SECRET_KEY
+from app.auth.security import create_access_token
+from app.db import configure_engine
+from app.responses import dumps, trusted_rows
+from app.events import register_sqlalchemy_listeners, remove_sqlalchemy_listeners
+from app.todo.models import Todo
+from app.todo.services import TodoService
+from app.settings import get_settings
+from app.templating import get_templates
+from app.user.models import User
+from app.user.services import UserService
+
+SIZES = (10, 1_000, 100_000)
+
+# Usuários que não fazem parte dos benchmarks, para que as consultas por
+# usuário dependam dos índices e não do tamanho total da tabela.
+OTHER_USERS = 100
+
+
+def username(size: int) -> str:
+    return f"bench-{size}"
+
+
+def create_dataset(engine, sizes) -> dict[int, int]:
+    """Cria um usuário com `size` tarefas para cada tamanho; retorna size -> user_id."""
+    now = datetime.now()
+    names = [username(size) for size in sizes] + [
+        f"outro-{i}" for i in range(OTHER_USERS)
+    ]
+    with Session(engine) as session:
+        session.execute(
+            insert(User),
+            [
+                {
+                    "username": name,
+                    "email": f"{name}@bench.local",
+                    "password": "hash",
+                    "created_at": now,
+                }
+                for name in names
+            ],
+        )
+        ids = dict(session.execute(select(User.username, User.id)).all())
+        rows = [
+            {"content": f"tarefa {n}", "completed": n % 2 == 0, "user_id": ids[name]}
+            for name in names[len(sizes) :]
+            for n in range(10)
+        ]
+        for size in sizes:
+            rows += [
+                {
+                    "content": f"tarefa {n}",
+                    "completed": n % 2 == 0,
+                    "user_id": ids[username(size)],
+                }
+                for n in range(size)
+            ]
+        for start in range(0, len(rows), 10_000):
+            session.execute(insert(Todo), rows[start : start + 10_000])
+        session.commit()
+    return {size: ids[username(size)] for size in sizes}
+
+
+def build_benchmarks(engine, user_ids: dict[int, int]) -> dict:
+    """Nome do benchmark -> função sem argumentos a ser medida."""
+
+    def with_service(service_class, call):
+        def run():
+            with Session(engine) as session:
+                return call(service_class(session))
+
+        return run
+
+    benchmarks = {}
+    for size, user_id in user_ids.items():
+        with Session(engine) as session:
+            todos = TodoService(session).get_all_todos(user_id=user_id)
+            first_id = todos[0].id
+        template = get_templates().get_template("todos.html")
+        adapter = TypeAdapter(list[Todo])
+
+        def serialize_response_model(todos=todos, adapter=adapter):
+            # O que o FastAPI faz com `response_model=List[Todo]`.
+            todos = adapter.validate_python(todos, from_attributes=True)
+            return json.dumps(adapter.dump_python(todos, mode="json")).encode()
+
+        def create_and_delete(service, user_id=user_id):
+            todo = service.create_todo("nova", user_id=user_id)
+            service.delete_todo_by_id(todo.id, user_id=user_id)
+
+        benchmarks |= {
+            f"todo_service.get_all_todos[{size}]": with_service(
+                TodoService, lambda s, u=user_id: s.get_all_todos(user_id=u)
+            ),
+            f"todo_service.get_todos_page[{size}]": with_service(
+                TodoService, lambda s, u=user_id: s.get_todos_page(user_id=u, limit=100)
+            ),
+            f"todo_service.get_todo_by_id[{size}]": with_service(
+                TodoService, lambda s, t=first_id: s.get_todo_by_id(t)
+            ),
+            f"todo_service.get_summary[{size}]": with_service(
+                TodoService, lambda s, u=user_id: s.get_summary(u)
+            ),
+            f"todo_service.get_todos_version[{size}]": with_service(
+                TodoService, lambda s, u=user_id: s.get_todos_version(u)
+            ),
+            f"todo_service.toggle_todo[{size}]": with_service(
+                TodoService,
+                lambda s, u=user_id, t=first_id: s.toggle_todo(t, user_id=u),
+            ),
+            f"todo_service.create_and_delete[{size}]": with_service(
+                TodoService, create_and_delete
+            ),
+            f"serialize.response_model[{size}]": serialize_response_model,
+            f"serialize.fast_json[{size}]": lambda todos=todos: dumps(
+                trusted_rows(todos, Todo)
+            ),
+            f"render.todos_html[{size}]": lambda t=template, todos=todos: t.render(
+                todos=todos
+            ),
+        }
+
+    any_id = next(iter(user_ids.values()))
+    any_name = username(next(iter(user_ids)))
+    token = create_access_token({"sub": any_name})
+    benchmarks |= {
+        "user_service.get_by_id": with_service(
+            UserService, lambda s: s.get_by_id(any_id)
+        ),
+        "user_service.get_by_username": with_service(
+            UserService, lambda s: s.get_by_username(any_name)
+        ),
+        "auth.create_access_token": lambda: create_access_token({"sub": any_name}),
+        "auth.decode": lambda: decode(token, SECRET_KEY, algorithms=[ALGORITHM]),
+    }
+    return benchmarks
+
+
+class DatabaseNotEmpty(RuntimeError):
+    """O banco dos benchmarks já tem tabelas da aplicação."""
+
+
+class Suite:
+    """
+    Massa de dados e benchmarks sobre um banco vazio; use como context
+    manager. As tabelas são criadas na entrada e removidas na saída; um banco
+    que já tenha alguma delas é recusado, para não apagar dados de outro uso.
+    """
+
+    def __init__(self, database_url: str, sizes=SIZES):
+        self.engine = create_engine(database_url)
+        configure_engine(self.engine, get_settings())
+        self.sizes = sizes
+        self._created = False
+        self._listening = False
+
+    def __enter__(self) -> dict:
+        existing = set(inspect(self.engine).get_table_names()) & set(
+            SQLModel.metadata.tables
+        )
+        if existing:
+            self.engine.dispose()
+            raise DatabaseNotEmpty(
+                "O banco já tem tabelas da aplicação "
+                f"({', '.join(sorted(existing))}); use um banco vazio."
+            )
+        try:
+            SQLModel.metadata.create_all(self.engine)
+            self._created = True
+            user_ids = create_dataset(self.engine, self.sizes)
+            # Os listeners mantêm contadores, versões e o outbox nas escritas;
+            # sem eles os benchmarks de escrita mediriam menos trabalho que o real.
+            register_sqlalchemy_listeners()
+            self._listening = True
+            return build_benchmarks(self.engine, user_ids)
+        except BaseException:
+            self.close()
+            raise
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def close(self) -> None:
+        """Remove os listeners e as tabelas criadas pela suíte."""
+        if self._listening:
+            remove_sqlalchemy_listeners()
+            self._listening = False
+        if self._created:
+            SQLModel.metadata.drop_all(self.engine)
+            self._created = False
+        self.engine.dispose()
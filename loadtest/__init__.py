@@ -0,0 +1,7 @@
+"""
+Teste de carga da aplicação: sobe um uvicorn real com `app.main:app` sobre
+um banco semeado e roda fluxos de usuários (API REST e HTMX) com um cliente
+HTTP assíncrono, reportando RPS e latências p50/p95/p99 por rota.
+
+Uso: `python -m loadtest --help`.
+"""
@@ -0,0 +1,126 @@
+import argparse
+import asyncio
+import os
+import random
+import sys
+import tempfile
+import time
+import uuid
+
+import httpx
+
+from loadtest.flows import VirtualUser
+from loadtest.server import UvicornServer, migrate, seed_database, server_env
+from loadtest.stats import Recorder, format_report, write_json
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(
+        prog="python -m loadtest",
+        description="Teste de carga da API e das rotas HTMX contra um uvicorn real.",
+    )
+    parser.add_argument(
+        "--database-url",
+        help="Banco do teste (ex.: postgresql://...). Padrão: SQLite temporário.",
+    )
+    parser.add_argument(
+        "--url", help="Usa um servidor já rodando em vez de subir um uvicorn."
+    )
+    parser.add_argument("--users", type=int, default=20, help="Usuários simultâneos.")
+    parser.add_argument("--duration", type=float, default=30.0, help="Segundos.")
+    parser.add_argument(
+        "--ui-ratio",
+        type=float,
+        default=0.5,
+        help="Fração dos usuários que usa as rotas HTMX em vez da API.",
+    )
+    parser.add_argument(
+        "--think-time",
+        type=float,
+        default=0.0,
+        help="Pausa média (s) entre ciclos de cada usuário.",
+    )
+    parser.add_argument("--seed-users", type=int, default=200)
+    parser.add_argument("--seed-todos", type=int, default=50)
+    parser.add_argument("--workers", type=int, default=1, help="Workers do uvicorn.")
+    parser.add_argument("--json", help="Grava o resumo em JSON neste arquivo.")
+    parser.add_argument("--random-seed", type=int)
+    return parser.parse_args(argv)
+
+
+async def run_load(base_url: str, args, seeded_users: int, recorder: Recorder) -> None:
+    run_id = uuid.uuid4().hex[:6]
+    deadline = time.perf_counter() + args.duration
+    limits = httpx.Limits(max_connections=args.users * 2)
+    ui_users = round(args.users * args.ui_ratio)
+
+    async def one(i: int):
+        # Um cliente por usuário: cookies e conexões separados, como navegadores.
+        async with httpx.AsyncClient(
+            base_url=base_url, timeout=30.0, limits=limits
+        ) as client:
+            login_as = f"loadtest-{i % seeded_users}" if seeded_users else None
+            user = VirtualUser(
+                client,
+                recorder,
+                f"lt-{run_id}-{i}",
+                login_as,
+                think_time=args.think_time,
+            )
+            if i < ui_users:
+                await user.run_ui(deadline)
+            else:
+                await user.run_api(deadline)
+
+    await asyncio.gather(*(one(i) for i in range(args.users)))
+    recorder.stop()
+
+
+def main(argv=None) -> int:
+    args = parse_args(argv)
+    if args.random_seed is not None:
+        random.seed(args.random_seed)
+
+    server = None
+    tmpdir = None
+    seeded_users = 0
+    if args.url is None:
+        database_url = args.database_url
+        if database_url is None:
+            tmpdir = tempfile.TemporaryDirectory(prefix="loadtest-")
+            database_url = f"sqlite:///{os.path.join(tmpdir.name, 'loadtest.db')}"
+        env = server_env(
+            database_url, {"LOG_LEVEL": os.environ.get("LOG_LEVEL", "WARNING")}
+        )
+        print(f"Preparando o banco ({database_url.split('@')[-1]})...", file=sys.stderr)
+        migrate(env)
+        seed_database(database_url, args.seed_users, args.seed_todos)
+        seeded_users = args.seed_users
+        server = UvicornServer(env, workers=args.workers)
+        server.start()
+        base_url = server.url
+    else:
+        base_url = args.url
+
+    recorder = Recorder()
+    try:
+        print(
+            f"{args.users} usuários por {args.duration:.0f} s contra {base_url}...",
+            file=sys.stderr,
+        )
+        asyncio.run(run_load(base_url, args, seeded_users, recorder))
+    finally:
+        if server is not None:
+            server.stop()
+        if tmpdir is not None:
+            tmpdir.cleanup()
+
+    summary = recorder.summary()
+    print(format_report(summary))
+    if args.json:
+        write_json(summary, args.json)
+    return 1 if summary["errors"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
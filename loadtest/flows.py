@@ -0,0 +1,155 @@
+import asyncio
+import random
+import re
+import time
+
+import httpx
+
+from loadtest.stats import Recorder
+
+# Senha dos usuários semeados (loadtest.server.seed_database).
+SEED_PASSWORD = "loadtest"
+
+_TODO_ID = re.compile(r'id="todo-(\d+)"')
+
+
+class VirtualUser:
+    """
+    Um usuário simulado: se registra, faz login e repete o ciclo listar,
+    criar, alternar e deletar até `deadline`, pela API REST ou pelas rotas
+    HTMX. Cada requisição é registrada com o template da sua rota.
+    """
+
+    def __init__(
+        self,
+        client: httpx.AsyncClient,
+        recorder: Recorder,
+        name: str,
+        login_as: str | None,
+        think_time: float = 0.0,
+    ):
+        self.client = client
+        self.recorder = recorder
+        self.name = name
+        # Usuário semeado (com tarefas) usado depois do registro; sem semente,
+        # o próprio usuário registrado.
+        self.login_as = login_as
+        self.think_time = think_time
+
+    async def request(self, route: str, method: str, url: str, expected: int, **kw):
+        start = time.perf_counter()
+        try:
+            response = await self.client.request(method, url, **kw)
+        except httpx.HTTPError:
+            self.recorder.record(route, time.perf_counter() - start, ok=False)
+            return None
+        self.recorder.record(
+            route, time.perf_counter() - start, ok=response.status_code == expected
+        )
+        return response
+
+    async def pause(self) -> None:
+        if self.think_time:
+            await asyncio.sleep(random.uniform(0, 2 * self.think_time))
+
+    async def register(self) -> tuple[str, str]:
+        password = "senha-" + self.name
+        await self.request(
+            "POST /users/",
+            "POST",
+            "/users/",
+            201,
+            json={
+                "username": self.name,
+                "email": f"{self.name}@loadtest.local",
+                "password": password,
+            },
+        )
+        if self.login_as is not None:
+            return self.login_as, SEED_PASSWORD
+        return self.name, password
+
+    async def run_api(self, deadline: float) -> None:
+        username, password = await self.register()
+        response = await self.request(
+            "POST /auth/login",
+            "POST",
+            "/auth/login",
+            200,
+            data={"username": username, "password": password},
+        )
+        if response is None or response.status_code != 200:
+            return
+        headers = {"Authorization": f"Bearer {response.json()['access_token']}"}
+
+        n = 0
+        while time.perf_counter() < deadline:
+            n += 1
+            await self.request(
+                "GET /api/todos/", "GET", "/api/todos/", 200, headers=headers
+            )
+            created = await self.request(
+                "POST /api/todos/",
+                "POST",
+                "/api/todos/",
+                201,
+                json={"content": f"tarefa {n} de {self.name}"},
+                headers=headers,
+            )
+            if created is None or created.status_code != 201:
+                await self.pause()
+                continue
+            todo_id = created.json()["id"]
+            await self.request(
+                "PUT /api/todos/{todo_id}",
+                "PUT",
+                f"/api/todos/{todo_id}",
+                200,
+                json={"completed": True},
+                headers=headers,
+            )
+            await self.request(
+                "DELETE /api/todos/{todo_id}",
+                "DELETE",
+                f"/api/todos/{todo_id}",
+                204,
+                headers=headers,
+            )
+            await self.pause()
+
+    async def run_ui(self, deadline: float) -> None:
+        username, password = await self.register()
+        # Resposta 303 com o cookie `access_token`, guardado pelo cliente.
+        response = await self.request(
+            "POST /ui/auth/login",
+            "POST",
+            "/ui/auth/login",
+            303,
+            data={"username": username, "password": password},
+        )
+        if response is None or response.status_code != 303:
+            return
+
+        n = 0
+        while time.perf_counter() < deadline:
+            n += 1
+            await self.request("GET /", "GET", "/", 200)
+            created = await self.request(
+                "POST /ui/todos",
+                "POST",
+                "/ui/todos",
+                201,
+                data={"content": f"tarefa {n} de {self.name}"},
+            )
+            match = _TODO_ID.search(created.text) if created is not None else None
+            if match is None:
+                await self.pause()
+                continue
+            todo_id = match.group(1)
+            await self.request(
+                "PUT /ui/todos/{todo_id}", "PUT", f"/ui/todos/{todo_id}", 200
+            )
+            await self.request(
+                "DELETE /ui/todos/{todo_id}", "DELETE", f"/ui/todos/{todo_id}", 200
+            )
+            await self.pause()
@@ -0,0 +1,151 @@
+import os
+import socket
+import subprocess
+import sys
+import time
+from datetime import datetime
+
+import httpx
+import sqlalchemy as sa
+from pwdlib import PasswordHash
+
+from loadtest.flows import SEED_PASSWORD
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Variáveis exigidas pelas Settings que o teste de carga não precisa escolher.
+DEFAULT_ENV = {
+    "SECRET_KEY": "loadtest-secret-key-with-at-least-32-bytes",
+    "ALGORITHM": "HS256",
+    "ACCESS_TOKEN_EXPIRE_MINUTES": "30",
+    "POSTGRES_USER": "loadtest",
+    "POSTGRES_PASSWORD": "loadtest",
+    "POSTGRES_DB": "loadtest",
+}
+
+
+def server_env(database_url: str, extra: dict | None = None) -> dict:
+    env = {**DEFAULT_ENV, **os.environ, "DATABASE_URL": database_url}
+    env.update(extra or {})
+    return env
+
+
+def migrate(env: dict) -> None:
+    """Aplica as migrações no banco do teste (as mesmas da aplicação)."""
+    subprocess.run(
+        [sys.executable, "-m", "alembic", "upgrade", "head"],
+        cwd=ROOT,
+        env=env,
+        check=True,
+        stdout=subprocess.DEVNULL,
+    )
+
+
+def seed_database(database_url: str, users: int, todos_per_user: int) -> None:
+    """
+    Cria `users` usuários `loadtest-N` (senha SEED_PASSWORD) com
+    `todos_per_user` tarefas cada, metade concluídas. Se já existirem (banco
+    reaproveitado), não faz nada.
+    """
+    engine = sa.create_engine(database_url)
+    user = sa.table(
+        "user",
+        sa.column("id", sa.Integer),
+        sa.column("username", sa.String),
+        sa.column("email", sa.String),
+        sa.column("password", sa.String),
+        sa.column("created_at", sa.DateTime),
+        sa.column("todo_open_count", sa.Integer),
+        sa.column("todo_done_count", sa.Integer),
+    )
+    todo = sa.table(
+        "todo",
+        sa.column("content", sa.String),
+        sa.column("completed", sa.Boolean),
+        sa.column("user_id", sa.Integer),
+    )
+    done = todos_per_user // 2
+    # Um único hash: o argon2 é lento de propósito.
+    password = PasswordHash.recommended().hash(SEED_PASSWORD)
+    with engine.begin() as connection:
+        exists = connection.execute(
+            sa.select(sa.func.count()).where(user.c.username == "loadtest-0")
+        ).scalar()
+        if exists:
+            return
+        now = datetime.now()
+        ids = connection.execute(
+            user.insert().returning(user.c.id),
+            [
+                {
+                    "username": f"loadtest-{i}",
+                    "email": f"loadtest-{i}@loadtest.local",
+                    "password": password,
+                    "created_at": now,
+                    "todo_open_count": todos_per_user - done,
+                    "todo_done_count": done,
+                }
+                for i in range(users)
+            ],
+        ).scalars()
+        rows = [
+            {"content": f"tarefa semeada {n}", "completed": n < done, "user_id": uid}
+            for uid in ids
+            for n in range(todos_per_user)
+        ]
+        for start in range(0, len(rows), 5000):
+            connection.execute(todo.insert(), rows[start : start + 5000])
+    engine.dispose()
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+class UvicornServer:
+    """Um `uvicorn app.main:app` em um subprocesso, sem --reload."""
+
+    def __init__(self, env: dict, workers: int = 1, port: int | None = None):
+        self.env = env
+        self.workers = workers
+        self.port = port or free_port()
+        self.url = f"http://127.0.0.1:{self.port}"
+        self.process: subprocess.Popen | None = None
+
+    def start(self, timeout: float = 30.0) -> None:
+        command = [
+            sys.executable,
+            "-m",
+            "uvicorn",
+            "app.main:app",
+            "--host",
+            "127.0.0.1",
+            "--port",
+            str(self.port),
+            "--workers",
+            str(self.workers),
+            "--no-access-log",
+        ]
+        self.process = subprocess.Popen(command, cwd=ROOT, env=self.env)
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            if self.process.poll() is not None:
+                raise RuntimeError("O uvicorn encerrou durante a inicialização.")
+            try:
+                httpx.get(self.url + "/docs", timeout=1.0)
+                return
+            except httpx.HTTPError:
+                time.sleep(0.2)
+        self.stop()
+        raise RuntimeError("O uvicorn não respondeu a tempo.")
+
+    def stop(self) -> None:
+        if self.process is not None and self.process.poll() is None:
+            self.process.terminate()
+            try:
+                self.process.wait(timeout=10)
+            except subprocess.TimeoutExpired:
+                self.process.kill()
+        self.process = None
@@ -0,0 +1,85 @@
+import json
+import math
+import time
+from collections import defaultdict
+
+
+def percentile(sorted_values: list[float], fraction: float) -> float:
+    """Percentil pelo método nearest-rank de uma lista já ordenada."""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, math.ceil(fraction * len(sorted_values)))
+    return sorted_values[rank - 1]
+
+
+class Recorder:
+    """
+    Latências e status de cada requisição, agrupados pelo template da rota
+    (`PUT /api/todos/{todo_id}`), não pela URL.
+    """
+
+    def __init__(self):
+        self.latencies: dict[str, list[float]] = defaultdict(list)
+        self.errors: dict[str, int] = defaultdict(int)
+        self.started = time.perf_counter()
+        self.finished: float | None = None
+
+    def record(self, route: str, elapsed: float, ok: bool) -> None:
+        self.latencies[route].append(elapsed)
+        if not ok:
+            self.errors[route] += 1
+
+    def stop(self) -> None:
+        self.finished = time.perf_counter()
+
+    @property
+    def duration(self) -> float:
+        return (self.finished or time.perf_counter()) - self.started
+
+    def summary(self) -> dict:
+        duration = self.duration
+        routes = {}
+        for route, values in sorted(self.latencies.items()):
+            values = sorted(values)
+            routes[route] = {
+                "requests": len(values),
+                "errors": self.errors.get(route, 0),
+                "rps": len(values) / duration,
+                "p50_ms": percentile(values, 0.50) * 1000,
+                "p95_ms": percentile(values, 0.95) * 1000,
+                "p99_ms": percentile(values, 0.99) * 1000,
+                "max_ms": values[-1] * 1000,
+            }
+        total = sum(r["requests"] for r in routes.values())
+        return {
+            "duration_s": duration,
+            "requests": total,
+            "errors": sum(r["errors"] for r in routes.values()),
+            "rps": total / duration if duration else 0.0,
+            "routes": routes,
+        }
+
+
+def format_report(summary: dict) -> str:
+    header = (
+        f"{'rota':<34} {'req':>7} {'erros':>6} {'rps':>8} "
+        f"{'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'max ms':>8}"
+    )
+    lines = [header, "-" * len(header)]
+    for route, r in summary["routes"].items():
+        lines.append(
+            f"{route:<34} {r['requests']:>7} {r['errors']:>6} {r['rps']:>8.1f} "
+            f"{r['p50_ms']:>8.1f} {r['p95_ms']:>8.1f} {r['p99_ms']:>8.1f} "
+            f"{r['max_ms']:>8.1f}"
+        )
+    lines.append("-" * len(header))
+    lines.append(
+        f"total: {summary['requests']} requisições, {summary['errors']} erros, "
+        f"{summary['rps']:.1f} req/s em {summary['duration_s']:.1f} s"
+    )
+    return "\n".join(lines)
+
+
+def write_json(summary: dict, path: str) -> None:
+    with open(path, "w", encoding="utf-8") as file:
+        json.dump(summary, file, indent=2)